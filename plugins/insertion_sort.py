@@ -0,0 +1,37 @@
+"""Example plugin: insertion sort, picked up by sorting_registry from this directory.
+
+The registry reads ALGORITHMS without importing this module; the module is only
+imported when Insertion Sort is first selected.
+"""
+
+from typing import Generator, List
+
+from sorting_engine import Event, ev_compare, ev_done, ev_mark_sorted, ev_swap
+
+ALGORITHMS = [
+    {
+        "name": "Insertion Sort",
+        "function": "insertion_sort_events",
+        "key": "insertion",
+        "stable": True,
+        "complexity": "O(n²)",
+        "events": ("compare", "swap", "mark_sorted"),
+    },
+]
+
+
+def insertion_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    n = len(a)
+    for i in range(1, n):
+        j = i
+        while j > 0:
+            yield ev_compare(j - 1, j)
+            if a[j] < a[j - 1]:
+                a[j - 1], a[j] = a[j], a[j - 1]
+                yield ev_swap(j - 1, j)
+                j -= 1
+            else:
+                break
+    for idx in range(n):
+        yield ev_mark_sorted(idx)
+    yield ev_done()
@@ -0,0 +1,228 @@
+"""Command-line benchmark for the sorting event generators (no Tk, no rendering).
+
+Example:
+    python sorting_bench.py --sizes 100,1000 --distributions uniform,reversed --json bench.json
+    python sorting_bench.py --count-only --algorithms merge,quick --sizes 1000000
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sorting_counts import SortCounter
+from sorting_datasets import DISTRIBUTIONS as DATASET_DISTRIBUTIONS, make_dataset
+from sorting_engine import EventSource, SortEngine
+from sorting_registry import default_registry
+
+
+REGISTRY = default_registry()
+
+# Short command-line keys of every registered algorithm that has one (plugins included).
+ALGORITHMS: List[str] = REGISTRY.keys()
+
+# Dataset shapes (see sorting_datasets); "random" is the bench's older name for "uniform".
+DISTRIBUTION_ALIASES: Dict[str, str] = {"random": "uniform"}
+DISTRIBUTIONS: Tuple[str, ...] = DATASET_DISTRIBUTIONS + tuple(DISTRIBUTION_ALIASES)
+
+
+def bench_one(algorithm: EventSource, data: List[int], repeat: int = 3) -> Dict[str, float]:
+    """Time raw generator iteration (best of ``repeat``), then count and measure memory.
+
+    The timed pass only drains the generator; operation counts come from a separate
+    SortEngine replay and peak memory from a separate tracemalloc pass, so neither
+    inflates the throughput figure.
+    """
+    best_ns: Optional[int] = None
+    events = 0
+    for _ in range(max(1, repeat)):
+        work = list(data)
+        gen = algorithm(work)
+        count = 0
+        t0 = time.perf_counter_ns()
+        for _event in gen:
+            count += 1
+        elapsed = time.perf_counter_ns() - t0
+        events = count
+        if best_ns is None or elapsed < best_ns:
+            best_ns = elapsed
+
+    engine = SortEngine(algorithm, list(data))
+    engine.run()
+
+    tracemalloc.start()
+    try:
+        for _event in algorithm(list(data)):
+            pass
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    seconds = (best_ns or 1) / 1e9
+    return {
+        "events": events,
+        "seconds": seconds,
+        "events_per_s": events / seconds if seconds > 0 else float("inf"),
+        "comparisons": engine.comparisons,
+        "swaps": engine.swaps,
+        "writes": engine.writes,
+        "peak_bytes": peak,
+    }
+
+
+def bench_counts(counter: SortCounter, data: List[int], repeat: int = 3) -> Dict[str, float]:
+    """Time a counting fast path (best of ``repeat``); no events are built."""
+    best_ns: Optional[int] = None
+    for _ in range(max(1, repeat)):
+        work = list(data)
+        t0 = time.perf_counter_ns()
+        counts = counter(work)
+        elapsed = time.perf_counter_ns() - t0
+        if best_ns is None or elapsed < best_ns:
+            best_ns = elapsed
+    return {
+        "seconds": (best_ns or 1) / 1e9,
+        "comparisons": counts.comparisons,
+        "swaps": counts.swaps,
+        "writes": counts.writes,
+    }
+
+
+def run_suite(
+    algorithms: Sequence[str],
+    sizes: Sequence[int],
+    distributions: Sequence[str],
+    repeat: int = 3,
+    seed: int = 0,
+    count_only: bool = False,
+) -> List[Dict[str, object]]:
+    results: List[Dict[str, object]] = []
+    for dist in distributions:
+        for n in sizes:
+            # portable: the same seed benches the same data with or without NumPy
+            data = make_dataset(DISTRIBUTION_ALIASES.get(dist, dist), n, 0, n, seed, portable=True)
+            for name in algorithms:
+                row: Dict[str, object] = {"algorithm": name, "distribution": dist, "n": n}
+                try:
+                    if count_only:
+                        counter = REGISTRY.counter(name)
+                        if counter is None:
+                            row["error"] = "no counting fast path"
+                        else:
+                            row.update(bench_counts(counter, data, repeat))
+                    else:
+                        row.update(bench_one(REGISTRY.load(name), data, repeat))
+                except RecursionError:
+                    # The built-ins keep explicit stacks; a plugin generator that recurses
+                    # with yield from can still exceed the recursion limit on deep inputs.
+                    row["error"] = "RecursionError"
+                results.append(row)
+    return results
+
+
+def _render_table(headers: List[str], rows: List[List[str]]) -> str:
+    """Align ``rows`` under ``headers``: the first two columns left, the numbers right."""
+    widths = [max(len(h), *(len(row[k]) for row in rows)) if rows else len(h) for k, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for row in rows:
+        lines.append("  ".join(cell.rjust(w) if k >= 2 else cell.ljust(w) for k, (cell, w) in enumerate(zip(row, widths))))
+    return "\n".join(lines)
+
+
+def _error_row(r: Dict[str, object], columns: int) -> List[str]:
+    return [str(r["algorithm"]), str(r["distribution"]), str(r["n"]), str(r["error"])] + [""] * (columns - 4)
+
+
+def format_table(results: List[Dict[str, object]]) -> str:
+    headers = ["algorithm", "distribution", "n", "events", "events/s", "comparisons", "swaps", "writes", "peak KiB"]
+    rows = [
+        _error_row(r, len(headers))
+        if "error" in r else
+        [
+            str(r["algorithm"]),
+            str(r["distribution"]),
+            str(r["n"]),
+            str(r["events"]),
+            f"{r['events_per_s']:,.0f}",
+            str(r["comparisons"]),
+            str(r["swaps"]),
+            str(r["writes"]),
+            f"{r['peak_bytes'] / 1024:,.1f}",
+        ]
+        for r in results
+    ]
+    return _render_table(headers, rows)
+
+
+def format_counts_table(results: List[Dict[str, object]]) -> str:
+    headers = ["algorithm", "distribution", "n", "seconds", "comparisons", "swaps", "writes"]
+    rows = [
+        _error_row(r, len(headers))
+        if "error" in r else
+        [
+            str(r["algorithm"]),
+            str(r["distribution"]),
+            str(r["n"]),
+            f"{r['seconds']:.4f}",
+            str(r["comparisons"]),
+            str(r["swaps"]),
+            str(r["writes"]),
+        ]
+        for r in results
+    ]
+    return _render_table(headers, rows)
+
+
+def _csv_list(text: str) -> List[str]:
+    return [part.strip() for part in text.split(",") if part.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the sorting event generators without rendering.")
+    parser.add_argument("--algorithms", default=",".join(ALGORITHMS),
+                        help=f"comma-separated subset of: {', '.join(ALGORITHMS)}")
+    parser.add_argument("--sizes", default="100,500,1000", help="comma-separated dataset sizes")
+    parser.add_argument("--distributions", default=",".join(DATASET_DISTRIBUTIONS),
+                        help=f"comma-separated subset of: {', '.join(DISTRIBUTIONS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for random datasets")
+    parser.add_argument("--count-only", action="store_true",
+                        help="run the counting fast path instead of the event generators")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON ('-' for stdout only)")
+    args = parser.parse_args(argv)
+    for error in REGISTRY.errors:
+        print(f"skipped plugin: {error}", file=sys.stderr)
+
+    algorithms = _csv_list(args.algorithms)
+    distributions = _csv_list(args.distributions)
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            parser.error(f"unknown algorithm: {name}")
+    for dist in distributions:
+        if dist not in DISTRIBUTIONS:
+            parser.error(f"unknown distribution: {dist}")
+    try:
+        sizes = [int(s) for s in _csv_list(args.sizes)]
+    except ValueError:
+        parser.error("--sizes must be comma-separated integers")
+    if any(n < 0 for n in sizes):
+        parser.error("--sizes must be non-negative")
+
+    results = run_suite(algorithms, sizes, distributions, args.repeat, args.seed, args.count_only)
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    print(format_counts_table(results) if args.count_only else format_table(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
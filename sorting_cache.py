@@ -0,0 +1,198 @@
+"""On-disk cache of recorded traces, keyed by algorithm and dataset content, with LRU eviction.
+
+A configuration that was played once replays from its cached trace (memory-mapped,
+see sorting_trace) instead of running the generator again. Keys hash the
+algorithm's name and target, the size and mtime of its source file (so editing a
+plugin invalidates its traces) and the dataset as int32. Recency is the file's
+mtime, refreshed on every hit; ``put`` evicts the least recently used traces once
+the directory grows past ``max_bytes``.
+"""
+
+import hashlib
+import importlib.util
+import os
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sorting_engine import ev_done
+from sorting_registry import AlgorithmSpec
+from sorting_trace import EventTrace
+
+CACHE_PATH_ENV = "SORTING_VISUALIZER_CACHE"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+SUFFIX = ".svtrace"
+
+
+def default_cache_dir() -> str:
+    """$SORTING_VISUALIZER_CACHE, else ``sorting_visualizer/traces`` under the user cache directory."""
+    path = os.environ.get(CACHE_PATH_ENV)
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "sorting_visualizer", "traces")
+
+
+def _source_stamp(spec: AlgorithmSpec) -> str:
+    """Size and mtime of the file defining ``spec.target``, found without importing it."""
+    module_name = spec.target.partition(":")[0]
+    try:
+        if spec.path is not None:
+            origin = os.path.join(spec.path, module_name.replace(".", os.sep) + ".py")
+        else:
+            found = importlib.util.find_spec(module_name)
+            origin = found.origin if found is not None else None
+        if origin:
+            st = os.stat(origin)
+            return f"{st.st_size}:{st.st_mtime_ns}"
+    except (ImportError, OSError, ValueError):
+        pass
+    return ""
+
+
+class TraceCache:
+    """A directory of ``<key>.svtrace`` files bounded to ``max_bytes`` in total."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, spec: AlgorithmSpec, data: Sequence[int]) -> Optional[str]:
+        """Cache key for running ``spec`` on ``data``; None if the values do not fit int32."""
+        try:
+            packed = array("i", data)
+        except OverflowError:
+            return None
+        h = hashlib.sha256()
+        h.update(f"{spec.name}\0{spec.target}\0{_source_stamp(spec)}\0{len(packed)}\0".encode("utf-8"))
+        h.update(packed.tobytes())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key: str) -> Optional[EventTrace]:
+        """Open the cached trace for ``key`` (marking it recently used), or None."""
+        path = self._path(key)
+        try:
+            trace = EventTrace.load(path)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return trace
+
+    def put(self, key: str, trace: EventTrace) -> bool:
+        """Store ``trace`` under ``key`` and evict down to max_bytes; False if it was not stored."""
+        if trace.nbytes > self.max_bytes:
+            return False
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            trace.save(tmp)
+            os.replace(tmp, path)  # readers never see a half-written trace
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        self.evict(keep=path)
+        return True
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every cached trace, least recently used first."""
+        out = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        for name in names:
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        out.sort()
+        return out
+
+    def total_bytes(self) -> int:
+        return sum(size for _mtime, size, _path in self.entries())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Delete least recently used traces until the total fits max_bytes; returns how many."""
+        entries = self.entries()
+        total = sum(size for _mtime, size, _path in entries)
+        removed = 0
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # e.g. still mapped by a running replay on Windows
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for _mtime, _size, path in self.entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+class TraceRecorder:
+    """Record a run's events as they are played, for storing in the cache afterwards.
+
+    The app hands every fetched batch to ``record`` after the generator's timed
+    region, so recording never shows up as generator time. Recording gives up
+    (``complete`` stays False) if the trace would exceed ``max_bytes`` or an event
+    cannot be packed; ``finish`` marks a run that reached its end.
+    """
+
+    def __init__(self, data: Sequence[int], name: str = "", max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.trace = EventTrace(data, name)
+        self.max_bytes = max_bytes
+        self.active = True
+        self.complete = False
+
+    def record(self, steps: Iterable[object]) -> None:
+        """Append a batch of events, or of coalesced steps (lists of events)."""
+        if not self.active:
+            return
+        trace = self.trace
+        append = trace.append
+        try:
+            for step in steps:
+                if isinstance(step, list):
+                    for event in step:
+                        append(event)
+                else:
+                    append(step)  # type: ignore[arg-type]
+        except (OverflowError, ValueError):
+            self._give_up()
+            return
+        if trace.nbytes > self.max_bytes:
+            self._give_up()
+
+    def finish(self) -> None:
+        """The run is over: close the trace with its "done" event."""
+        if self.active:
+            self.trace.append(ev_done())
+            self.complete = True
+
+    def _give_up(self) -> None:
+        self.active = False
+        self.trace = EventTrace((), self.trace.algorithm)  # drop what was recorded
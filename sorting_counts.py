@@ -0,0 +1,391 @@
+"""Counting fast path: each algorithm sorts in place with inlined counters, no events.
+
+Every counter performs exactly the comparisons, swaps and writes its event
+generator in sorting_engine emits, so the totals equal a full SortEngine replay.
+sorting_registry records which counter belongs to which algorithm.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sorting_engine import INTRO_INSERTION_MAX, timsort_min_run
+
+
+@dataclass(frozen=True)
+class OpCounts:
+    comparisons: int = 0
+    swaps: int = 0
+    writes: int = 0
+
+    @property
+    def swaps_or_writes(self) -> int:
+        return self.swaps + self.writes
+
+
+SortCounter = Callable[[List[int]], OpCounts]
+
+
+def bubble_sort_count(a: List[int]) -> OpCounts:
+    n = len(a)
+    swaps = 0
+    for end in range(n - 1, -1, -1):
+        for j in range(0, end):
+            x, y = a[j], a[j + 1]
+            if x > y:
+                a[j], a[j + 1] = y, x
+                swaps += 1
+    return OpCounts(comparisons=n * (n - 1) // 2, swaps=swaps)
+
+
+def selection_sort_count(a: List[int]) -> OpCounts:
+    n = len(a)
+    swaps = 0
+    for i in range(n):
+        min_idx = i
+        min_val = a[i]
+        for j in range(i + 1, n):
+            if a[j] < min_val:
+                min_idx = j
+                min_val = a[j]
+        if min_idx != i:
+            a[i], a[min_idx] = min_val, a[i]
+            swaps += 1
+    return OpCounts(comparisons=n * (n - 1) // 2, swaps=swaps)
+
+
+def merge_sort_count(a: List[int]) -> OpCounts:
+    """Top-down merge sort ping-ponging between ``a`` and one auxiliary copy."""
+    comparisons = 0
+    writes = 0
+
+    def sort(src: List[int], dst: List[int], lo: int, hi: int) -> None:
+        # Sorts dst[lo:hi], using src (which holds the same values) as scratch.
+        nonlocal comparisons, writes
+        if hi - lo <= 1:
+            return
+        mid = (lo + hi) // 2
+        sort(dst, src, lo, mid)
+        sort(dst, src, mid, hi)
+
+        i = lo
+        j = mid
+        k = lo
+        while i < mid and j < hi:
+            if src[i] <= src[j]:
+                dst[k] = src[i]
+                i += 1
+            else:
+                dst[k] = src[j]
+                j += 1
+            k += 1
+        comparisons += (i - lo) + (j - mid)
+        if i < mid:
+            dst[k:hi] = src[i:mid]
+        else:
+            dst[k:hi] = src[j:hi]
+        writes += hi - lo
+
+    sort(list(a), a, 0, len(a))
+    return OpCounts(comparisons=comparisons, writes=writes)
+
+
+def quick_sort_lomuto_count(a: List[int]) -> OpCounts:
+    """Lomuto quicksort over an explicit stack (same partitions, no recursion limit)."""
+    comparisons = 0
+    swaps = 0
+    stack = [(0, len(a))]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo <= 1:
+            continue
+
+        pivot_idx = hi - 1
+        pivot_val = a[pivot_idx]
+        i = lo
+        for j in range(lo, pivot_idx):
+            x = a[j]
+            if x <= pivot_val:
+                if i != j:
+                    a[j] = a[i]
+                    a[i] = x
+                    swaps += 1
+                i += 1
+        comparisons += pivot_idx - lo
+
+        if i != pivot_idx:
+            a[i], a[pivot_idx] = pivot_val, a[i]
+            swaps += 1
+
+        stack.append((i + 1, hi))
+        stack.append((lo, i))
+    return OpCounts(comparisons=comparisons, swaps=swaps)
+
+
+# Shared pieces, mirroring the helpers of the same name in sorting_engine.
+
+def _insertion_count(a: List[int], lo: int, hi: int, start: int) -> Tuple[int, int]:
+    """Insertion sort a[lo:hi] by adjacent swaps (a[lo:start] already sorted); (comparisons, swaps)."""
+    comparisons = 0
+    swaps = 0
+    for i in range(max(start, lo + 1), hi):
+        x = a[i]
+        j = i
+        while j > lo and x < a[j - 1]:
+            a[j] = a[j - 1]
+            j -= 1
+        a[j] = x
+        shifted = i - j
+        swaps += shifted
+        comparisons += shifted + (j > lo)  # the failed comparison that stopped the scan
+    return comparisons, swaps
+
+
+def _heap_count(a: List[int], lo: int, hi: int) -> Tuple[int, int]:
+    """Heapsort a[lo:hi] in place; (comparisons, swaps)."""
+    comparisons = 0
+    swaps = 0
+    size = hi - lo
+
+    def sift_down(root: int, end: int) -> None:
+        nonlocal comparisons, swaps
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end:
+                comparisons += 1
+                if a[lo + child] < a[lo + child + 1]:
+                    child += 1
+            comparisons += 1
+            if a[lo + root] < a[lo + child]:
+                a[lo + root], a[lo + child] = a[lo + child], a[lo + root]
+                swaps += 1
+                root = child
+            else:
+                return
+
+    for start in range(size // 2 - 1, -1, -1):
+        sift_down(start, size)
+    for end in range(size - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        swaps += 1
+        sift_down(0, end)
+    return comparisons, swaps
+
+
+def _merge_count(src: List[int], dst: List[int], lo: int, mid: int, hi: int) -> int:
+    """Stable merge of src[lo:mid] and src[mid:hi] into dst[lo:hi] (hi - lo writes); returns comparisons."""
+    i = lo
+    j = mid
+    k = lo
+    while i < mid and j < hi:
+        if src[i] <= src[j]:
+            dst[k] = src[i]
+            i += 1
+        else:
+            dst[k] = src[j]
+            j += 1
+        k += 1
+    comparisons = (i - lo) + (j - mid)
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+    return comparisons
+
+
+def heap_sort_count(a: List[int]) -> OpCounts:
+    comparisons, swaps = _heap_count(a, 0, len(a))
+    return OpCounts(comparisons=comparisons, swaps=swaps)
+
+
+def intro_sort_count(a: List[int]) -> OpCounts:
+    """Introsort with the same pivots, cut-offs and depth limit as intro_sort_events."""
+    comparisons = 0
+    swaps = 0
+    n = len(a)
+    stack = [(0, n, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= INTRO_INSERTION_MAX:
+            c, s = _insertion_count(a, lo, hi, lo + 1)
+            comparisons += c
+            swaps += s
+            continue
+        if depth == 0:
+            c, s = _heap_count(a, lo, hi)
+            comparisons += c
+            swaps += s
+            continue
+
+        mid = (lo + hi) // 2
+        last = hi - 1
+        for i, j in ((lo, mid), (mid, last), (lo, mid)):
+            if a[j] < a[i]:
+                a[i], a[j] = a[j], a[i]
+                swaps += 1
+        a[mid], a[last] = a[last], a[mid]
+        comparisons += 3
+        swaps += 1
+
+        pivot_val = a[last]
+        i = lo
+        for j in range(lo, last):
+            x = a[j]
+            if x <= pivot_val:
+                if i != j:
+                    a[j] = a[i]
+                    a[i] = x
+                    swaps += 1
+                i += 1
+        comparisons += last - lo
+        if i != last:
+            a[i], a[last] = pivot_val, a[i]
+            swaps += 1
+
+        stack.append((i + 1, hi, depth - 1))
+        stack.append((lo, i, depth - 1))
+    return OpCounts(comparisons=comparisons, swaps=swaps)
+
+
+def merge_sort_bottom_up_count(a: List[int]) -> OpCounts:
+    comparisons = 0
+    writes = 0
+    n = len(a)
+    src, dst = a, list(a)
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = lo + width
+            if mid >= n:
+                dst[lo:n] = src[lo:n]  # unpaired tail, copied without events
+                break
+            hi = min(lo + 2 * width, n)
+            comparisons += _merge_count(src, dst, lo, mid, hi)
+            writes += hi - lo
+        src, dst = dst, src
+        width *= 2
+    if src is not a:
+        a[:] = src
+    return OpCounts(comparisons=comparisons, writes=writes)
+
+
+def radix_sort_lsd_count(a: List[int], base: int = 10) -> OpCounts:
+    """The bucket passes of radix_sort_lsd_events; each pass writes all n positions."""
+    n = len(a)
+    writes = 0
+    if n > 1:
+        lo_val = min(a)
+        span = max(a) - lo_val
+        exp = 1
+        while span // exp > 0:
+            buckets: List[List[int]] = [[] for _ in range(base)]
+            for v in a:
+                buckets[(v - lo_val) // exp % base].append(v)
+            k = 0
+            for bucket in buckets:
+                a[k:k + len(bucket)] = bucket
+                k += len(bucket)
+            writes += n
+            exp *= base
+    return OpCounts(writes=writes)
+
+
+def counting_sort_count(a: List[int]) -> OpCounts:
+    """The count tables of counting_sort_events; every position is written once."""
+    n = len(a)
+    if n:
+        lo_val = min(a)
+        span = max(a) - lo_val
+        if span <= 4 * n + 1024:
+            table = [0] * (span + 1)
+            for v in a:
+                table[v - lo_val] += 1
+            counts: Iterable[Tuple[int, int]] = ((lo_val + d, c) for d, c in enumerate(table) if c)
+        else:
+            sparse: Dict[int, int] = {}
+            for v in a:
+                sparse[v] = sparse.get(v, 0) + 1
+            counts = sorted(sparse.items())
+        k = 0
+        for v, c in counts:
+            a[k:k + c] = [v] * c
+            k += c
+    return OpCounts(writes=n)
+
+
+def tim_sort_count(a: List[int]) -> OpCounts:
+    """The run detection, run extension and merge order of tim_sort_events."""
+    comparisons = 0
+    swaps = 0
+    writes = 0
+    n = len(a)
+    min_run = timsort_min_run(n)
+    runs: List[Tuple[int, int]] = []
+
+    def merge_at(k: int) -> None:
+        nonlocal comparisons, writes
+        (lo, len1), (mid, len2) = runs[k], runs[k + 1]
+        hi = mid + len2
+        # Merging from a copy of the left run only: every write lands left of the right run's unread part.
+        left = a[lo:mid]
+        i = 0
+        j = mid
+        k_out = lo
+        while i < len1 and j < hi:
+            if left[i] <= a[j]:
+                a[k_out] = left[i]
+                i += 1
+            else:
+                a[k_out] = a[j]
+                j += 1
+            k_out += 1
+        comparisons += i + (j - mid)
+        if i < len1:
+            a[k_out:hi] = left[i:]
+        writes += hi - lo
+        runs[k] = (lo, len1 + len2)
+        del runs[k + 1]
+
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            comparisons += 1
+            descending = a[hi] < a[lo]
+            hi += 1
+            while hi < n:
+                comparisons += 1
+                if (a[hi] < a[hi - 1]) != descending:
+                    break
+                hi += 1
+            if descending:
+                swaps += (hi - lo) // 2
+                a[lo:hi] = a[lo:hi][::-1]
+
+        force = min(n, lo + min_run)
+        if hi < force:
+            c, s = _insertion_count(a, lo, force, hi)
+            comparisons += c
+            swaps += s
+            hi = force
+        runs.append((lo, hi - lo))
+        lo = hi
+
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if (k > 0 and runs[k - 1][1] <= runs[k][1] + runs[k + 1][1]) or (
+                k > 1 and runs[k - 2][1] <= runs[k - 1][1] + runs[k][1]
+            ):
+                if runs[k - 1][1] < runs[k + 1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k + 1][1]:
+                break
+            merge_at(k)
+
+    while len(runs) > 1:
+        k = len(runs) - 2
+        if k > 0 and runs[k - 1][1] < runs[k + 1][1]:
+            k -= 1
+        merge_at(k)
+    return OpCounts(comparisons=comparisons, swaps=swaps, writes=writes)
@@ -0,0 +1,176 @@
+"""Dataset generation and bulk bar geometry, vectorized with NumPy when it is installed.
+
+Without NumPy every function falls back to plain Python and returns the same
+kind of result. A seed makes a dataset reproducible for one backend; the NumPy
+and pure-Python generators draw different streams from the same seed, so
+PRESETS always use the pure-Python one and come out the same everywhere.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+DISTRIBUTIONS: Tuple[str, ...] = ("uniform", "gaussian", "sorted", "nearly-sorted", "reversed", "few-unique")
+
+# Values NumPy can hold without overflow (int64); larger ranges use the Python path.
+_NUMPY_MAX = 2 ** 62
+
+Rect = Tuple[float, float, float, float]
+
+
+def _few_unique_count(lo: int, hi: int) -> int:
+    return min(8, hi - lo + 1)
+
+
+def make_dataset(
+    distribution: str, n: int, lo: int, hi: int, seed: Optional[int] = None, portable: bool = False
+) -> List[int]:
+    """``n`` integers in ``lo..hi`` (inclusive) drawn from ``distribution``.
+
+    "sorted" is ascending, "nearly-sorted" is ascending with about 5% of positions
+    swapped in pairs, "gaussian" is centred on the range with the range spanning six
+    deviations.
+    ``portable`` skips NumPy, so a seed gives the same data with or without it.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution: {distribution}")
+    if n < 0 or hi < lo:
+        raise ValueError("need n >= 0 and lo <= hi")
+    if np is not None and not portable and -_NUMPY_MAX < lo and hi < _NUMPY_MAX:
+        return _make_numpy(distribution, n, lo, hi, seed)
+    return _make_python(distribution, n, lo, hi, seed)
+
+
+def _make_numpy(distribution: str, n: int, lo: int, hi: int, seed: Optional[int]) -> List[int]:
+    rng = np.random.default_rng(seed)
+    if distribution == "gaussian":
+        mid = (lo + hi) / 2
+        sd = max((hi - lo) / 6, 1e-9)
+        return np.clip(np.rint(rng.normal(mid, sd, n)), lo, hi).astype(np.int64).tolist()
+    if distribution == "few-unique":
+        values = rng.integers(lo, hi, _few_unique_count(lo, hi), endpoint=True)
+        return values[rng.integers(0, len(values), n)].tolist()
+
+    a = rng.integers(lo, hi, n, endpoint=True)
+    if distribution == "sorted":
+        a.sort()
+    elif distribution == "reversed":
+        a = np.sort(a)[::-1]
+    elif distribution == "nearly-sorted":
+        a.sort()
+        if n > 1:
+            k = max(1, n // 40)
+            i = rng.integers(0, n, k)
+            j = rng.integers(0, n, k)
+            a[i], a[j] = a[j], a[i]
+    return a.tolist()
+
+
+def _make_python(distribution: str, n: int, lo: int, hi: int, seed: Optional[int]) -> List[int]:
+    rng = random.Random(seed)
+    if distribution == "gaussian":
+        mid = (lo + hi) / 2
+        sd = max((hi - lo) / 6, 1e-9)
+        return [min(hi, max(lo, round(rng.gauss(mid, sd)))) for _ in range(n)]
+    if distribution == "few-unique":
+        values = [rng.randint(lo, hi) for _ in range(_few_unique_count(lo, hi))]
+        return [rng.choice(values) for _ in range(n)]
+
+    a = [rng.randint(lo, hi) for _ in range(n)]
+    if distribution == "sorted":
+        a.sort()
+    elif distribution == "reversed":
+        a.sort(reverse=True)
+    elif distribution == "nearly-sorted":
+        a.sort()
+        if n > 1:
+            for _ in range(max(1, n // 40)):
+                i = rng.randrange(n)
+                j = rng.randrange(n)
+                a[i], a[j] = a[j], a[i]
+    return a
+
+
+@dataclass(frozen=True)
+class DatasetPreset:
+    """A named, seeded dataset that is identical on every machine (see ``portable``)."""
+    name: str
+    distribution: str
+    n: int
+    lo: int
+    hi: int
+    seed: int
+
+    def make(self) -> List[int]:
+        return make_dataset(self.distribution, self.n, self.lo, self.hi, self.seed, portable=True)
+
+
+PRESETS: Tuple[DatasetPreset, ...] = (
+    DatasetPreset("Small uniform (30)", "uniform", 30, 0, 100, 1),
+    DatasetPreset("Reversed (50)", "reversed", 50, 0, 100, 2),
+    DatasetPreset("Nearly sorted (100)", "nearly-sorted", 100, 0, 1000, 3),
+    DatasetPreset("Few unique (200)", "few-unique", 200, 0, 1000, 4),
+    DatasetPreset("Gaussian (500)", "gaussian", 500, 0, 1000, 5),
+    DatasetPreset("Large uniform (10k)", "uniform", 10_000, 0, 100_000, 6),
+)
+
+
+def preset(name: str) -> DatasetPreset:
+    """The preset called ``name``; KeyError if there is none."""
+    for p in PRESETS:
+        if p.name == name:
+            return p
+    raise KeyError(name)
+
+
+def bar_rects(
+    values: Sequence[int], left_pad: float, top_pad: float, bar_w: float, usable_h: float, max_val: int
+) -> List[Rect]:
+    """Canvas rectangle (x0, y0, x1, y1) of every bar, with a 1px gap on each side."""
+    n = len(values)
+    y1 = top_pad + usable_h
+    if np is not None and n:
+        try:
+            v = np.asarray(values, dtype=np.float64)
+        except OverflowError:
+            v = None
+        if v is not None:
+            x = left_pad + np.arange(n + 1) * bar_w
+            x0 = (x[:-1] + 1).tolist()
+            x1 = (x[1:] - 1).tolist()
+            y0 = (y1 - v / max_val * usable_h).tolist()
+            return [(a, b, c, y1) for a, b, c in zip(x0, y0, x1)]
+    return [
+        (left_pad + i * bar_w + 1, y1 - (val / max_val) * usable_h, left_pad + (i + 1) * bar_w - 1, y1)
+        for i, val in enumerate(values)
+    ]
+
+
+def column_extents(values: Sequence[int], cols: int) -> Tuple[List[int], List[int]]:
+    """Min and max of each of ``cols`` contiguous runs that split ``values`` evenly.
+
+    Column c covers indices ceil(c*n/cols) .. ceil((c+1)*n/cols) - 1; needs cols <= n.
+    """
+    n = len(values)
+    starts = [-(-c * n // cols) for c in range(cols + 1)]
+    if np is not None and n:
+        try:
+            a = np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            a = None
+        if a is not None:
+            idx = np.asarray(starts[:-1], dtype=np.intp)
+            return np.minimum.reduceat(a, idx).tolist(), np.maximum.reduceat(a, idx).tolist()
+    mins: List[int] = []
+    maxs: List[int] = []
+    for c in range(cols):
+        chunk = values[starts[c]:starts[c + 1]]
+        mins.append(min(chunk))
+        maxs.append(max(chunk))
+    return mins, maxs
@@ -0,0 +1,778 @@
+"""Tk-free sorting core: event model, event generators and a replay engine."""
+
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, Generator, Iterable, Iterator, Optional, Sequence, Tuple, List, Set, TypeVar
+
+
+# ----------------------------- Event Model -----------------------------
+
+# Small-int opcodes for the event vocabulary, used by Event itself, packed traces
+# and opcode replay.
+OP_COMPARE, OP_SWAP, OP_PIVOT, OP_SELECT_MIN, OP_WRITE, OP_MARK_SORTED, OP_DONE = range(7)
+
+EVENT_TYPES: Tuple[str, ...] = ("compare", "swap", "pivot", "select_min", "write", "mark_sorted", "done")
+EVENT_OPCODES: Dict[str, int] = {name: op for op, name in enumerate(EVENT_TYPES)}
+# Operands per opcode: (i, j) for compare/swap, (i, value) for write, (i,) for the rest.
+OP_ARITY: Tuple[int, ...] = (2, 2, 1, 1, 2, 1, 0)
+
+_tuple_new = tuple.__new__
+
+
+class Event(tuple):
+    """One step of a sort, stored as the plain tuple ``(op, a, b, indices)``.
+
+    ``a`` is the first index, ``b`` the second index (compare/swap) or the value
+    (write), and ``indices`` is only set by a coalesced mark_sorted burst. The
+    ev_* helpers build events with a single tuple allocation, and consumers can
+    unpack them and dispatch on the opcode. The old keyword interface is kept:
+    ``Event(type="write", i=3, value=7)`` builds an event, and ``type``, ``i``,
+    ``j`` and ``value`` read one back.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+        cls,
+        type: str,
+        i: Optional[int] = None,
+        j: Optional[int] = None,
+        value: Optional[int] = None,
+        indices: Optional[Tuple[int, ...]] = None,
+    ) -> "Event":
+        op = EVENT_OPCODES.get(type)
+        if op is None:
+            raise ValueError(f"unknown event type: {type!r}")
+        return _tuple_new(cls, (op, i, value if op == OP_WRITE else j, indices))
+
+    @classmethod
+    def from_op(cls, op: int, a: Optional[int] = None, b: Optional[int] = None) -> "Event":
+        return _tuple_new(cls, (op, a, b, None))
+
+    def __getnewargs__(self) -> Tuple:
+        return (self.type, self.i, self.j, self.value, self.indices)
+
+    def __repr__(self) -> str:
+        fields = [f"type={self.type!r}"]
+        for name in ("i", "j", "value", "indices"):
+            val = getattr(self, name)
+            if val is not None:
+                fields.append(f"{name}={val!r}")
+        return f"Event({', '.join(fields)})"
+
+    op = property(lambda self: self[0])
+    a = property(lambda self: self[1])
+    b = property(lambda self: self[2])
+    i = property(lambda self: self[1])
+    indices = property(lambda self: self[3])
+
+    @property
+    def type(self) -> str:
+        return EVENT_TYPES[self[0]]
+
+    @property
+    def j(self) -> Optional[int]:
+        return None if self[0] == OP_WRITE else self[2]
+
+    @property
+    def value(self) -> Optional[int]:
+        return self[2] if self[0] == OP_WRITE else None
+
+
+_DONE = _tuple_new(Event, (OP_DONE, None, None, None))
+
+
+def ev_compare(i: int, j: int) -> Event:
+    return _tuple_new(Event, (OP_COMPARE, i, j, None))
+
+
+def ev_swap(i: int, j: int) -> Event:
+    return _tuple_new(Event, (OP_SWAP, i, j, None))
+
+
+def ev_pivot(p: int) -> Event:
+    return _tuple_new(Event, (OP_PIVOT, p, None, None))
+
+
+def ev_select_min(i: int) -> Event:
+    return _tuple_new(Event, (OP_SELECT_MIN, i, None, None))
+
+
+def ev_write(i: int, value: int) -> Event:
+    return _tuple_new(Event, (OP_WRITE, i, value, None))
+
+
+def ev_mark_sorted(i: int) -> Event:
+    return _tuple_new(Event, (OP_MARK_SORTED, i, None, None))
+
+
+def ev_done() -> Event:
+    return _DONE
+
+
+# ----------------------------- Sorting Generators -----------------------------
+
+def bubble_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    n = len(a)
+    if n <= 1:
+        if n == 1:
+            yield ev_mark_sorted(0)
+        yield ev_done()
+        return
+
+    for end in range(n - 1, -1, -1):
+        for j in range(0, end):
+            yield ev_compare(j, j + 1)
+            if a[j] > a[j + 1]:
+                a[j], a[j + 1] = a[j + 1], a[j]
+                yield ev_swap(j, j + 1)
+        yield ev_mark_sorted(end)
+    yield ev_done()
+
+
+def selection_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    n = len(a)
+    if n <= 1:
+        if n == 1:
+            yield ev_mark_sorted(0)
+        yield ev_done()
+        return
+
+    for i in range(n):
+        min_idx = i
+        yield ev_select_min(min_idx)
+        for j in range(i + 1, n):
+            yield ev_compare(min_idx, j)
+            if a[j] < a[min_idx]:
+                min_idx = j
+                yield ev_select_min(min_idx)
+        if min_idx != i:
+            a[i], a[min_idx] = a[min_idx], a[i]
+            yield ev_swap(i, min_idx)
+        yield ev_mark_sorted(i)
+    yield ev_done()
+
+
+def merge_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    """Top-down merge sort, driven by an explicit stack instead of recursive generators.
+
+    Ranges are split and merged in the same order as the recursive formulation.
+    Instead of slicing both halves at every merge, one auxiliary copy of ``a`` is
+    allocated up front and the levels ping-pong between the two: a range merges
+    from whichever array its halves were sorted into, so the root lands in ``a``.
+    Each write still lands on the same index, so the events are unchanged.
+    """
+    n = len(a)
+    if n <= 1:
+        if n == 1:
+            yield ev_mark_sorted(0)
+        yield ev_done()
+        return
+
+    aux = list(a)
+    stack = [(0, n, True, False)]  # (lo, hi, result goes to a, halves already sorted)
+    while stack:
+        lo, hi, to_a, merge = stack.pop()
+        if hi - lo <= 1:
+            continue
+        mid = (lo + hi) // 2
+        if merge:
+            if to_a:
+                yield from _merge_into(aux, a, lo, mid, hi)
+            else:
+                yield from _merge_into(a, aux, lo, mid, hi)
+        else:
+            stack.append((lo, hi, to_a, True))
+            stack.append((mid, hi, not to_a, False))
+            stack.append((lo, mid, not to_a, False))
+
+    for idx in range(n):
+        yield ev_mark_sorted(idx)
+    yield ev_done()
+
+
+def quick_sort_lomuto_events(a: List[int]) -> Generator[Event, None, None]:
+    """Lomuto quicksort over an explicit stack; left partitions are finished first,
+    as in the recursive formulation, and sorted input no longer hits the recursion limit."""
+    n = len(a)
+    if n <= 1:
+        if n == 1:
+            yield ev_mark_sorted(0)
+        yield ev_done()
+        return
+
+    stack = [(0, n)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo <= 1:
+            if hi - lo == 1:
+                yield ev_mark_sorted(lo)
+            continue
+
+        pivot_idx = hi - 1
+        pivot_val = a[pivot_idx]
+        yield ev_pivot(pivot_idx)
+
+        i = lo
+        for j in range(lo, hi - 1):
+            yield ev_compare(j, pivot_idx)
+            if a[j] <= pivot_val:
+                if i != j:
+                    a[i], a[j] = a[j], a[i]
+                    yield ev_swap(i, j)
+                i += 1
+
+        if i != pivot_idx:
+            a[i], a[pivot_idx] = a[pivot_idx], a[i]
+            yield ev_swap(i, pivot_idx)
+
+        yield ev_mark_sorted(i)
+        stack.append((i + 1, hi))
+        stack.append((lo, i))
+    yield ev_done()
+
+
+# Partitions this small are finished by insertion sort (introsort); runs are extended
+# to at least timsort_min_run(n) elements by insertion sort (Timsort).
+INTRO_INSERTION_MAX = 16
+
+
+def _insertion_events(a: List[int], lo: int, hi: int, start: Optional[int] = None) -> Generator[Event, None, None]:
+    """Insertion sort a[lo:hi] by adjacent swaps, assuming a[lo:start] is already sorted."""
+    for i in range(lo + 1 if start is None else max(start, lo + 1), hi):
+        j = i
+        while j > lo:
+            yield ev_compare(j - 1, j)
+            if a[j] < a[j - 1]:
+                a[j - 1], a[j] = a[j], a[j - 1]
+                yield ev_swap(j - 1, j)
+                j -= 1
+            else:
+                break
+
+
+def _heap_sort_range(a: List[int], lo: int, hi: int) -> Generator[Event, None, None]:
+    """Heapsort a[lo:hi] in place, marking each position as it receives its final value."""
+
+    def sift_down(root: int, end: int) -> Generator[Event, None, None]:
+        # Heap positions are relative to lo; events use absolute indices.
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end:
+                yield ev_compare(lo + child, lo + child + 1)
+                if a[lo + child] < a[lo + child + 1]:
+                    child += 1
+            yield ev_compare(lo + root, lo + child)
+            if a[lo + root] < a[lo + child]:
+                a[lo + root], a[lo + child] = a[lo + child], a[lo + root]
+                yield ev_swap(lo + root, lo + child)
+                root = child
+            else:
+                return
+
+    size = hi - lo
+    for start in range(size // 2 - 1, -1, -1):
+        yield from sift_down(start, size)
+    for end in range(size - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        yield ev_swap(lo, lo + end)
+        yield ev_mark_sorted(lo + end)
+        yield from sift_down(0, end)
+    if size > 0:
+        yield ev_mark_sorted(lo)
+
+
+def _merge_into(src: List[int], dst: List[int], lo: int, mid: int, hi: int) -> Generator[Event, None, None]:
+    """Stable merge of the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi]."""
+    i = lo
+    j = mid
+    k = lo
+
+    while i < mid and j < hi:
+        yield ev_compare(i, j)
+        if src[i] <= src[j]:
+            val = src[i]
+            i += 1
+        else:
+            val = src[j]
+            j += 1
+        dst[k] = val
+        yield ev_write(k, val)
+        k += 1
+
+    while i < mid:
+        val = src[i]
+        i += 1
+        dst[k] = val
+        yield ev_write(k, val)
+        k += 1
+
+    while j < hi:
+        val = src[j]
+        j += 1
+        dst[k] = val
+        yield ev_write(k, val)
+        k += 1
+
+
+def _merge_events(a: List[int], lo: int, mid: int, hi: int, aux: List[int]) -> Generator[Event, None, None]:
+    """Stable in-place merge of a[lo:mid] and a[mid:hi] with the same events as _merge_into.
+
+    Only the left run is copied, into the preallocated ``aux`` (at least mid - lo
+    long); the right run is read in place, since every write lands left of it.
+    """
+    nl = mid - lo
+    for t in range(nl):
+        aux[t] = a[lo + t]
+    i = 0
+    j = mid
+    k = lo
+
+    while i < nl and j < hi:
+        yield ev_compare(lo + i, j)
+        if aux[i] <= a[j]:
+            val = aux[i]
+            i += 1
+        else:
+            val = a[j]
+            j += 1
+        a[k] = val
+        yield ev_write(k, val)
+        k += 1
+
+    while i < nl:
+        val = aux[i]
+        i += 1
+        a[k] = val
+        yield ev_write(k, val)
+        k += 1
+
+    while j < hi:
+        # Already in place; the write is still reported, as _merge_into reports it.
+        val = a[j]
+        j += 1
+        yield ev_write(k, val)
+        k += 1
+
+
+def heap_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    yield from _heap_sort_range(a, 0, len(a))
+    yield ev_done()
+
+
+def intro_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    """Quicksort with median-of-three pivots, insertion sort for small partitions and
+    a heapsort fallback once the partition depth exceeds 2*log2(n)."""
+    n = len(a)
+    stack = [(0, n, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= INTRO_INSERTION_MAX:
+            yield from _insertion_events(a, lo, hi)
+            for idx in range(lo, hi):
+                yield ev_mark_sorted(idx)
+            continue
+        if depth == 0:
+            yield from _heap_sort_range(a, lo, hi)
+            continue
+
+        # Order a[lo], a[mid], a[last], then move the median into the pivot slot.
+        mid = (lo + hi) // 2
+        last = hi - 1
+        for i, j in ((lo, mid), (mid, last), (lo, mid)):
+            yield ev_compare(i, j)
+            if a[j] < a[i]:
+                a[i], a[j] = a[j], a[i]
+                yield ev_swap(i, j)
+        a[mid], a[last] = a[last], a[mid]
+        yield ev_swap(mid, last)
+
+        pivot_val = a[last]
+        yield ev_pivot(last)
+        i = lo
+        for j in range(lo, last):
+            yield ev_compare(j, last)
+            if a[j] <= pivot_val:
+                if i != j:
+                    a[i], a[j] = a[j], a[i]
+                    yield ev_swap(i, j)
+                i += 1
+        if i != last:
+            a[i], a[last] = a[last], a[i]
+            yield ev_swap(i, last)
+
+        yield ev_mark_sorted(i)
+        stack.append((i + 1, hi, depth - 1))
+        stack.append((lo, i, depth - 1))
+    yield ev_done()
+
+
+def merge_sort_bottom_up_events(a: List[int]) -> Generator[Event, None, None]:
+    """Bottom-up merge sort; each pass merges runs of ``width`` from one of ``a`` and a
+    single auxiliary copy into the other (an unpaired tail is copied silently)."""
+    n = len(a)
+    src, dst = a, list(a)
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = lo + width
+            if mid >= n:
+                for t in range(lo, n):
+                    dst[t] = src[t]
+                break
+            yield from _merge_into(src, dst, lo, mid, min(lo + 2 * width, n))
+        src, dst = dst, src
+        width *= 2
+    if src is not a:
+        a[:] = src
+    for idx in range(n):
+        yield ev_mark_sorted(idx)
+    yield ev_done()
+
+
+def radix_sort_lsd_events(a: List[int], base: int = 10) -> Generator[Event, None, None]:
+    """LSD radix sort, one bucket pass per base-``base`` digit of (value - min).
+
+    Radix sort never compares elements, so a pass shows up as n writes.
+    """
+    n = len(a)
+    if n > 1:
+        lo_val = min(a)
+        span = max(a) - lo_val
+        exp = 1
+        while span // exp > 0:
+            buckets: List[List[int]] = [[] for _ in range(base)]
+            for v in a:
+                buckets[(v - lo_val) // exp % base].append(v)
+            k = 0
+            for bucket in buckets:
+                for v in bucket:
+                    a[k] = v
+                    yield ev_write(k, v)
+                    k += 1
+            exp *= base
+    for idx in range(n):
+        yield ev_mark_sorted(idx)
+    yield ev_done()
+
+
+def counting_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    """Counting sort; each position is written once with its final value.
+
+    Uses a dense count table when the value range is at most a few times n, and
+    a dict of counts (with sorted keys) otherwise.
+    """
+    n = len(a)
+    if n:
+        lo_val = min(a)
+        span = max(a) - lo_val
+        if span <= 4 * n + 1024:
+            table = [0] * (span + 1)
+            for v in a:
+                table[v - lo_val] += 1
+            counts: Iterable[Tuple[int, int]] = ((lo_val + d, c) for d, c in enumerate(table) if c)
+        else:
+            sparse: Dict[int, int] = {}
+            for v in a:
+                sparse[v] = sparse.get(v, 0) + 1
+            counts = sorted(sparse.items())
+        k = 0
+        for v, c in counts:
+            for _ in range(c):
+                a[k] = v
+                yield ev_write(k, v)
+                yield ev_mark_sorted(k)
+                k += 1
+    yield ev_done()
+
+
+def timsort_min_run(n: int) -> int:
+    """Timsort's minimum run length: n itself below 64, else a value in 32..64."""
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def tim_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    """Timsort-style sort: natural runs (descending ones reversed), short runs extended
+    by insertion sort, and merges that keep the run-stack length invariants.
+    There is no galloping mode."""
+    n = len(a)
+    min_run = timsort_min_run(n)
+    runs: List[Tuple[int, int]] = []  # (start, length), left to right
+    aux = [0] * (n // 2)  # enough for the left run of any merge (the stack invariants keep it <= n/2)
+
+    def merge_at(k: int) -> Generator[Event, None, None]:
+        (lo, len1), (mid, len2) = runs[k], runs[k + 1]
+        if len1 > len(aux):
+            aux.extend([0] * (len1 - len(aux)))
+        yield from _merge_events(a, lo, mid, mid + len2, aux)
+        runs[k] = (lo, len1 + len2)
+        del runs[k + 1]
+
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            yield ev_compare(lo, hi)
+            descending = a[hi] < a[lo]
+            hi += 1
+            while hi < n:
+                yield ev_compare(hi - 1, hi)
+                if (a[hi] < a[hi - 1]) != descending:
+                    break
+                hi += 1
+            if descending:
+                i, j = lo, hi - 1
+                while i < j:
+                    a[i], a[j] = a[j], a[i]
+                    yield ev_swap(i, j)
+                    i += 1
+                    j -= 1
+
+        force = min(n, lo + min_run)
+        if hi < force:
+            yield from _insertion_events(a, lo, force, hi)
+            hi = force
+        runs.append((lo, hi - lo))
+        lo = hi
+
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if (k > 0 and runs[k - 1][1] <= runs[k][1] + runs[k + 1][1]) or (
+                k > 1 and runs[k - 2][1] <= runs[k - 1][1] + runs[k][1]
+            ):
+                if runs[k - 1][1] < runs[k + 1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k + 1][1]:
+                break
+            yield from merge_at(k)
+
+    while len(runs) > 1:
+        k = len(runs) - 2
+        if k > 0 and runs[k - 1][1] < runs[k + 1][1]:
+            k -= 1
+        yield from merge_at(k)
+
+    for idx in range(n):
+        yield ev_mark_sorted(idx)
+    yield ev_done()
+
+
+# ----------------------------- Coalescing -----------------------------
+
+# Events that change nothing but the highlight; a run of them can share one visual step.
+NON_MUTATING_OPS = frozenset((OP_COMPARE, OP_SELECT_MIN))
+
+
+def ev_mark_sorted_many(indices: Sequence[int]) -> Event:
+    """One mark_sorted event covering several indices (``i`` is the first of them)."""
+    return _tuple_new(Event, (OP_MARK_SORTED, indices[0], None, tuple(indices)))
+
+
+def coalesce_events(events: Iterable[Event], max_run: int = 256) -> Iterator[List[Event]]:
+    """Group an event stream into visual steps; stops at the first "done" event.
+
+    Up to ``max_run`` consecutive non-mutating events form one step, a burst of
+    consecutive mark_sorted events is collapsed into a single ev_mark_sorted_many
+    event, and every other event is a step of its own. No event is dropped, so
+    counters applied per event stay exact.
+    """
+    run: List[Event] = []
+    marks: List[int] = []
+    for event in events:
+        op = event[0]
+        if op == OP_MARK_SORTED and event[1] is not None and event[3] is None:
+            if run:
+                yield run
+                run = []
+            marks.append(event[1])
+            continue
+        if marks:
+            yield [ev_mark_sorted_many(marks) if len(marks) > 1 else ev_mark_sorted(marks[0])]
+            marks = []
+        if op == OP_DONE:
+            break
+        if op in NON_MUTATING_OPS:
+            run.append(event)
+            if len(run) >= max_run:
+                yield run
+                run = []
+        else:
+            if run:
+                yield run
+                run = []
+            yield [event]
+    if run:
+        yield run
+    if marks:
+        yield [ev_mark_sorted_many(marks) if len(marks) > 1 else ev_mark_sorted(marks[0])]
+
+
+# ----------------------------- Timing -----------------------------
+
+T = TypeVar("T")
+
+
+@dataclass
+class RunTimings:
+    """Where one run's time went, in nanoseconds, so algorithm cost is not read off the animation.
+
+    Generator time is what the sort itself costs: CPU time (process_time_ns, or
+    thread_time_ns on a worker thread) and wall time spent inside next(). Apply,
+    render and idle (waiting for the next timer tick) are wall time on the UI side.
+    """
+    generator_cpu_ns: int = 0
+    generator_wall_ns: int = 0
+    apply_ns: int = 0
+    render_ns: int = 0
+    idle_ns: int = 0
+
+
+def next_batch(source: Iterator[T], max_items: int, timings: RunTimings) -> List[T]:
+    """Up to ``max_items`` items from ``source`` (fewer once it is exhausted), timed as generator work.
+
+    The clocks are read once per batch: process_time_ns costs about as much as a
+    cheap event, so reading it around every next() would mostly time the clock.
+    """
+    cpu0 = time.process_time_ns()
+    wall0 = time.perf_counter_ns()
+    batch = list(islice(source, max_items))
+    timings.generator_wall_ns += time.perf_counter_ns() - wall0
+    timings.generator_cpu_ns += time.process_time_ns() - cpu0
+    return batch
+
+
+# ----------------------------- Replay Engine -----------------------------
+
+EventSource = Callable[[List[int]], Iterator[Event]]
+
+
+class SortEngine:
+    """Drive one sorting generator and apply its events to a visible array.
+
+    The generator sorts a private copy (``work``); ``data`` only changes through
+    applied swap/write events, exactly as the GUI shows it. ``data`` is mutated in
+    place, so a caller may pass in the list it renders from.
+    """
+
+    def __init__(self, algorithm: EventSource, data: List[int], timings: Optional[RunTimings] = None) -> None:
+        self.data = data
+        self.work: List[int] = list(data)
+        self._gen: Iterator[Event] = algorithm(self.work)
+        self.timings = timings if timings is not None else RunTimings()  # filled by next_events()
+
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        self.events = 0
+        self.sorted_indices: Set[int] = set()
+        self.pivot_index: Optional[int] = None
+        self.done = False
+
+    @property
+    def swaps_or_writes(self) -> int:
+        return self.swaps + self.writes
+
+    def take_events(self) -> Iterator[Event]:
+        """Hand the generator to another consumer (e.g. a producer thread).
+
+        The caller then feeds events back through apply(); next_event() reports done.
+        """
+        gen, self._gen = self._gen, iter(())
+        return gen
+
+    def next_event(self) -> Optional[Event]:
+        """Advance the generator without applying; None once the sort is done."""
+        if self.done:
+            return None
+        try:
+            event = next(self._gen)
+        except StopIteration:
+            self.finish()
+            return None
+        if event[0] == OP_DONE:
+            self.finish()
+            return None
+        return event
+
+    def next_events(self, max_events: int) -> List[Event]:
+        """next_event() for up to ``max_events`` events at once, timing the generator into ``timings``."""
+        if self.done:
+            return []
+        batch = next_batch(self._gen, max_events, self.timings)
+        for k, event in enumerate(batch):
+            if event[0] == OP_DONE:
+                del batch[k:]
+                self.finish()
+                return batch
+        if len(batch) < max_events:
+            self.finish()
+        return batch
+
+    def apply(self, event: Event) -> None:
+        op, a, b, indices = event
+        if indices is not None and op == OP_MARK_SORTED:
+            self.sorted_indices.update(indices)
+            self.events += len(indices)
+            return
+        self.apply_op(op, a, b)
+
+    def apply_op(self, op: int, a: Optional[int], b: Optional[int]) -> None:
+        """Apply an event given as an opcode and its two operand slots."""
+        data = self.data
+        self.events += 1
+
+        if op == OP_COMPARE:
+            self.comparisons += 1
+
+        elif op == OP_SWAP:
+            if a is not None and b is not None and 0 <= a < len(data) and 0 <= b < len(data):
+                data[a], data[b] = data[b], data[a]
+            self.swaps += 1
+
+        elif op == OP_PIVOT:
+            if a is not None:
+                self.pivot_index = a
+
+        elif op == OP_WRITE:
+            if a is not None and b is not None and 0 <= a < len(data):
+                data[a] = b
+            self.writes += 1
+
+        elif op == OP_MARK_SORTED:
+            if a is not None:
+                self.sorted_indices.add(a)
+
+    def step(self) -> Optional[Event]:
+        """Advance and apply one event; returns it, or None once the sort is done."""
+        event = self.next_event()
+        if event is not None:
+            self.apply(event)
+        return event
+
+    def run(self, max_events: Optional[int] = None) -> int:
+        """Apply events until done (or ``max_events``); returns how many were applied."""
+        count = 0
+        while max_events is None or count < max_events:
+            if self.step() is None:
+                break
+            count += 1
+        return count
+
+    def finish(self) -> None:
+        self.done = True
+        self.pivot_index = None
+        self.sorted_indices = set(range(len(self.data)))
+
+
+def run_sort(algorithm: EventSource, data: List[int]) -> SortEngine:
+    """Replay ``algorithm`` over a copy of ``data`` to completion and return the engine."""
+    engine = SortEngine(algorithm, list(data))
+    engine.run()
+    return engine
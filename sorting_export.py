@@ -0,0 +1,581 @@
+"""Headless export: replay a sort off-screen into an animated GIF, an APNG or PPM frames.
+
+No Tk window is opened and nothing is timed against the wall clock: every frame
+advances the sort by a fixed number of events and lasts exactly 1/fps seconds,
+so the same arguments always produce the same file. Bars are binned per pixel
+column the way the app's raster view draws large datasets.
+
+Example:
+    python sorting_export.py quick.gif --algorithm quick --n 10000 --events-per-frame 500
+    python sorting_export.py merge.png --algorithm merge --n 200 --fps 60 --events-per-frame 4
+    python sorting_export.py frames/ --trace run.svtrace --width 1280 --height 720
+    python sorting_export.py gauss.gif --algorithm heap --preset "Gaussian (500)"
+"""
+
+import abc
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sorting_datasets import DISTRIBUTIONS, PRESETS, make_dataset, preset
+from sorting_engine import (
+    OP_COMPARE,
+    OP_DONE,
+    OP_MARK_SORTED,
+    OP_PIVOT,
+    OP_SELECT_MIN,
+    OP_SWAP,
+    OP_WRITE,
+    EventSource,
+    SortEngine,
+)
+from sorting_import import load_dataset_file
+from sorting_registry import default_registry
+from sorting_trace import EventTrace
+
+
+Step = Tuple[int, int, int]  # (opcode, a, b) as yielded by EventTrace.steps()
+Box = Tuple[int, int, int, int]  # x0, y0, x1, y1 (exclusive)
+
+
+# ----------------------------- Palette -----------------------------
+
+# Same colors as the app; each gets a half-way tint with white (the min..max span
+# of a pixel column), so the palette has 1 + 2 * 8 entries.
+COLORS: Dict[str, str] = {
+    "default": "#3B82F6",
+    "comparing": "#F59E0B",
+    "swapping": "#EF4444",
+    "pivot": "#A855F7",
+    "selected_min": "#22C55E",
+    "writing": "#06B6D4",
+    "sorted": "#10B981",
+    "finished": "#111827",
+}
+BACKGROUND = "#FFFFFF"
+
+_NAMES = tuple(COLORS)
+_SOLID = {name: 1 + k for k, name in enumerate(_NAMES)}
+_TINT_OFFSET = len(_NAMES)
+
+_HIGHLIGHTS = {
+    OP_COMPARE: _SOLID["comparing"],
+    OP_SWAP: _SOLID["swapping"],
+    OP_PIVOT: _SOLID["pivot"],
+    OP_SELECT_MIN: _SOLID["selected_min"],
+    OP_WRITE: _SOLID["writing"],
+}
+
+
+def _rgb(color: str) -> Tuple[int, int, int]:
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def palette_rgb() -> List[Tuple[int, int, int]]:
+    """RGB of every palette index: background, the solid colors, then their tints."""
+    solids = [_rgb(COLORS[name]) for name in _NAMES]
+    tints = [tuple((c + 255) // 2 for c in rgb) for rgb in solids]
+    return [_rgb(BACKGROUND)] + solids + tints
+
+
+# ----------------------------- Rendering -----------------------------
+
+class FrameRenderer:
+    """Rasterize bar charts into palette-indexed frames, one byte per pixel, rows top-down.
+
+    Element runs are binned into ``min(n, width)`` columns. Each column is kept as
+    a (top, solid_top, color) key, so a frame only recomputes the columns touched
+    since the previous one and reports the bounding box of what actually changed.
+    """
+
+    def __init__(self, width: int, height: int, n: int, max_val: int) -> None:
+        self.width = width
+        self.height = height
+        self.n = n
+        self.max_val = max(1, max_val)
+        self.cols = max(1, min(n, width))
+        self.edges = [c * width // self.cols for c in range(self.cols + 1)]
+        # Bars at least 3px wide keep the app's 1px gap on each side.
+        self.gap = 1 if width // self.cols >= 3 else 0
+        self.keys: List[Optional[Tuple[int, int, int]]] = [None] * self.cols
+        self._frame: Optional[bytes] = None
+
+    def column_of(self, i: int) -> int:
+        return i * self.cols // self.n
+
+    def column_key(
+        self, c: int, data: Sequence[int], sorted_mask: bytearray, color: Optional[int], finished: bool
+    ) -> Tuple[int, int, int]:
+        """Key of column c: filled solid up to the run's minimum and tinted up to its maximum."""
+        n = self.n
+        cols = self.cols
+        lo = -(-c * n // cols)
+        hi = -(-(c + 1) * n // cols)
+        chunk = data[lo:hi]
+        h = self.height
+        top = h - round(max(chunk) / self.max_val * h)
+        solid = h - round(min(chunk) / self.max_val * h)
+        if finished:
+            color = _SOLID["finished"]
+        elif color is None:
+            color = _SOLID["sorted"] if sorted_mask.count(1, lo, hi) == hi - lo else _SOLID["default"]
+        return max(0, top), max(0, solid), color
+
+    def update(self, new_keys: Dict[int, Tuple[int, int, int]]) -> Optional[Box]:
+        """Take over changed column keys; returns the dirty pixel box, or None if unchanged."""
+        keys = self.keys
+        c_lo = c_hi = -1
+        y0 = self.height
+        for c, key in new_keys.items():
+            old = keys[c]
+            if old == key:
+                continue
+            keys[c] = key
+            if c_lo < 0 or c < c_lo:
+                c_lo = c
+            if c > c_hi:
+                c_hi = c
+            y0 = min(y0, key[0], old[0] if old is not None else 0)
+        if c_lo < 0:
+            return None
+        self._frame = None
+        if y0 >= self.height:  # only empty columns changed color
+            y0 = self.height - 1
+        return self.edges[c_lo], y0, self.edges[c_hi + 1], self.height
+
+    def raster(self) -> bytes:
+        """The full frame: a row sweep that repaints a column only where its fill changes."""
+        if self._frame is not None:
+            return self._frame
+        width = self.width
+        h = self.height
+        gap = self.gap
+        edges = self.edges
+        starts: List[List[Tuple[int, int, bytes]]] = [[] for _ in range(h)]
+        for c, key in enumerate(self.keys):
+            if key is None:
+                continue
+            top, solid, color = key
+            x0 = edges[c] + gap
+            x1 = max(x0 + 1, edges[c + 1] - gap)
+            if top < solid:
+                starts[top].append((x0, x1, bytes((color + _TINT_OFFSET,)) * (x1 - x0)))
+            if solid < h:
+                starts[solid].append((x0, x1, bytes((color,)) * (x1 - x0)))
+
+        row = bytearray(width)
+        frame = bytearray()
+        for y in range(h):
+            for x0, x1, run in starts[y]:
+                row[x0:x1] = run
+            frame += row
+        self._frame = bytes(frame)
+        return self._frame
+
+
+def crop(frame: bytes, width: int, box: Box) -> bytes:
+    x0, y0, x1, y1 = box
+    if x0 == 0 and x1 == width:
+        return frame[y0 * width:y1 * width]
+    return b"".join(frame[y * width + x0:y * width + x1] for y in range(y0, y1))
+
+
+# ----------------------------- Encoders -----------------------------
+
+class _DeltaWriter(abc.ABC):
+    """Base for animated formats: an unchanged frame extends the previous frame's delay.
+
+    ``add_frame`` receives the full frame plus the box that changed; subclasses
+    store only that box (frames are composited, never disposed).
+    """
+
+    def __init__(self, path: str, width: int, height: int) -> None:
+        self.path = path
+        self.width = width
+        self.height = height
+        self.frames = 0
+        self._pending: Optional[Tuple[Box, bytes]] = None
+        self._pending_s = 0.0
+        self._clock_s = 0.0  # end time of the last written frame, for drift-free rounding
+
+    def add_frame(self, frame: bytes, box: Optional[Box], seconds: float) -> None:
+        if box is None and self._pending is not None:
+            self._pending_s += seconds
+            return
+        self._flush()
+        if box is None:
+            box = (0, 0, self.width, self.height)
+        self._pending = (box, crop(frame, self.width, box))
+        self._pending_s = seconds
+
+    def _flush(self) -> None:
+        if self._pending is None:
+            return
+        start = self._clock_s
+        self._clock_s += self._pending_s
+        self._write_frame(self._pending[0], self._pending[1], start, self._clock_s)
+        self.frames += 1
+        self._pending = None
+
+    @abc.abstractmethod
+    def _write_frame(self, box: Box, pixels: bytes, start_s: float, end_s: float) -> None:
+        """Store ``pixels`` (the cropped ``box``) shown from ``start_s`` to ``end_s``."""
+
+    def close(self) -> None:
+        self._flush()
+
+
+def _lzw_encode(pixels: bytes, min_code_size: int) -> bytes:
+    """GIF-flavoured LZW (variable width, LSB-first, reset at 4096 codes)."""
+    clear = 1 << min_code_size
+    eoi = clear + 1
+    size = min_code_size + 1
+    next_code = eoi + 1
+    table: Dict[int, int] = {}
+    out = bytearray()
+    buf = clear
+    nbits = size
+
+    prefix = pixels[0]
+    for k in range(1, len(pixels)):
+        px = pixels[k]
+        key = (prefix << 8) | px
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+
+        buf |= prefix << nbits
+        nbits += size
+        while nbits >= 8:
+            out.append(buf & 0xFF)
+            buf >>= 8
+            nbits -= 8
+        if next_code >= (1 << size) and size < 12:
+            size += 1
+
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+        else:
+            buf |= clear << nbits
+            nbits += size
+            table.clear()
+            next_code = eoi + 1
+            size = min_code_size + 1
+        prefix = px
+
+    buf |= prefix << nbits
+    nbits += size
+    if next_code >= (1 << size) and size < 12:
+        size += 1
+    buf |= eoi << nbits
+    nbits += size
+    while nbits > 0:
+        out.append(buf & 0xFF)
+        buf >>= 8
+        nbits -= 8
+    return bytes(out)
+
+
+class GifWriter(_DeltaWriter):
+    """Animated GIF89a with a global palette; delays are in centiseconds."""
+
+    def __init__(self, path: str, width: int, height: int, palette: Sequence[Tuple[int, int, int]]) -> None:
+        super().__init__(path, width, height)
+        depth = max(1, (len(palette) - 1).bit_length())
+        self._min_code_size = max(2, depth)
+        table = bytearray()
+        for rgb in palette:
+            table += bytes(rgb)
+        table += b"\0" * (3 * (1 << depth) - len(table))
+
+        self._f = open(path, "wb")
+        self._f.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF0 | (depth - 1), 0, 0))
+        self._f.write(table)
+        self._f.write(b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00")  # loop forever
+
+    def _write_frame(self, box: Box, pixels: bytes, start_s: float, end_s: float) -> None:
+        x0, y0, x1, y1 = box
+        delay = min(0xFFFF, round(end_s * 100) - round(start_s * 100))
+        f = self._f
+        # Graphic control: disposal 1 (leave in place), no transparency.
+        f.write(b"\x21\xF9\x04\x04" + struct.pack("<H", delay) + b"\x00\x00")
+        f.write(b"\x2C" + struct.pack("<HHHHB", x0, y0, x1 - x0, y1 - y0, 0))
+        f.write(bytes((self._min_code_size,)))
+        data = _lzw_encode(pixels, self._min_code_size)
+        for k in range(0, len(data), 255):
+            block = data[k:k + 255]
+            f.write(bytes((len(block),)) + block)
+        f.write(b"\x00")
+
+    def close(self) -> None:
+        super().close()
+        self._f.write(b"\x3B")
+        self._f.close()
+
+
+def _png_chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+
+class ApngWriter(_DeltaWriter):
+    """Animated PNG (palette color type); delays are in milliseconds.
+
+    The frame count in acTL is only known at the end, so it is patched on close.
+    """
+
+    def __init__(self, path: str, width: int, height: int, palette: Sequence[Tuple[int, int, int]]) -> None:
+        super().__init__(path, width, height)
+        self._seq = 0
+        self._f = open(path, "wb")
+        self._f.write(b"\x89PNG\r\n\x1a\n")
+        self._f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)))
+        self._f.write(_png_chunk(b"PLTE", b"".join(bytes(rgb) for rgb in palette)))
+        self._actl_at = self._f.tell()
+        self._f.write(_png_chunk(b"acTL", struct.pack(">II", 0, 0)))
+
+    def _write_frame(self, box: Box, pixels: bytes, start_s: float, end_s: float) -> None:
+        x0, y0, x1, y1 = box
+        w = x1 - x0
+        delay = min(0xFFFF, round(end_s * 1000) - round(start_s * 1000))
+        f = self._f
+        f.write(_png_chunk(b"fcTL", struct.pack(
+            ">IIIIIHHBB", self._seq, w, y1 - y0, x0, y0, delay, 1000, 0, 0)))
+        self._seq += 1
+        # Filter type 0 (none) on every row: bar charts compress well enough as is.
+        raw = b"".join(b"\0" + pixels[k:k + w] for k in range(0, len(pixels), w))
+        data = zlib.compress(raw, 6)
+        if self.frames == 0:
+            f.write(_png_chunk(b"IDAT", data))
+        else:
+            f.write(_png_chunk(b"fdAT", struct.pack(">I", self._seq) + data))
+            self._seq += 1
+
+    def close(self) -> None:
+        super().close()
+        f = self._f
+        f.write(_png_chunk(b"IEND", b""))
+        f.seek(self._actl_at)
+        f.write(_png_chunk(b"acTL", struct.pack(">II", self.frames, 0)))
+        f.close()
+
+
+class PpmSequenceWriter:
+    """One binary PPM per frame (frame_000000.ppm, ...), every frame written in full.
+
+    Suited to piping into an encoder at the same rate, e.g.
+    ``ffmpeg -framerate 30 -i frames/frame_%06d.ppm out.mp4``.
+    """
+
+    def __init__(self, path: str, width: int, height: int, palette: Sequence[Tuple[int, int, int]]) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.width = width
+        self.height = height
+        self.frames = 0
+        # One translate table per channel maps palette indices straight to bytes.
+        self._channels = [bytes(palette[k][ch] if k < len(palette) else 0 for k in range(256)) for ch in range(3)]
+        self._header = b"P6\n%d %d\n255\n" % (width, height)
+
+    def add_frame(self, frame: bytes, box: Optional[Box], seconds: float) -> None:
+        rgb = bytearray(len(frame) * 3)
+        for ch, table in enumerate(self._channels):
+            rgb[ch::3] = frame.translate(table)
+        with open(os.path.join(self.path, f"frame_{self.frames:06d}.ppm"), "wb") as f:
+            f.write(self._header)
+            f.write(rgb)
+        self.frames += 1
+
+    def close(self) -> None:
+        pass
+
+
+def open_writer(path: str, width: int, height: int):
+    """GifWriter for ``.gif``, ApngWriter for ``.png``/``.apng``, otherwise a PPM directory."""
+    palette = palette_rgb()
+    lower = path.lower()
+    if lower.endswith(".gif"):
+        return GifWriter(path, width, height, palette)
+    if lower.endswith((".png", ".apng")):
+        return ApngWriter(path, width, height, palette)
+    return PpmSequenceWriter(path, width, height, palette)
+
+
+# ----------------------------- Export -----------------------------
+
+def generator_steps(algorithm: EventSource, data: Sequence[int]) -> Iterator[Step]:
+    """Run ``algorithm`` over a copy of ``data`` as ``(opcode, a, b)`` steps."""
+    for op, a, b, indices in algorithm(list(data)):
+        if op == OP_DONE:
+            return
+        if indices is not None:
+            for i in indices:
+                yield op, i, 0
+        else:
+            yield op, a, b
+
+
+def export_animation(
+    steps: Iterable[Step],
+    data: Sequence[int],
+    writer,
+    width: int,
+    height: int,
+    events_per_frame: int = 1,
+    fps: float = 30.0,
+    hold: float = 1.0,
+) -> SortEngine:
+    """Replay ``steps`` over ``data``, emitting one frame per ``events_per_frame`` events.
+
+    The first frame shows the input, the last one the finished array for ``hold``
+    seconds. Closes ``writer`` and returns the engine holding the final counters.
+    """
+    engine = SortEngine(lambda _work: iter(()), list(data))
+    data = engine.data
+    n = len(data)
+    frame_s = 1.0 / fps
+    if n == 0:
+        writer.add_frame(bytes(width * height), None, hold or frame_s)
+        writer.close()
+        return engine
+
+    renderer = FrameRenderer(width, height, n, max(data))
+    column_of = renderer.column_of
+    column_key = renderer.column_key
+    sorted_mask = bytearray(n)
+    apply_op = engine.apply_op
+
+    pivot_col: Optional[int] = None
+
+    def emit(columns: Iterable[int], highlights: Dict[int, int], finished: bool, seconds: float) -> None:
+        # Highlight > pivot > sorted/unsorted, as in the app.
+        pivot = {} if pivot_col is None else {pivot_col: _SOLID["pivot"]}
+        keys = {c: column_key(c, data, sorted_mask, highlights.get(c, pivot.get(c)), finished) for c in columns}
+        box = renderer.update(keys)
+        writer.add_frame(renderer.raster(), box, seconds)
+
+    emit(range(renderer.cols), {}, False, frame_s)
+
+    highlights: Dict[int, int] = {}
+    dirty = set()
+    previous = ()
+    pending = 0
+    for op, a, b in steps:
+        if op == OP_DONE:
+            break
+        apply_op(op, a, b)
+        color = _HIGHLIGHTS.get(op)
+        if color is not None:
+            ca = column_of(a)
+            highlights[ca] = color
+            dirty.add(ca)
+            if op == OP_COMPARE or op == OP_SWAP:
+                cb = column_of(b)
+                highlights[cb] = color
+                dirty.add(cb)
+            if op == OP_PIVOT and ca != pivot_col:
+                if pivot_col is not None:
+                    dirty.add(pivot_col)
+                pivot_col = ca
+        elif op == OP_MARK_SORTED:
+            sorted_mask[a] = 1
+            dirty.add(column_of(a))
+        pending += 1
+        if pending == events_per_frame:
+            # Last frame's highlights are cleared unless highlighted again.
+            dirty.update(previous)
+            emit(dirty, highlights, False, frame_s)
+            previous = tuple(highlights)
+            highlights = {}
+            dirty = set()
+            pending = 0
+
+    if pending:
+        dirty.update(previous)
+        emit(dirty, highlights, False, frame_s)
+    engine.finish()
+    pivot_col = None
+    emit(range(renderer.cols), {}, True, max(hold, frame_s))
+    writer.close()
+    return engine
+
+
+# ----------------------------- CLI -----------------------------
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    registry = default_registry()
+    parser = argparse.ArgumentParser(description="Render a sort to an animated GIF/APNG or PPM frames, without Tk.")
+    parser.add_argument("output", help="*.gif, *.png/*.apng, or a directory for PPM frames")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--algorithm", default="quick",
+                        help=f"algorithm key or name (default quick): {', '.join(registry.keys())}")
+    source.add_argument("--trace", metavar="PATH", help="replay a saved .svtrace instead of running a generator")
+    parser.add_argument("--input", metavar="PATH", help="dataset file (text/CSV or raw int32) instead of --distribution")
+    parser.add_argument("--preset", choices=[p.name for p in PRESETS],
+                        help="a named dataset (overrides --distribution, --n, --max and --seed)")
+    parser.add_argument("--distribution", default="uniform", choices=DISTRIBUTIONS)
+    parser.add_argument("--n", type=int, default=200, help="dataset size")
+    parser.add_argument("--max", type=int, default=1000, help="largest generated value (values start at 1)")
+    parser.add_argument("--seed", type=int, default=0, help="dataset seed (default 0, for reproducible output)")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate (GIF players round to 1/100 s)")
+    parser.add_argument("--events-per-frame", type=int, default=1)
+    parser.add_argument("--hold", type=float, default=1.0, help="seconds to show the finished array")
+    args = parser.parse_args(argv)
+    for error in registry.errors:
+        print(f"skipped plugin: {error}", file=sys.stderr)
+
+    if args.width < 1 or args.height < 1 or args.width > 0xFFFF or args.height > 0xFFFF:
+        parser.error("--width and --height must be between 1 and 65535")
+    if args.fps <= 0 or args.events_per_frame < 1 or args.hold < 0:
+        parser.error("need --fps > 0, --events-per-frame >= 1 and --hold >= 0")
+
+    trace: Optional[EventTrace] = None
+    try:
+        if args.trace:
+            trace = EventTrace.load(args.trace)
+            data: List[int] = list(trace.initial)
+            steps: Iterable[Step] = trace.steps()
+            name = trace.algorithm or os.path.basename(args.trace)
+        else:
+            if args.algorithm not in registry:
+                parser.error(f"unknown algorithm: {args.algorithm}")
+            name = registry.get(args.algorithm).name
+            if args.input:
+                data = load_dataset_file(args.input)
+            elif args.preset:
+                data = preset(args.preset).make()
+            else:
+                if args.n < 0 or args.max < 1:
+                    parser.error("need --n >= 0 and --max >= 1")
+                # portable: the seed alone fixes the data, with or without NumPy
+                data = make_dataset(args.distribution, args.n, 1, args.max, args.seed, portable=True)
+            steps = generator_steps(registry.load(name), data)
+
+        t0 = time.perf_counter()
+        writer = open_writer(args.output, args.width, args.height)
+        engine = export_animation(steps, data, writer, args.width, args.height,
+                                  args.events_per_frame, args.fps, args.hold)
+        elapsed = time.perf_counter() - t0
+    except (OSError, ValueError, ImportError, AttributeError) as exc:
+        # DatasetParseError is a ValueError; ImportError/AttributeError come from plugins.
+        print(f"export failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if trace is not None:
+            trace.close()
+
+    duration = engine.events / args.events_per_frame / args.fps + args.hold
+    print(f"{name}: n={len(data)}, {engine.events} events, {writer.frames} frames "
+          f"(~{duration:.1f}s of animation) written to {args.output} in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
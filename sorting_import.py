@@ -0,0 +1,103 @@
+"""Dataset import: a streaming tokenizer for text/CSV input and a raw int32 reader.
+
+Text is read in fixed-size chunks and scanned once; a token cut by a chunk
+boundary is carried into the next chunk, so memory stays at one chunk plus the
+parsed values. Errors report the absolute character offset of the bad token.
+"""
+
+import os
+import re
+import sys
+from array import array
+from typing import Iterable, List, Optional
+
+CHUNK_CHARS = 1 << 20
+BINARY_EXTENSIONS = (".bin", ".i32", ".int32")
+
+_TOKEN = re.compile(r"[^,\s]+")
+_SEPARATORS = ",\t\n\r\x0b\x0c "
+
+
+class DatasetParseError(ValueError):
+    """Invalid token (or too many values) at character ``position`` of the input."""
+
+    def __init__(self, message: str, position: int, token: str = "") -> None:
+        super().__init__(message)
+        self.position = position
+        self.token = token
+
+
+def _last_separator(chunk: str) -> int:
+    return max(chunk.rfind(sep) for sep in _SEPARATORS)
+
+
+def parse_int_chunks(chunks: Iterable[str], limit: Optional[int] = None) -> List[int]:
+    """Parse non-negative integers separated by commas and/or whitespace.
+
+    Raises DatasetParseError at the first token that is not a plain decimal
+    integer, or at the first value beyond ``limit``.
+    """
+    out: List[int] = []
+    append = out.append
+    carry = ""
+    offset = 0  # absolute position of the start of ``carry``
+
+    def scan(text: str, base: int) -> None:
+        for m in _TOKEN.finditer(text):
+            tok = m.group()
+            if not (tok.isascii() and tok.isdigit()):
+                raise DatasetParseError(f"invalid number {tok[:20]!r} at position {base + m.start()}",
+                                        base + m.start(), tok)
+            if limit is not None and len(out) >= limit:
+                raise DatasetParseError(f"more than {limit} numbers", base + m.start(), tok)
+            append(int(tok))
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        text = carry + chunk if carry else chunk
+        cut = _last_separator(text) + 1
+        scan(text[:cut], offset)
+        carry = text[cut:]
+        offset += cut
+    if carry:
+        scan(carry, offset)
+    return out
+
+
+def parse_int_text(text: str, limit: Optional[int] = None) -> List[int]:
+    return parse_int_chunks((text,), limit)
+
+
+def _read_chunks(f, size: int = CHUNK_CHARS) -> Iterable[str]:
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_int32_file(path: str, limit: Optional[int] = None) -> List[int]:
+    """Read a headerless little-endian int32 array; negative values are rejected."""
+    size = os.path.getsize(path)
+    if size % 4:
+        raise DatasetParseError(f"binary file size {size} is not a multiple of 4", size - size % 4)
+    if limit is not None and size // 4 > limit:
+        raise DatasetParseError(f"more than {limit} numbers", limit * 4)
+    values = array("i")
+    with open(path, "rb") as f:
+        values.fromfile(f, size // 4)
+    if sys.byteorder != "little":
+        values.byteswap()
+    if values and min(values) < 0:
+        k = next(k for k, v in enumerate(values) if v < 0)
+        raise DatasetParseError(f"negative value {values[k]} at index {k}", k * 4, str(values[k]))
+    return values.tolist()
+
+
+def load_dataset_file(path: str, limit: Optional[int] = None) -> List[int]:
+    """Load a dataset from text/CSV, or from raw int32 for the BINARY_EXTENSIONS."""
+    if path.lower().endswith(BINARY_EXTENSIONS):
+        return read_int32_file(path, limit)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return parse_int_chunks(_read_chunks(f), limit)
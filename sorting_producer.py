@@ -0,0 +1,144 @@
+"""Run an event generator on a worker thread and hand its events over in batches."""
+
+import queue
+import threading
+import time
+from typing import Iterator, List, Optional, Union
+
+from sorting_engine import OP_DONE, Event, RunTimings
+
+# What the worker drains: single events, or lists of them from coalesce_events.
+Step = Union[Event, List[Event]]
+
+
+class _NotReady:
+    def __repr__(self) -> str:
+        return "NOT_READY"
+
+
+NOT_READY = _NotReady()  # poll() result when the worker has nothing queued yet
+_END = object()
+
+
+class EventProducer:
+    """Drain ``events`` (or coalesced steps) on a daemon thread into a bounded queue of batches.
+
+    The consumer calls ``poll()`` from its own thread (the Tk loop) and never
+    blocks unless it asks to. The worker stops at the first "done" event, when
+    the iterator is exhausted, or when ``stop()`` is called; ``pause()`` parks it
+    at the next batch boundary. At most ``max_batches`` batches of ``batch_size``
+    events are buffered, so a paused or slow consumer bounds memory.
+
+    If ``timings`` is given, the worker adds the time it spends filling each batch
+    to its generator figures, with thread_time_ns as the CPU clock (process time
+    would also count the consumer's thread).
+    """
+
+    def __init__(
+        self, events: Iterator[Step], batch_size: int = 256, max_batches: int = 64,
+        timings: Optional[RunTimings] = None,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.error: Optional[BaseException] = None
+        self.timings = timings
+
+        self._events = events
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, max_batches))
+        self._stop = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="sort-event-producer", daemon=True)
+
+        self._batch: List[Step] = []
+        self._batch_pos = 0
+        self._ended = False
+
+    # ----------------------------- Worker -----------------------------
+
+    def start(self) -> "EventProducer":
+        self._thread.start()
+        return self
+
+    def _put(self, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _timed(self, cpu0: int, wall0: int) -> None:
+        timings = self.timings
+        if timings is not None:
+            timings.generator_wall_ns += time.perf_counter_ns() - wall0
+            timings.generator_cpu_ns += time.thread_time_ns() - cpu0
+
+    def _run(self) -> None:
+        batch: List[Step] = []
+        size = self.batch_size
+        try:
+            cpu0, wall0 = time.thread_time_ns(), time.perf_counter_ns()
+            for event in self._events:
+                if isinstance(event, Event) and event[0] == OP_DONE:
+                    break
+                batch.append(event)
+                if len(batch) >= size:
+                    self._timed(cpu0, wall0)
+                    if not self._put(batch):
+                        return
+                    batch = []
+                    while not self._running.wait(0.05):
+                        if self._stop.is_set():
+                            return
+                    cpu0, wall0 = time.thread_time_ns(), time.perf_counter_ns()
+            self._timed(cpu0, wall0)
+            if batch and not self._put(batch):
+                return
+        except BaseException as exc:  # surfaced to the consumer by poll()
+            self.error = exc
+        self._put(_END)
+
+    # ----------------------------- Consumer -----------------------------
+
+    def poll(self, block: bool = False) -> Union[Step, _NotReady, None]:
+        """Next event (or step), NOT_READY if none is queued (non-blocking), None once the run is over.
+
+        Re-raises any exception the generator raised on the worker thread.
+        """
+        while True:
+            if self._batch_pos < len(self._batch):
+                event = self._batch[self._batch_pos]
+                self._batch_pos += 1
+                return event
+            if self._ended:
+                return None
+            try:
+                item = self._queue.get(block=block)
+            except queue.Empty:
+                return NOT_READY
+            if item is _END:
+                self._ended = True
+                if self.error is not None:
+                    raise self.error
+                return None
+            self._batch = item  # type: ignore[assignment]
+            self._batch_pos = 0
+
+    def pause(self) -> None:
+        self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Ask the worker to finish and wait briefly for it (it is a daemon either way)."""
+        self._stop.set()
+        self._running.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
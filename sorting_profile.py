@@ -0,0 +1,81 @@
+"""Per-stage timing for the playback loop: rolling sample windows, rates and CSV export."""
+
+import csv
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+
+class StageProfiler:
+    """Collect ``perf_counter_ns`` durations per named stage.
+
+    Each stage keeps its last ``window`` samples (one sample per animation frame),
+    from which percentiles are read. Frame and event rates are measured over the
+    last second of wall time.
+    """
+
+    STAGES: Tuple[str, ...] = ("advance", "apply", "colors", "redraw", "metrics", "tk")
+
+    def __init__(self, window: int = 600) -> None:
+        self.window = window
+        self.samples: Dict[str, Deque[int]] = {name: deque(maxlen=window) for name in self.STAGES}
+        self._frames: Deque[Tuple[int, int]] = deque()  # (timestamp ns, events in frame)
+        self._events_in_window = 0
+
+    def add(self, stage: str, ns: int) -> None:
+        bucket = self.samples.get(stage)
+        if bucket is None:
+            bucket = self.samples[stage] = deque(maxlen=self.window)
+        bucket.append(ns)
+
+    def frame(self, events: int) -> None:
+        """Mark the end of one animation frame that applied ``events`` events."""
+        now = time.perf_counter_ns()
+        self._frames.append((now, events))
+        self._events_in_window += events
+        cutoff = now - 1_000_000_000
+        while self._frames and self._frames[0][0] < cutoff:
+            self._events_in_window -= self._frames.popleft()[1]
+
+    @property
+    def frames_per_s(self) -> float:
+        return self._rate(len(self._frames) - 1)
+
+    @property
+    def events_per_s(self) -> float:
+        if not self._frames:
+            return 0.0
+        return self._rate(self._events_in_window - self._frames[0][1])
+
+    def _rate(self, count: int) -> float:
+        """count per second over the window (the first frame only marks its start)."""
+        if len(self._frames) < 2:
+            return 0.0
+        span = self._frames[-1][0] - self._frames[0][0]
+        return count * 1e9 / span if span > 0 else 0.0
+
+    def percentile(self, stage: str, q: float) -> float:
+        """q-th percentile (0..100) of a stage's window in ns; 0 when empty."""
+        data = sorted(self.samples.get(stage, ()))
+        if not data:
+            return 0.0
+        k = min(len(data) - 1, max(0, int(round(q / 100 * (len(data) - 1)))))
+        return float(data[k])
+
+    def summary_lines(self) -> List[str]:
+        lines = [f"{self.events_per_s:,.0f} ev/s  {self.frames_per_s:.1f} fps"]
+        for stage in self.samples:
+            if self.samples[stage]:
+                p50 = self.percentile(stage, 50) / 1000
+                p99 = self.percentile(stage, 99) / 1000
+                lines.append(f"{stage:<8} p50 {p50:8.1f} us  p99 {p99:8.1f} us")
+        return lines
+
+    def export_csv(self, path: str) -> None:
+        """Write every sample in the windows as ``stage,sample,duration_ns`` rows."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "sample", "duration_ns"])
+            for stage, bucket in self.samples.items():
+                for k, ns in enumerate(bucket):
+                    writer.writerow([stage, k, ns])
@@ -0,0 +1,156 @@
+"""Race several sorting generators on identical data, each producing events in its own process."""
+
+import multiprocessing
+import queue
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sorting_engine import (
+    OP_COMPARE,
+    OP_DONE,
+    OP_SWAP,
+    OP_WRITE,
+    EventSource,
+    SortEngine,
+)
+
+
+# Simulated cost per opcode for "time" pacing: a swap is two writes, bookkeeping is free.
+OP_COST: Dict[int, int] = {OP_COMPARE: 1, OP_SWAP: 2, OP_WRITE: 1}
+
+PACES = ("events", "time")
+
+
+def _lane_worker(algorithm: EventSource, data: List[int], out: "multiprocessing.Queue", batch_size: int) -> None:
+    """Child process body: run the generator, ship flat int32 (op, a, b) batches, then None."""
+    batch = array("i")
+    try:
+        for op, a, b, _indices in algorithm(data):
+            if op == OP_DONE:
+                break
+            batch.append(op)
+            batch.append(-1 if a is None else a)
+            batch.append(-1 if b is None else b)
+            if len(batch) >= batch_size * 3:
+                out.put(batch)
+                batch = array("i")
+        if batch:
+            out.put(batch)
+        out.put(None)
+    except BaseException as exc:
+        out.put(f"{type(exc).__name__}: {exc}")
+
+
+class RaceLane:
+    """One algorithm in a race: its worker process plus the array its events are applied to."""
+
+    def __init__(self, name: str, algorithm: EventSource, data: List[int], ctx, batch_size: int, max_batches: int) -> None:
+        self.name = name
+        self.engine = SortEngine(lambda _work: iter(()), list(data))
+        self.progress = 0  # events applied ("events" pace) or simulated cost ("time" pace)
+        self.error: Optional[str] = None
+
+        self._queue = ctx.Queue(max_batches)
+        self._process = ctx.Process(
+            target=_lane_worker, args=(algorithm, list(data), self._queue, batch_size), daemon=True
+        )
+        self._buf = array("i")
+        self._pos = 0
+        self._ended = False
+
+    @property
+    def done(self) -> bool:
+        return self._ended and self._pos >= len(self._buf)
+
+    def start(self) -> None:
+        self._process.start()
+
+    def stop(self) -> None:
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join(timeout=1.0)
+        self._queue.close()
+        self._queue.cancel_join_thread()
+
+    def _fill(self, timeout: Optional[float]) -> bool:
+        """Load the next batch; False if none is available (or the worker has ended)."""
+        if self._ended:
+            return False
+        try:
+            item = self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+        except queue.Empty:
+            return False
+        if item is None or isinstance(item, str):
+            self._ended = True
+            self.error = item
+            return False
+        self._buf = item
+        self._pos = 0
+        return True
+
+    def advance(self, target: int, pace: str, timeout: Optional[float] = None) -> List[Tuple[int, int, int]]:
+        """Apply events until progress reaches target or the stream runs dry; returns them."""
+        applied: List[Tuple[int, int, int]] = []
+        apply_op = self.engine.apply_op
+        by_time = pace == "time"
+        while self.progress < target:
+            if self._pos >= len(self._buf) and not self._fill(timeout):
+                break
+            buf, k = self._buf, self._pos
+            op, a, b = buf[k], buf[k + 1], buf[k + 2]
+            self._pos = k + 3
+            apply_op(op, None if a < 0 else a, None if b < 0 else b)
+            self.progress += OP_COST.get(op, 0) if by_time else 1
+            applied.append((op, a, b))
+        if self.done and not self.engine.done:
+            self.engine.finish()
+        return applied
+
+
+class Race:
+    """Run every algorithm on its own copy of ``data`` and advance them in lockstep.
+
+    Lanes advance to a shared target measured in events ("events" pace) or in
+    simulated cost units from OP_COST ("time" pace). The target only moves once
+    every unfinished lane has caught up, so a lane whose process is slow holds the
+    others back instead of falling behind.
+    """
+
+    def __init__(
+        self,
+        algorithms: Sequence[Tuple[str, EventSource]],
+        data: Sequence[int],
+        pace: str = "events",
+        batch_size: int = 512,
+        max_batches: int = 32,
+    ) -> None:
+        if pace not in PACES:
+            raise ValueError(f"unknown pace: {pace}")
+        self.pace = pace
+        self.target = 0
+        # spawn, not fork: the parent may be a Tk process, which must not be forked.
+        ctx = multiprocessing.get_context("spawn")
+        self.lanes = [RaceLane(name, algo, list(data), ctx, batch_size, max_batches) for name, algo in algorithms]
+
+    @property
+    def done(self) -> bool:
+        return all(lane.done for lane in self.lanes)
+
+    def start(self) -> "Race":
+        for lane in self.lanes:
+            lane.start()
+        return self
+
+    def stop(self) -> None:
+        for lane in self.lanes:
+            lane.stop()
+
+    def advance(self, amount: int, timeout: Optional[float] = None) -> List[List[Tuple[int, int, int]]]:
+        """Move the shared target by ``amount`` and apply events; returns each lane's applied ops.
+
+        With a timeout, each lane waits up to that long for its next batch.
+        """
+        live = [lane.progress for lane in self.lanes if not lane.done]
+        if live and min(live) >= self.target:
+            self.target = min(live) + max(1, amount)
+        return [lane.advance(self.target, self.pace, timeout) for lane in self.lanes]
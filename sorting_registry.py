@@ -0,0 +1,254 @@
+"""Algorithm registry: display name -> lazily imported generator factory plus metadata.
+
+Built-in algorithms are listed here. Plugins come from two places, and neither is
+imported until an algorithm from it is first loaded:
+
+* entry points in the ``sorting_visualizer.algorithms`` group, named by display
+  name, with a ``module:function`` value;
+* ``*.py`` files in the plugin directories (``plugins/`` next to this file and
+  any listed in $SORTING_VISUALIZER_PLUGINS). Such a file declares its
+  algorithms in a module-level literal, which is read with ``ast`` instead of
+  being executed::
+
+      ALGORITHMS = [
+          {"name": "Insertion Sort", "function": "insertion_sort_events",
+           "stable": True, "complexity": "O(n²)", "events": ("compare", "swap")},
+      ]
+"""
+
+import ast
+import importlib
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sorting_engine import EVENT_TYPES, EventSource
+
+ENTRY_POINT_GROUP = "sorting_visualizer.algorithms"
+PLUGIN_PATH_ENV = "SORTING_VISUALIZER_PLUGINS"
+DEFAULT_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
+
+
+@dataclass(frozen=True)
+class AlgorithmSpec:
+    name: str                      # display name (selector, race lanes)
+    target: str                    # "module:function" of the event generator
+    key: str = ""                  # short command-line id (sorting_bench)
+    stable: Optional[bool] = None  # None = unknown
+    complexity: str = ""
+    events: Tuple[str, ...] = ()   # event types it emits besides "done"
+    counter: Optional[str] = None  # "module:function" of its counting fast path
+    path: Optional[str] = field(default=None, compare=False)  # plugin directory to import from
+
+    def describe(self) -> str:
+        parts = []
+        if self.stable is not None:
+            parts.append("stable" if self.stable else "unstable")
+        if self.complexity:
+            parts.append(self.complexity)
+        return ", ".join(parts)
+
+
+def _import_target(target: str, path: Optional[str] = None) -> Callable:
+    module_name, _, attr = target.partition(":")
+    if not attr:
+        raise ValueError(f"target must look like 'module:function', got {target!r}")
+    if path is not None and path not in sys.path:
+        # On sys.path (rather than loaded from a file spec) so spawned race processes,
+        # which inherit sys.path, can unpickle the function too.
+        sys.path.append(path)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class AlgorithmRegistry:
+    """Ordered collection of AlgorithmSpec; generators are imported on first load()."""
+
+    def __init__(self, specs: Iterable[AlgorithmSpec] = ()) -> None:
+        self._specs: Dict[str, AlgorithmSpec] = {}
+        self._keys: Dict[str, str] = {}
+        self._loaded: Dict[str, EventSource] = {}
+        # Plugins that discovery skipped, as "<where>: <why>" lines for the caller to report.
+        self.errors: List[str] = []
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: AlgorithmSpec) -> None:
+        """Add (or replace) an algorithm. Unknown event type names are rejected."""
+        unknown = [e for e in spec.events if e not in EVENT_TYPES]
+        if unknown:
+            raise ValueError(f"{spec.name}: unknown event types {unknown}")
+        self._specs[spec.name] = spec
+        self._loaded.pop(spec.name, None)
+        if spec.key:
+            self._keys[spec.key] = spec.name
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs or name in self._keys
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def get(self, name: str) -> AlgorithmSpec:
+        """Spec by display name or short key; KeyError if neither matches."""
+        if name in self._specs:
+            return self._specs[name]
+        return self._specs[self._keys[name]]
+
+    def load(self, name: str) -> EventSource:
+        """Import (once) and return the event generator for ``name``."""
+        spec = self.get(name)
+        source = self._loaded.get(spec.name)
+        if source is None:
+            source = self._loaded[spec.name] = _import_target(spec.target, spec.path)
+        return source
+
+    def counter(self, name: str) -> Optional[Callable]:
+        """The algorithm's counting fast path (see sorting_counts), or None."""
+        spec = self.get(name)
+        if spec.counter is None:
+            return None
+        return _import_target(spec.counter, spec.path)
+
+    # ----------------------------- Discovery -----------------------------
+
+    def discover_entry_points(self, group: str = ENTRY_POINT_GROUP) -> int:
+        """Register every entry point in ``group`` (metadata unknown); returns how many."""
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return 0
+        try:
+            found = entry_points(group=group)
+        except TypeError:  # Python < 3.10
+            found = entry_points().get(group, [])
+        count = 0
+        for ep in found:
+            try:
+                self._register_discovered(AlgorithmSpec(name=ep.name, target=ep.value))
+            except ValueError as exc:
+                self.errors.append(f"entry point {ep.name}: {exc}")
+                continue
+            count += 1
+        return count
+
+    def discover_directory(self, path: str) -> int:
+        """Register the ALGORITHMS declared by each ``*.py`` in ``path``; returns how many.
+
+        A malformed file or entry, or one whose name or key is already taken, is
+        skipped and recorded in ``errors``; the rest still load.
+        """
+        if not os.path.isdir(path):
+            return 0
+        count = 0
+        for filename in sorted(os.listdir(path)):
+            if not filename.endswith(".py") or filename.startswith("_"):
+                continue
+            module_name = filename[:-3]
+            filepath = os.path.join(path, filename)
+            try:
+                entries = _declared_algorithms(filepath)
+            except ValueError as exc:
+                self.errors.append(f"{filepath}: {exc}")
+                continue
+            for k, entry in enumerate(entries):
+                try:
+                    if not isinstance(entry, dict) or "name" not in entry or "function" not in entry:
+                        raise ValueError(f"ALGORITHMS[{k}] needs a 'name' and a 'function'")
+                    events = entry.get("events", ())
+                    if not isinstance(events, (list, tuple)):
+                        raise ValueError(f"{entry['name']}: events must be a list of event type names")
+                    self._register_discovered(AlgorithmSpec(
+                        name=str(entry["name"]),
+                        target=f"{module_name}:{entry['function']}",
+                        key=str(entry.get("key", "")),
+                        stable=entry.get("stable"),
+                        complexity=str(entry.get("complexity", "")),
+                        events=tuple(events),
+                        counter=f"{module_name}:{entry['counter']}" if entry.get("counter") else None,
+                        path=os.path.abspath(path),
+                    ))
+                except ValueError as exc:
+                    self.errors.append(f"{filepath}: {exc}")
+                    continue
+                count += 1
+        return count
+
+    def _register_discovered(self, spec: AlgorithmSpec) -> None:
+        """register() for plugins, which may not replace an algorithm (or key) already present."""
+        if spec.name in self._specs:
+            raise ValueError(f"{spec.name}: name already registered by {self._specs[spec.name].target}")
+        if spec.key and spec.key in self._keys:
+            raise ValueError(f"{spec.name}: key {spec.key!r} already used by {self._keys[spec.key]}")
+        self.register(spec)
+
+
+def _declared_algorithms(filename: str) -> List[object]:
+    """Read a plugin's ``ALGORITHMS = [...]`` literal without importing the module.
+
+    Files without ALGORITHMS declare nothing; an unreadable file or a value that is
+    not a literal list raises ValueError. The entries themselves are not checked.
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename)
+    except (OSError, SyntaxError, ValueError) as exc:
+        raise ValueError(f"cannot read plugin: {exc}") from exc
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "ALGORITHMS" for t in node.targets):
+            try:
+                value = ast.literal_eval(node.value)
+            except (TypeError, ValueError) as exc:
+                raise ValueError("ALGORITHMS must be a literal list") from exc
+            if not isinstance(value, (list, tuple)):
+                raise ValueError(f"ALGORITHMS must be a list, not {type(value).__name__}")
+            return list(value)
+    return []
+
+
+BUILTIN_ALGORITHMS: Sequence[AlgorithmSpec] = (
+    AlgorithmSpec("Bubble Sort", "sorting_engine:bubble_sort_events", "bubble", True, "O(n²)",
+                  ("compare", "swap", "mark_sorted"), "sorting_counts:bubble_sort_count"),
+    AlgorithmSpec("Selection Sort", "sorting_engine:selection_sort_events", "selection", False, "O(n²)",
+                  ("select_min", "compare", "swap", "mark_sorted"), "sorting_counts:selection_sort_count"),
+    AlgorithmSpec("Merge Sort (Top-Down)", "sorting_engine:merge_sort_events", "merge", True, "O(n log n)",
+                  ("compare", "write", "mark_sorted"), "sorting_counts:merge_sort_count"),
+    AlgorithmSpec("Quick Sort (Lomuto)", "sorting_engine:quick_sort_lomuto_events", "quick", False,
+                  "O(n log n) avg, O(n²) worst", ("pivot", "compare", "swap", "mark_sorted"),
+                  "sorting_counts:quick_sort_lomuto_count"),
+    AlgorithmSpec("Heap Sort", "sorting_engine:heap_sort_events", "heap", False, "O(n log n)",
+                  ("compare", "swap", "mark_sorted"), "sorting_counts:heap_sort_count"),
+    AlgorithmSpec("Introsort", "sorting_engine:intro_sort_events", "intro", False, "O(n log n)",
+                  ("pivot", "compare", "swap", "mark_sorted"), "sorting_counts:intro_sort_count"),
+    AlgorithmSpec("Merge Sort (Bottom-Up)", "sorting_engine:merge_sort_bottom_up_events", "merge-bu", True,
+                  "O(n log n)", ("compare", "write", "mark_sorted"), "sorting_counts:merge_sort_bottom_up_count"),
+    AlgorithmSpec("Radix Sort (LSD)", "sorting_engine:radix_sort_lsd_events", "radix", True, "O(d·(n + b))",
+                  ("write", "mark_sorted"), "sorting_counts:radix_sort_lsd_count"),
+    AlgorithmSpec("Counting Sort", "sorting_engine:counting_sort_events", "counting", True, "O(n + k)",
+                  ("write", "mark_sorted"), "sorting_counts:counting_sort_count"),
+    AlgorithmSpec("Timsort", "sorting_engine:tim_sort_events", "tim", True, "O(n log n)",
+                  ("compare", "swap", "write", "mark_sorted"), "sorting_counts:tim_sort_count"),
+)
+
+
+_default: Optional[AlgorithmRegistry] = None
+
+
+def plugin_dirs() -> List[str]:
+    extra = [p for p in os.environ.get(PLUGIN_PATH_ENV, "").split(os.pathsep) if p]
+    return [DEFAULT_PLUGIN_DIR] + extra
+
+
+def default_registry() -> AlgorithmRegistry:
+    """Built-ins plus discovered plugins; discovery runs once per process."""
+    global _default
+    if _default is None:
+        registry = AlgorithmRegistry(BUILTIN_ALGORITHMS)
+        for path in plugin_dirs():
+            registry.discover_directory(path)
+        registry.discover_entry_points()
+        _default = registry
+    return _default
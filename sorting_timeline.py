@@ -0,0 +1,207 @@
+"""Seekable playback over a recorded trace, backed by periodic array checkpoints."""
+
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from sorting_engine import (
+    OP_ARITY,
+    OP_COMPARE,
+    OP_DONE,
+    OP_MARK_SORTED,
+    OP_PIVOT,
+    OP_SWAP,
+    OP_WRITE,
+    SortEngine,
+)
+from sorting_trace import EventTrace
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    position: int  # events applied before this snapshot
+    arg_pos: int   # matching offset into the trace's operand column
+    data: array
+    sorted_indices: array
+    pivot_index: Optional[int]
+    comparisons: int
+    swaps: int
+    writes: int
+
+
+class Timeline:
+    """Random access over an EventTrace: seek to any event, step forward or back.
+
+    A full snapshot of the array is kept every ``checkpoint_every`` events, so a
+    seek replays at most that many events. Each event also gets one "undo" slot
+    (the overwritten value of a write, the previous pivot, whether a mark_sorted
+    added a new index), which makes every event invertible for backward steps.
+    When ``checkpoint_every`` is None it defaults to max(1024, n), which keeps the
+    snapshots about as large as the trace itself.
+    """
+
+    def __init__(
+        self,
+        trace: EventTrace,
+        data: Optional[List[int]] = None,
+        checkpoint_every: Optional[int] = None,
+    ) -> None:
+        self.trace = trace
+        self.checkpoint_every = max(1, checkpoint_every or max(1024, len(trace.initial)))
+        if data is None:
+            data = list(trace.initial)
+        else:
+            data[:] = trace.initial
+        self.engine = SortEngine(lambda _work: iter(()), data)
+
+        self.position = 0
+        self._arg_pos = 0
+        self._undo = array("i")
+        self._checkpoints: List[Checkpoint] = []
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def length(self) -> int:
+        return len(self._undo)
+
+    # ----------------------------- Building -----------------------------
+
+    def _snapshot(self) -> Checkpoint:
+        e = self.engine
+        return Checkpoint(
+            position=self.position,
+            arg_pos=self._arg_pos,
+            data=array("i", e.data),
+            sorted_indices=array("i", sorted(e.sorted_indices)),
+            pivot_index=e.pivot_index,
+            comparisons=e.comparisons,
+            swaps=e.swaps,
+            writes=e.writes,
+        )
+
+    def _build(self) -> None:
+        """One forward pass: record undo slots and checkpoints, then rewind."""
+        e = self.engine
+        data = e.data
+        ops = self.trace.ops
+        undo = self._undo
+        every = self.checkpoint_every
+
+        for op in ops:
+            if op == OP_DONE:
+                break
+            if self.position % every == 0:
+                self._checkpoints.append(self._snapshot())
+            a, b = self._operands(op)
+            if op == OP_WRITE:
+                slot = data[a] if 0 <= a < len(data) else 0
+            elif op == OP_PIVOT:
+                slot = -1 if e.pivot_index is None else e.pivot_index
+            elif op == OP_MARK_SORTED:
+                slot = 0 if a in e.sorted_indices else 1
+            else:
+                slot = 0
+            undo.append(slot)
+            e.apply_op(op, a, b)
+            self.position += 1
+
+        if not self._checkpoints:
+            self._checkpoints.append(self._snapshot())
+        self._restore(self._checkpoints[0])
+
+    def _operands(self, op: int) -> Tuple[int, int]:
+        """Read the operands of the event at _arg_pos and advance past them."""
+        args = self.trace.args
+        k = self._arg_pos
+        arity = OP_ARITY[op]
+        self._arg_pos = k + arity
+        if arity == 2:
+            return args[k], args[k + 1]
+        if arity == 1:
+            return args[k], 0
+        return 0, 0
+
+    def _restore(self, cp: Checkpoint) -> None:
+        e = self.engine
+        e.data[:] = cp.data
+        e.sorted_indices = set(cp.sorted_indices)
+        e.pivot_index = cp.pivot_index
+        e.comparisons = cp.comparisons
+        e.swaps = cp.swaps
+        e.writes = cp.writes
+        e.events = cp.position
+        e.done = False
+        self.position = cp.position
+        self._arg_pos = cp.arg_pos
+
+    # ----------------------------- Navigation -----------------------------
+
+    def step_forward(self) -> Optional[Tuple[int, int, int]]:
+        """Apply the next event; returns (opcode, a, b), or None at the end."""
+        if self.engine.done:
+            self.seek(self.position)
+        if self.position >= len(self._undo):
+            return None
+        op = self.trace.ops[self.position]
+        a, b = self._operands(op)
+        self.position += 1
+        self.engine.apply_op(op, a, b)
+        return op, a, b
+
+    def step_back(self) -> Optional[Tuple[int, int, int]]:
+        """Undo the previous event; returns its (opcode, a, b), or None at the start."""
+        if self.engine.done:
+            self.seek(self.position)
+        if self.position == 0:
+            return None
+
+        self.position -= 1
+        op = self.trace.ops[self.position]
+        self._arg_pos -= OP_ARITY[op]
+        a, b = self._operands(op)
+        self._arg_pos -= OP_ARITY[op]
+        slot = self._undo[self.position]
+
+        e = self.engine
+        data = e.data
+        e.events -= 1
+        if op == OP_COMPARE:
+            e.comparisons -= 1
+        elif op == OP_SWAP:
+            if 0 <= a < len(data) and 0 <= b < len(data):
+                data[a], data[b] = data[b], data[a]
+            e.swaps -= 1
+        elif op == OP_PIVOT:
+            e.pivot_index = None if slot < 0 else slot
+        elif op == OP_WRITE:
+            if 0 <= a < len(data):
+                data[a] = slot
+            e.writes -= 1
+        elif op == OP_MARK_SORTED:
+            if slot:
+                e.sorted_indices.discard(a)
+        return op, a, b
+
+    def seek(self, target: int) -> None:
+        """Move to ``target`` events applied, replaying at most checkpoint_every events."""
+        target = max(0, min(len(self._undo), target))
+        # The end of a trace that is a multiple of checkpoint_every long has no checkpoint of its own.
+        cp = self._checkpoints[min(target // self.checkpoint_every, len(self._checkpoints) - 1)]
+        from_cp = target - cp.position
+
+        if self.engine.done:
+            self._restore(cp)
+        elif self.position <= target and target - self.position <= from_cp:
+            pass
+        elif self.position > target and self.position - target <= from_cp:
+            while self.position > target:
+                self.step_back()
+            return
+        else:
+            self._restore(cp)
+
+        while self.position < target:
+            self.step_forward()
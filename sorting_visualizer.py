@@ -1,187 +1,86 @@
-import re
 import random
+import re
+import secrets
 import time
 from dataclasses import dataclass
-from typing import Generator, Optional, Tuple, List, Dict, Set
+from typing import Optional, Tuple, List, Dict, Set, Iterable, Iterator
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-
-
-# ----------------------------- Event Model -----------------------------
+from tkinter import ttk, messagebox, filedialog
+
+from sorting_cache import TraceCache, TraceRecorder
+from sorting_datasets import DISTRIBUTIONS, PRESETS, bar_rects, column_extents, make_dataset, preset
+from sorting_engine import (
+    OP_COMPARE,
+    OP_MARK_SORTED,
+    OP_PIVOT,
+    OP_SELECT_MIN,
+    OP_SWAP,
+    OP_WRITE,
+    Event,
+    EventSource,
+    RunTimings,
+    SortEngine,
+    coalesce_events,
+    next_batch,
+)
+# Kept for backwards-compatible imports from this module; the app itself does not use them.
+from sorting_engine import (  # noqa: F401
+    ev_compare,
+    ev_swap,
+    ev_pivot,
+    ev_select_min,
+    ev_write,
+    ev_mark_sorted,
+    ev_done,
+    bubble_sort_events,
+    selection_sort_events,
+    merge_sort_events,
+    quick_sort_lomuto_events,
+)
+from sorting_import import DatasetParseError, load_dataset_file, parse_int_text
+from sorting_producer import NOT_READY, EventProducer
+from sorting_profile import StageProfiler
+from sorting_race import PACES, Race
+from sorting_registry import default_registry
+from sorting_timeline import Timeline
+from sorting_trace import EventTrace
+
+
+# ----------------------------- Layout -----------------------------
 
 @dataclass(frozen=True)
-class Event:
-    type: str
-    i: Optional[int] = None
-    j: Optional[int] = None
-    value: Optional[int] = None
-    indices: Optional[Tuple[int, ...]] = None
-
-
-def ev_compare(i: int, j: int) -> Event:
-    return Event(type="compare", i=i, j=j)
-
-
-def ev_swap(i: int, j: int) -> Event:
-    return Event(type="swap", i=i, j=j)
-
-
-def ev_pivot(p: int) -> Event:
-    return Event(type="pivot", i=p)
-
-
-def ev_select_min(i: int) -> Event:
-    return Event(type="select_min", i=i)
-
-
-def ev_write(i: int, value: int) -> Event:
-    return Event(type="write", i=i, value=value)
-
-
-def ev_mark_sorted(i: int) -> Event:
-    return Event(type="mark_sorted", i=i)
-
-
-def ev_done() -> Event:
-    return Event(type="done")
-
-
-# ----------------------------- Sorting Generators -----------------------------
-
-def bubble_sort_events(a: List[int]) -> Generator[Event, None, None]:
-    n = len(a)
-    if n <= 1:
-        if n == 1:
-            yield ev_mark_sorted(0)
-        yield ev_done()
-        return
-
-    for end in range(n - 1, -1, -1):
-        for j in range(0, end):
-            yield ev_compare(j, j + 1)
-            if a[j] > a[j + 1]:
-                a[j], a[j + 1] = a[j + 1], a[j]
-                yield ev_swap(j, j + 1)
-        yield ev_mark_sorted(end)
-    yield ev_done()
-
-
-def selection_sort_events(a: List[int]) -> Generator[Event, None, None]:
-    n = len(a)
-    if n <= 1:
-        if n == 1:
-            yield ev_mark_sorted(0)
-        yield ev_done()
-        return
-
-    for i in range(n):
-        min_idx = i
-        yield ev_select_min(min_idx)
-        for j in range(i + 1, n):
-            yield ev_compare(min_idx, j)
-            if a[j] < a[min_idx]:
-                min_idx = j
-                yield ev_select_min(min_idx)
-        if min_idx != i:
-            a[i], a[min_idx] = a[min_idx], a[i]
-            yield ev_swap(i, min_idx)
-        yield ev_mark_sorted(i)
-    yield ev_done()
-
-
-def merge_sort_events(a: List[int]) -> Generator[Event, None, None]:
-    n = len(a)
-
-    def sort(lo: int, hi: int) -> Generator[Event, None, None]:
-        if hi - lo <= 1:
-            return
-        mid = (lo + hi) // 2
-        yield from sort(lo, mid)
-        yield from sort(mid, hi)
-
-        left = a[lo:mid]
-        right = a[mid:hi]
-        i = 0
-        j = 0
-        k = lo
-
-        while i < len(left) and j < len(right):
-            yield ev_compare(lo + i, mid + j)
-            if left[i] <= right[j]:
-                val = left[i]
-                i += 1
-            else:
-                val = right[j]
-                j += 1
-            a[k] = val
-            yield ev_write(k, val)
-            k += 1
-
-        while i < len(left):
-            val = left[i]
-            i += 1
-            a[k] = val
-            yield ev_write(k, val)
-            k += 1
-
-        while j < len(right):
-            val = right[j]
-            j += 1
-            a[k] = val
-            yield ev_write(k, val)
-            k += 1
-
-    if n <= 1:
-        if n == 1:
-            yield ev_mark_sorted(0)
-        yield ev_done()
-        return
-
-    yield from sort(0, n)
-    for idx in range(n):
-        yield ev_mark_sorted(idx)
-    yield ev_done()
-
-
-def quick_sort_lomuto_events(a: List[int]) -> Generator[Event, None, None]:
-    n = len(a)
-
-    def qs(lo: int, hi: int) -> Generator[Event, None, None]:
-        if hi - lo <= 1:
-            if hi - lo == 1:
-                yield ev_mark_sorted(lo)
-            return
-
-        pivot_idx = hi - 1
-        pivot_val = a[pivot_idx]
-        yield ev_pivot(pivot_idx)
-
-        i = lo
-        for j in range(lo, hi - 1):
-            yield ev_compare(j, pivot_idx)
-            if a[j] <= pivot_val:
-                if i != j:
-                    a[i], a[j] = a[j], a[i]
-                    yield ev_swap(i, j)
-                i += 1
-
-        if i != pivot_idx:
-            a[i], a[pivot_idx] = a[pivot_idx], a[i]
-            yield ev_swap(i, pivot_idx)
-
-        yield ev_mark_sorted(i)
-        yield from qs(lo, i)
-        yield from qs(i + 1, hi)
-
-    if n <= 1:
-        if n == 1:
-            yield ev_mark_sorted(0)
-        yield ev_done()
-        return
-
-    yield from qs(0, n)
-    yield ev_done()
+class SceneLayout:
+    """Bar-chart geometry for one canvas size and dataset length (independent of values)."""
+    w: int
+    h: int
+    n: int
+    left_pad: int
+    top_pad: int
+    usable_w: int
+    usable_h: int
+    bar_w: float
+    font_size: int
+    outline: str
+
+    @classmethod
+    def compute(cls, w: int, h: int, n: int) -> "SceneLayout":
+        top_pad = 20
+        bottom_pad = 60
+        left_pad = 20
+        right_pad = 20
+        usable_w = max(1, w - left_pad - right_pad)
+        usable_h = max(1, h - top_pad - bottom_pad)
+        return cls(
+            w=w, h=h, n=n,
+            left_pad=left_pad,
+            top_pad=top_pad,
+            usable_w=usable_w,
+            usable_h=usable_h,
+            bar_w=usable_w / max(1, n),
+            font_size=8 if n > 60 else 9 if n > 40 else 10,
+            outline="#111827" if n <= 60 else "",
+        )
 
 
 # ----------------------------- Tkinter App -----------------------------
@@ -205,51 +104,176 @@ class SortingVisualizerApp(tk.Tk):
             "finished": "#111827",    # near-black
         }
 
+        # Frame-batched playback: one redraw per frame, events drained until either
+        # the events-per-frame count or the per-frame time budget is used up.
+        self.FRAME_MS = 16
+        self.FRAME_BUDGET_S = 0.010
+
+        # Coalescing: at most this many consecutive compare/select_min events share a step.
+        self.COALESCE_MAX_RUN = 256
+
+        # Dataset limits and the large-dataset rendering path: above RASTER_MIN_N bars
+        # the canvas shows one PhotoImage with elements binned per pixel column, and
+        # value labels are only drawn when a bar is at least LABEL_MIN_PX wide.
+        self.MAX_DATA_SIZE = 1_000_000
+        self.RASTER_MIN_N = 1000
+        self.LABEL_MIN_PX = 6
+
+        # After Count Only, "Play Sample" animates this many elements of the dataset
+        # (drawn at random, in their original order) with the same algorithm.
+        self.SAMPLE_SIZE = 300
+
+        # Canvas <Configure> events are coalesced: the size is only taken over (and the
+        # scene rebuilt) once no further resize has arrived for RESIZE_SETTLE_MS.
+        self.RESIZE_SETTLE_MS = 60
+
+        # While running, the metrics labels and timeline position are refreshed by their
+        # own timer every METRICS_REFRESH_MS rather than on every tick; Pause, Step and
+        # the end of a sort flush the exact values.
+        self.METRICS_REFRESH_MS = 100
+
+        # Algorithms offered in the selector (built-ins plus plugins, imported on first
+        # use; see sorting_registry); race mode runs all of them.
+        self._registry = default_registry()
+        self.ALGORITHMS = self._registry.names()
+
+        # Highlight color per opcode in race lanes (mark_sorted only changes the base color)
+        self.OP_HIGHLIGHTS = {
+            OP_COMPARE: self.COLORS["comparing"],
+            OP_SWAP: self.COLORS["swapping"],
+            OP_PIVOT: self.COLORS["pivot"],
+            OP_SELECT_MIN: self.COLORS["selected_min"],
+            OP_WRITE: self.COLORS["writing"],
+        }
+
         # State machine
         self.state = "Idle"  # Idle / Running / Paused / Finished
         self._after_id: Optional[str] = None
+        self._metrics_after_id: Optional[str] = None
 
         # Dataset & flags
         self.data: List[int] = []
         self.original_data: List[int] = []       # snapshot for Reset restore (last loaded)
         self.dataset_loaded: bool = False
-        self.dataset_source: Optional[str] = None  # "manual" / "random" / None
+        self.dataset_source: Optional[str] = None  # "manual" / "random" / "file" / "trace" / "sample" / None
+        self._counted_only: bool = False  # the finished run was Count Only (Play Sample offered)
         self.manual_locked_until_reset: bool = False  # if manual dataset loaded, Random must refuse until Reset
 
-        # Sorting engine
-        self._gen: Optional[Generator[Event, None, None]] = None
-        self._algo_local: List[int] = []  # local copy used by generators (kept in sync by events)
-        self.sorted_indices: Set[int] = set()
-        self._pivot_index: Optional[int] = None
+        # Sorting engine (owns the generator, counters, sorted set and pivot; see sorting_engine)
+        self._engine: Optional[SortEngine] = None
+        self._trace: Optional[EventTrace] = None  # loaded trace file replayed instead of var_algo
+        self._timeline: Optional[Timeline] = None  # seekable playback (Timeline checkbox)
+        self._producer: Optional[EventProducer] = None  # worker thread running the generator
+        self._steps: Optional[Iterator[List[Event]]] = None  # coalesced steps (Coalesce checkbox)
+        self._race: Optional[Race] = None  # race mode: every algorithm in its own process
+
+        # Recorded traces keyed by (algorithm, dataset); a hit replays without the generator.
+        self._trace_cache = TraceCache()
+        self._cached_trace: Optional[EventTrace] = None  # open cache hit being replayed
+        self._cache_key: Optional[str] = None  # miss to store once the run completes
+        self._recorder: Optional[TraceRecorder] = None
+
+        # Optional per-stage instrumentation of _tick (Profile checkbox)
+        self._profiler: Optional[StageProfiler] = None
+        self._tick_due_ns = 0
+        self._overlay_item: Optional[int] = None
+        self._overlay_updated_ns = 0
 
         # Metrics
-        self.comparisons = 0
-        self.swaps_or_writes = 0
         self._start_perf: Optional[float] = None
         self._elapsed_before_pause: float = 0.0
+        self._timings = RunTimings()  # generator / apply / render / idle split of the run
+        self._idle_from_ns: Optional[int] = None  # when the pending tick was scheduled
+        self._shown_metrics: Tuple[str, ...] = ()  # label texts last pushed
+
+        # Retained canvas scene: bar/label items are created once per dataset and
+        # canvas size, then updated in place on each tick.
+        self._scene_key: Optional[Tuple[int, int, int, int]] = None
+        self._scene_geom: Tuple[float, float, float, float, int] = (0.0, 0.0, 1.0, 1.0, 1)
+        self._canvas_size: Optional[Tuple[int, int]] = None  # settled size; None until first read
+        self._pending_size: Optional[Tuple[int, int]] = None
+        self._resize_after_id: Optional[str] = None
+        self._layout: Optional[SceneLayout] = None
+        self._bar_items: List[int] = []
+        self._label_items: List[int] = []
+        self._drawn_values: List[int] = []
+        self._drawn_colors: List[str] = []
+        self._raster: Optional[tk.PhotoImage] = None  # large-dataset mode only
+        self._raster_cols = 0
+        self._drawn_columns: List[Optional[Tuple[int, int, str]]] = []
+        self._tints: Dict[str, str] = {}
+        self._last_highlights: Set[int] = set()
+        self._dirty_indices: Set[int] = set()  # base color changed without a highlight (mark_sorted, pivot moves)
+
+        # Race scene: one raster lane per algorithm, stacked top to bottom
+        self._race_key: Optional[Tuple[int, int, int]] = None
+        self._race_max_val = 1
+        self._race_cols = 0
+        self._race_images: List[tk.PhotoImage] = []
+        self._race_labels: List[int] = []
+        self._race_columns: List[List[Optional[Tuple[int, int, str]]]] = []
+        self._race_hl_cols: List[Set[int]] = []
+        self._race_done: List[bool] = []
+
+        # Persistent base color per index (CODE_* below), kept up to date per event so a
+        # tick only looks at the indices it touched. Highlights are layered on top.
+        self.CODE_DEFAULT, self.CODE_SORTED, self.CODE_PIVOT, self.CODE_FINISHED = range(4)
+        self._code_colors: Tuple[str, ...] = (
+            self.COLORS["default"], self.COLORS["sorted"], self.COLORS["pivot"], self.COLORS["finished"]
+        )
+        self._color_codes = bytearray()
+        self._coded_pivot: Optional[int] = None
 
         # UI variables
         self.var_algo = tk.StringVar(value="Bubble Sort")
         self.var_speed = tk.IntVar(value=25)  # ms
-        self.var_size = tk.IntVar(value=30)   # 1..100
+        self.var_batched = tk.BooleanVar(value=False)  # drain many events per ~60 fps frame
+        self.var_events_per_frame = tk.StringVar(value="500")
+        self.var_threaded = tk.BooleanVar(value=False)  # run the generator on a worker thread
+        self.var_coalesce = tk.BooleanVar(value=False)  # group compare runs / mark_sorted bursts
+        self.var_race = tk.BooleanVar(value=False)  # run every algorithm side by side
+        self.var_race_pace = tk.StringVar(value=PACES[0])
+        self.var_timeline = tk.BooleanVar(value=False)
+        self.var_checkpoint = tk.StringVar(value="auto")  # events between array snapshots
+        self.var_position = tk.DoubleVar(value=0)
+        self.var_position_text = tk.StringVar(value="")
+        self.var_profile = tk.BooleanVar(value=False)
+        self.var_size = tk.StringVar(value="30")   # 1..MAX_DATA_SIZE
 
         self.var_input = tk.StringVar(value="")
         self.var_min = tk.StringVar(value="0")
         self.var_max = tk.StringVar(value="100")
+        self.var_distribution = tk.StringVar(value=DISTRIBUTIONS[0])
+        self.var_seed = tk.StringVar(value="")  # empty = a fresh seed per press, shown below
+        self.var_seed_used = tk.StringVar(value="")
+        self.var_preset = tk.StringVar(value="")
+        self.var_cache = tk.BooleanVar(value=True)  # replay/record through the trace cache
 
         self.var_status = tk.StringVar(value="Idle")
         self.var_algo_name = tk.StringVar(value=self.var_algo.get())
+        self.var_algo_info = tk.StringVar(value="")  # stability/complexity from the registry
         self.var_comparisons = tk.StringVar(value="0")
         self.var_swaps = tk.StringVar(value="0")
         self.var_elapsed = tk.StringVar(value="0.000 s")
+        self.var_time_generator = tk.StringVar(value="0.000 s CPU (0.000 s wall)")
+        self.var_time_apply = tk.StringVar(value="0.000 s")
+        self.var_time_render = tk.StringVar(value="0.000 s")
+        self.var_time_idle = tk.StringVar(value="0.000 s")
+        self._metric_vars = (
+            self.var_comparisons, self.var_swaps, self.var_elapsed,
+            self.var_time_generator, self.var_time_apply, self.var_time_render, self.var_time_idle,
+        )
         self.var_message = tk.StringVar(value="")
 
         # Build UI
         self._build_ui()
         self._redraw()
+        if self._registry.errors:
+            skipped = len(self._registry.errors)
+            self._set_message(f"Skipped {skipped} plugin entr{'y' if skipped == 1 else 'ies'}: {self._registry.errors[0]}")
 
         # Bindings
-        self.canvas.bind("<Configure>", lambda _e: self._redraw())
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
         self.entry_input.bind("<KeyRelease>", self._on_input_edited)
 
     # ----------------------------- UI Construction -----------------------------
@@ -267,6 +291,35 @@ class SortingVisualizerApp(tk.Tk):
         self.canvas = tk.Canvas(main, bg="white", highlightthickness=1, highlightbackground="#D1D5DB")
         self.canvas.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
 
+        # Timeline (seek/scrub bar under the canvas)
+        timeline = ttk.Frame(main)
+        timeline.grid(row=1, column=0, sticky="ew", padx=(0, 10), pady=(6, 0))
+        timeline.columnconfigure(4, weight=1)
+
+        self.check_timeline = ttk.Checkbutton(timeline, text="Timeline", variable=self.var_timeline)
+        self.check_timeline.grid(row=0, column=0, sticky="w")
+        ttk.Label(timeline, text="Checkpoint every").grid(row=0, column=1, sticky="e", padx=(8, 4))
+        self.entry_checkpoint = ttk.Entry(timeline, textvariable=self.var_checkpoint, width=8)
+        self.entry_checkpoint.grid(row=0, column=2, sticky="w")
+        self.btn_back = ttk.Button(timeline, text="Back", width=6, command=self.on_step_back)
+        self.btn_back.grid(row=0, column=3, sticky="w", padx=(8, 8))
+        self.scale_timeline = ttk.Scale(
+            timeline, from_=0, to=1, orient="horizontal",
+            variable=self.var_position, command=self._on_timeline_scrub
+        )
+        self.scale_timeline.grid(row=0, column=4, sticky="ew")
+        ttk.Label(timeline, textvariable=self.var_position_text, width=24, anchor="e").grid(row=0, column=5, sticky="e")
+
+        # Profiling
+        profile = ttk.Frame(main)
+        profile.grid(row=2, column=0, sticky="ew", padx=(0, 10), pady=(6, 0))
+        ttk.Checkbutton(
+            profile, text="Profile overlay", variable=self.var_profile, command=self._on_profile_toggled
+        ).grid(row=0, column=0, sticky="w")
+        ttk.Button(profile, text="Export Profile CSV", command=self.on_export_profile).grid(
+            row=0, column=1, sticky="w", padx=(8, 0)
+        )
+
         # Right side controls
         side = ttk.Frame(main)
         side.grid(row=0, column=1, sticky="ns")
@@ -274,14 +327,17 @@ class SortingVisualizerApp(tk.Tk):
 
         # Algorithm selector
         ttk.Label(side, text="Algorithm").grid(row=0, column=0, sticky="w")
+        ttk.Label(side, textvariable=self.var_algo_info, foreground="#6B7280").grid(row=0, column=0, sticky="e")
         self.combo_algo = ttk.Combobox(
             side,
             textvariable=self.var_algo,
-            values=["Bubble Sort", "Selection Sort", "Merge Sort (Top-Down)", "Quick Sort (Lomuto)"],
+            values=self.ALGORITHMS,
             state="readonly",
             width=28,
         )
         self.combo_algo.grid(row=1, column=0, sticky="ew", pady=(0, 10))
+        self.combo_algo.bind("<<ComboboxSelected>>", self._on_algorithm_selected)
+        self._on_algorithm_selected()
 
         # Speed slider
         ttk.Label(side, text="Speed (delay ms)").grid(row=2, column=0, sticky="w")
@@ -291,22 +347,46 @@ class SortingVisualizerApp(tk.Tk):
         )
         self.scale_speed.grid(row=3, column=0, sticky="ew", pady=(0, 10))
 
+        # Frame batching
+        batch = ttk.Frame(side)
+        batch.grid(row=4, column=0, sticky="ew", pady=(0, 10))
+        batch.columnconfigure(2, weight=1)
+        self.check_batched = ttk.Checkbutton(batch, text="Frame-batched", variable=self.var_batched)
+        self.check_batched.grid(row=0, column=0, sticky="w")
+        ttk.Label(batch, text="Events/frame").grid(row=0, column=1, sticky="e", padx=(8, 4))
+        self.spin_batch = ttk.Spinbox(batch, from_=1, to=1_000_000, increment=50, width=8, textvariable=self.var_events_per_frame)
+        self.spin_batch.grid(row=0, column=2, sticky="ew")
+        self.check_threaded = ttk.Checkbutton(batch, text="Background producer thread", variable=self.var_threaded)
+        self.check_threaded.grid(row=1, column=0, columnspan=3, sticky="w")
+        self.check_coalesce = ttk.Checkbutton(batch, text="Coalesce compares", variable=self.var_coalesce)
+        self.check_coalesce.grid(row=2, column=0, columnspan=3, sticky="w")
+        self.check_race = ttk.Checkbutton(batch, text="Race all algorithms", variable=self.var_race)
+        self.check_race.grid(row=3, column=0, sticky="w")
+        ttk.Label(batch, text="Pace").grid(row=3, column=1, sticky="e", padx=(8, 4))
+        self.combo_pace = ttk.Combobox(batch, textvariable=self.var_race_pace, values=PACES, state="readonly", width=8)
+        self.combo_pace.grid(row=3, column=2, sticky="ew")
+
         # Data size slider
-        ttk.Label(side, text="Data Size (1..100)").grid(row=4, column=0, sticky="w")
-        self.scale_size = ttk.Scale(
-            side, from_=1, to=100, orient="horizontal",
-            variable=self.var_size
+        ttk.Label(side, text=f"Data Size (1..{self.MAX_DATA_SIZE})").grid(row=5, column=0, sticky="w")
+        self.spin_size = ttk.Spinbox(
+            side, from_=1, to=self.MAX_DATA_SIZE, increment=10,
+            textvariable=self.var_size
         )
-        self.scale_size.grid(row=5, column=0, sticky="ew", pady=(0, 10))
+        self.spin_size.grid(row=6, column=0, sticky="ew", pady=(0, 10))
 
         # Manual input
-        ttk.Label(side, text="Manual Input (non-negative integers)").grid(row=6, column=0, sticky="w")
-        self.entry_input = ttk.Entry(side, textvariable=self.var_input, width=30)
-        self.entry_input.grid(row=7, column=0, sticky="ew", pady=(0, 8))
+        ttk.Label(side, text="Manual Input (non-negative integers)").grid(row=7, column=0, sticky="w")
+        manual = ttk.Frame(side)
+        manual.grid(row=8, column=0, sticky="ew", pady=(0, 8))
+        manual.columnconfigure(0, weight=1)
+        self.entry_input = ttk.Entry(manual, textvariable=self.var_input, width=22)
+        self.entry_input.grid(row=0, column=0, sticky="ew")
+        self.btn_import = ttk.Button(manual, text="Import File", command=self.on_import_file)
+        self.btn_import.grid(row=0, column=1, sticky="e", padx=(6, 0))
 
         # Random controls
         rand_box = ttk.LabelFrame(side, text="Random Generation", padding=8)
-        rand_box.grid(row=8, column=0, sticky="ew", pady=(0, 10))
+        rand_box.grid(row=9, column=0, sticky="ew", pady=(0, 10))
         rand_box.columnconfigure(1, weight=1)
 
         ttk.Label(rand_box, text="Min").grid(row=0, column=0, sticky="w")
@@ -317,12 +397,32 @@ class SortingVisualizerApp(tk.Tk):
         self.entry_max = ttk.Entry(rand_box, textvariable=self.var_max, width=10)
         self.entry_max.grid(row=1, column=1, sticky="ew", padx=(8, 0), pady=2)
 
+        ttk.Label(rand_box, text="Shape").grid(row=2, column=0, sticky="w")
+        self.combo_distribution = ttk.Combobox(
+            rand_box, textvariable=self.var_distribution, values=DISTRIBUTIONS, state="readonly", width=12
+        )
+        self.combo_distribution.grid(row=2, column=1, sticky="ew", padx=(8, 0), pady=2)
+
+        ttk.Label(rand_box, text="Seed").grid(row=3, column=0, sticky="w")
+        self.entry_seed = ttk.Entry(rand_box, textvariable=self.var_seed, width=10)
+        self.entry_seed.grid(row=3, column=1, sticky="ew", padx=(8, 0), pady=2)
+
         self.btn_random = ttk.Button(rand_box, text="Random", command=self.on_random)
-        self.btn_random.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(6, 0))
+        self.btn_random.grid(row=4, column=0, columnspan=2, sticky="ew", pady=(6, 0))
+        ttk.Label(rand_box, textvariable=self.var_seed_used, foreground="#6B7280").grid(
+            row=5, column=0, columnspan=2, sticky="w"
+        )
+
+        ttk.Label(rand_box, text="Preset").grid(row=6, column=0, sticky="w", pady=(6, 0))
+        self.combo_preset = ttk.Combobox(
+            rand_box, textvariable=self.var_preset, values=[p.name for p in PRESETS], state="readonly", width=18
+        )
+        self.combo_preset.grid(row=6, column=1, sticky="ew", padx=(8, 0), pady=(6, 0))
+        self.combo_preset.bind("<<ComboboxSelected>>", self.on_preset)
 
         # Buttons
         btns = ttk.Frame(side)
-        btns.grid(row=9, column=0, sticky="ew", pady=(0, 10))
+        btns.grid(row=10, column=0, sticky="ew", pady=(0, 10))
         for c in range(5):
             btns.columnconfigure(c, weight=1)
 
@@ -338,9 +438,14 @@ class SortingVisualizerApp(tk.Tk):
         self.btn_reset.grid(row=0, column=3, sticky="ew", padx=(0, 6))
         self.btn_help.grid(row=0, column=4, sticky="ew")
 
+        self.btn_count = ttk.Button(btns, text="Count Only", command=self.on_count_only)
+        self.btn_count.grid(row=1, column=0, columnspan=3, sticky="ew", padx=(0, 6), pady=(6, 0))
+        self.btn_sample = ttk.Button(btns, text="Play Sample", command=self.on_play_sample)
+        self.btn_sample.grid(row=1, column=3, columnspan=2, sticky="ew", pady=(6, 0))
+
         # Metrics
         metrics = ttk.LabelFrame(side, text="Metrics", padding=8)
-        metrics.grid(row=10, column=0, sticky="ew")
+        metrics.grid(row=11, column=0, sticky="ew")
         metrics.columnconfigure(1, weight=1)
 
         ttk.Label(metrics, text="Algorithm:").grid(row=0, column=0, sticky="w")
@@ -355,35 +460,45 @@ class SortingVisualizerApp(tk.Tk):
         ttk.Label(metrics, text="Swaps/Writes:").grid(row=3, column=0, sticky="w")
         ttk.Label(metrics, textvariable=self.var_swaps).grid(row=3, column=1, sticky="w")
 
-        ttk.Label(metrics, text="Elapsed:").grid(row=4, column=0, sticky="w")
+        ttk.Label(metrics, text="Wall time:").grid(row=4, column=0, sticky="w")
         ttk.Label(metrics, textvariable=self.var_elapsed).grid(row=4, column=1, sticky="w")
 
+        # Where the wall time went; only "Generator" is the algorithm's own cost.
+        ttk.Label(metrics, text="Generator:").grid(row=5, column=0, sticky="w")
+        ttk.Label(metrics, textvariable=self.var_time_generator).grid(row=5, column=1, sticky="w")
+
+        ttk.Label(metrics, text="Apply:").grid(row=6, column=0, sticky="w")
+        ttk.Label(metrics, textvariable=self.var_time_apply).grid(row=6, column=1, sticky="w")
+
+        ttk.Label(metrics, text="Render:").grid(row=7, column=0, sticky="w")
+        ttk.Label(metrics, textvariable=self.var_time_render).grid(row=7, column=1, sticky="w")
+
+        ttk.Label(metrics, text="Idle/delay:").grid(row=8, column=0, sticky="w")
+        ttk.Label(metrics, textvariable=self.var_time_idle).grid(row=8, column=1, sticky="w")
+
+        # Trace files
+        trace_box = ttk.LabelFrame(side, text="Trace", padding=8)
+        trace_box.grid(row=12, column=0, sticky="ew", pady=(10, 0))
+        trace_box.columnconfigure(0, weight=1)
+        trace_box.columnconfigure(1, weight=1)
+
+        self.btn_save_trace = ttk.Button(trace_box, text="Save Trace", command=self.on_save_trace)
+        self.btn_load_trace = ttk.Button(trace_box, text="Load Trace", command=self.on_load_trace)
+        self.btn_save_trace.grid(row=0, column=0, sticky="ew", padx=(0, 6))
+        self.btn_load_trace.grid(row=0, column=1, sticky="ew")
+        self.check_cache = ttk.Checkbutton(trace_box, text="Cache recorded runs", variable=self.var_cache)
+        self.check_cache.grid(row=1, column=0, sticky="w", pady=(6, 0))
+        self.btn_clear_cache = ttk.Button(trace_box, text="Clear Cache", command=self.on_clear_cache)
+        self.btn_clear_cache.grid(row=1, column=1, sticky="ew", pady=(6, 0))
+
         # Message area
         msg = ttk.Label(side, textvariable=self.var_message, foreground="#B91C1C", wraplength=280, justify="left")
-        msg.grid(row=11, column=0, sticky="ew", pady=(10, 0))
+        msg.grid(row=13, column=0, sticky="ew", pady=(10, 0))
 
         self._update_buttons()
 
     # ----------------------------- Parsing & Validation -----------------------------
 
-    @staticmethod
-    def _parse_int_list(text: str) -> Optional[List[int]]:
-        s = text.strip()
-        if not s:
-            return None
-        parts = [p for p in re.split(r"[,\s]+", s) if p.strip() != ""]
-        if not parts:
-            return None
-        out: List[int] = []
-        for p in parts:
-            if not re.fullmatch(r"\d+", p):
-                return None
-            val = int(p)
-            if val < 0:
-                return None
-            out.append(val)
-        return out
-
     @staticmethod
     def _parse_nonneg_int(text: str) -> Optional[int]:
         t = text.strip()
@@ -394,6 +509,10 @@ class SortingVisualizerApp(tk.Tk):
             return None
         return v
 
+    def _on_algorithm_selected(self, _event=None) -> None:
+        algo = self.var_algo.get()
+        self.var_algo_info.set(self._registry.get(algo).describe() if algo in self._registry else "")
+
     def _on_input_edited(self, _event=None) -> None:
         self._set_message("")
 
@@ -406,6 +525,10 @@ class SortingVisualizerApp(tk.Tk):
         self.state = new_state
         self.var_status.set(new_state)
         self._update_buttons()
+        if new_state == "Running":
+            self._schedule_metrics_refresh()
+        else:
+            self._cancel_metrics_refresh()
 
     def _lock_controls(self, locked: bool) -> None:
         combo_state = "disabled" if locked else "readonly"
@@ -413,17 +536,39 @@ class SortingVisualizerApp(tk.Tk):
         btn_state = "disabled" if locked else "normal"
 
         self.combo_algo.configure(state=combo_state)
+        self.combo_pace.configure(state=combo_state)
+        self.combo_distribution.configure(state=combo_state)
+        self.combo_preset.configure(state=combo_state)
         self.entry_input.configure(state=entry_state)
         self.entry_min.configure(state=entry_state)
         self.entry_max.configure(state=entry_state)
+        self.entry_seed.configure(state=entry_state)
+        self.spin_batch.configure(state=entry_state)
+        self.entry_checkpoint.configure(state=entry_state)
         self.btn_random.configure(state=btn_state)
+        self.btn_import.configure(state=btn_state)
+        self.btn_save_trace.configure(state=btn_state)
+        self.btn_load_trace.configure(state=btn_state)
+        self.btn_clear_cache.configure(state=btn_state)
 
         if locked:
             self.scale_speed.state(["disabled"])
-            self.scale_size.state(["disabled"])
+            self.spin_size.state(["disabled"])
+            self.check_batched.state(["disabled"])
+            self.check_timeline.state(["disabled"])
+            self.check_threaded.state(["disabled"])
+            self.check_coalesce.state(["disabled"])
+            self.check_race.state(["disabled"])
+            self.check_cache.state(["disabled"])
         else:
             self.scale_speed.state(["!disabled"])
-            self.scale_size.state(["!disabled"])
+            self.spin_size.state(["!disabled"])
+            self.check_batched.state(["!disabled"])
+            self.check_timeline.state(["!disabled"])
+            self.check_threaded.state(["!disabled"])
+            self.check_coalesce.state(["!disabled"])
+            self.check_race.state(["!disabled"])
+            self.check_cache.state(["!disabled"])
 
     def _update_buttons(self) -> None:
         if self.state == "Idle":
@@ -431,6 +576,7 @@ class SortingVisualizerApp(tk.Tk):
             self.btn_pause.configure(state="disabled")
             self.btn_step.configure(state="normal")
             self.btn_reset.configure(state="normal")
+            self.btn_count.configure(state="normal")
         elif self.state == "Running":
             self.btn_play.configure(state="disabled")
             self.btn_pause.configure(state="normal")
@@ -452,21 +598,33 @@ class SortingVisualizerApp(tk.Tk):
             self.btn_step.configure(state="normal")
             self.btn_reset.configure(state="normal")
 
+        if self.state != "Idle":
+            self.btn_count.configure(state="disabled")
+        self.btn_sample.configure(state="normal" if self.state == "Finished" and self._counted_only else "disabled")
         self.btn_help.configure(state="normal")
 
+        seekable = self._timeline is not None and self.state in ("Paused", "Finished")
+        self.btn_back.configure(state="normal" if seekable else "disabled")
+        self.scale_timeline.state(["!disabled"] if self._timeline is not None else ["disabled"])
+
     def _reset_metrics_and_visuals(self) -> None:
-        self.comparisons = 0
-        self.swaps_or_writes = 0
-        self.sorted_indices.clear()
-        self._pivot_index = None
+        self._stop_producer()
+        self._stop_race()
+        self._engine = None
+        self._steps = None
+        self._timeline = None
+        self._counted_only = False
+        self._close_cached_trace()
+        self.var_position.set(0)
+        self.var_position_text.set("")
 
         self._start_perf = None
         self._elapsed_before_pause = 0.0
+        self._timings = RunTimings()
 
-        self.var_comparisons.set("0")
-        self.var_swaps.set("0")
-        self.var_elapsed.set("0.000 s")
+        self._update_metrics_labels()
         self.var_algo_name.set(self.var_algo.get())
+        self._invalidate_scene()
 
     def _cancel_schedule(self) -> None:
         if self._after_id is not None:
@@ -475,6 +633,7 @@ class SortingVisualizerApp(tk.Tk):
             except Exception:
                 pass
             self._after_id = None
+        self._idle_from_ns = None
 
     def _ensure_dataset_exists_or_message(self) -> bool:
         if not self.dataset_loaded or not self.data:
@@ -482,48 +641,320 @@ class SortingVisualizerApp(tk.Tk):
             return False
         return True
 
-    def _init_sorting_generator(self) -> None:
-        self._algo_local = list(self.data)
-        algo = self.var_algo.get()
-        self.var_algo_name.set(algo)
-
-        if algo == "Bubble Sort":
-            self._gen = bubble_sort_events(self._algo_local)
-        elif algo == "Selection Sort":
-            self._gen = selection_sort_events(self._algo_local)
-        elif algo == "Merge Sort (Top-Down)":
-            self._gen = merge_sort_events(self._algo_local)
-        elif algo == "Quick Sort (Lomuto)":
-            self._gen = quick_sort_lomuto_events(self._algo_local)
+    def _algorithm_factory(self, algo: str) -> Optional[EventSource]:
+        """Event generator for a registry name (imported on first use); None on failure."""
+        if algo not in self._registry:
+            algo = self.ALGORITHMS[0]
+        try:
+            return self._registry.load(algo)
+        except (ImportError, AttributeError, ValueError) as exc:
+            self._set_message(f"Could not load {algo}: {exc}")
+            return None
+
+    def _init_sorting_generator(self) -> bool:
+        """Set up the engine (or timeline) for the selected algorithm; False on failure."""
+        if self._trace is not None:
+            self.var_algo_name.set(f"{self._trace.algorithm or 'Unknown'} (trace)")
+            source = self._trace.source()
         else:
-            self._gen = bubble_sort_events(self._algo_local)
+            algo = self.var_algo.get()
+            self.var_algo_name.set(algo)
+            source = self._cached_source(algo)
+            if source is None:
+                source = self._algorithm_factory(algo)
+                if source is None:
+                    return False
+                if self._cache_key is not None and not self.var_timeline.get():
+                    # Fed from _drain_events/_advance_one, outside the generator's timed region.
+                    self._recorder = TraceRecorder(self.data, algo, self._trace_cache.max_bytes)
+
+        if self.var_timeline.get():
+            self._init_timeline(source)
+            if self._timeline is not None:
+                return True
+        self._engine = SortEngine(source, self.data, self._timings)
+        threaded = self.var_threaded.get()
+        if not threaded and not self.var_coalesce.get():
+            return True
+        events: Iterator = self._engine.take_events()
+        if self.var_coalesce.get():
+            events = coalesce_events(events, self.COALESCE_MAX_RUN)
+        if threaded:
+            # The worker owns the generator (and its private copy, engine.work); the Tk
+            # loop only applies the events (or coalesced steps) it hands over.
+            self._producer = EventProducer(events, timings=self._timings).start()
+        else:
+            self._steps = events
+        return True
+
+    def _cached_source(self, algo: str) -> Optional[EventSource]:
+        """Replay source of a cached run of algo on self.data; None on a miss or with caching off.
+
+        A miss leaves _cache_key set, so the run is stored once it completes.
+        """
+        self._cache_key = None
+        if not self.var_cache.get() or algo not in self._registry:
+            return None
+        key = self._trace_cache.key(self._registry.get(algo), self.data)
+        if key is None:
+            return None
+        trace = self._trace_cache.get(key)
+        if trace is None:
+            self._cache_key = key
+            return None
+        self._cached_trace = trace
+        self.var_algo_name.set(f"{algo} (cached)")
+        return trace.source()
+
+    def _store_recording(self) -> None:
+        """Put a completed recording (or nothing) into the trace cache."""
+        recorder, key = self._recorder, self._cache_key
+        self._recorder = None
+        self._cache_key = None
+        if recorder is not None:
+            recorder.finish()
+        if recorder is not None and key is not None and recorder.complete:
+            self._trace_cache.put(key, recorder.trace)
+
+    def _close_cached_trace(self) -> None:
+        self._recorder = None
+        self._cache_key = None
+        if self._cached_trace is not None:
+            self._cached_trace.close()
+            self._cached_trace = None
+
+    def _stop_producer(self) -> None:
+        if self._producer is not None:
+            self._producer.stop()
+            self._producer = None
+
+    def _init_timeline(self, source: EventSource) -> None:
+        """Record the whole run up front so Play/Step/Back/scrub can move freely."""
+        if self._trace is not None or self._cached_trace is not None:
+            trace = self._trace if self._trace is not None else self._cached_trace
+        else:
+            # The generator runs here, up front; playback then only applies the trace.
+            cpu0, wall0 = time.process_time_ns(), time.perf_counter_ns()
+            try:
+                trace = EventTrace.record(source, self.data, self.var_algo.get())
+            except OverflowError:
+                self._set_message("Timeline needs 32-bit values; playing without it.")
+                return
+            self._timings.generator_wall_ns += time.perf_counter_ns() - wall0
+            self._timings.generator_cpu_ns += time.process_time_ns() - cpu0
+            if self._cache_key is not None:
+                self._trace_cache.put(self._cache_key, trace)
+                self._cache_key = None
+
+        raw = self.var_checkpoint.get().strip().lower()
+        every = self._parse_nonneg_int(raw) if raw not in ("", "auto") else None
+        if raw not in ("", "auto") and not every:
+            self._set_message("Checkpoint interval must be a positive integer or 'auto'; using auto.")
+            every = None
+
+        self._timeline = Timeline(trace, self.data, every)
+        self._engine = self._timeline.engine
+        self.scale_timeline.configure(to=max(1, self._timeline.length))
+        self._sync_timeline_position()
+
+    def _sync_timeline_position(self) -> None:
+        timeline = self._timeline
+        if timeline is None:
+            return
+        self.var_position.set(timeline.position)
+        self.var_position_text.set(f"{timeline.position} / {timeline.length}")
+
+    def _init_race(self) -> bool:
+        """Start one worker process per algorithm on copies of self.data; False on failure."""
+        algorithms = []
+        for name in self.ALGORITHMS:
+            source = self._algorithm_factory(name)
+            if source is None:
+                return False
+            algorithms.append((name, source))
+        try:
+            self._race = Race(algorithms, self.data, self.var_race_pace.get()).start()
+        except (OSError, ValueError) as exc:
+            self._race = None
+            self._set_message(f"Could not start race: {exc}")
+            return False
+        self.var_algo_name.set(f"Race ({len(algorithms)} algorithms)")
+        return True
+
+    def _stop_race(self) -> None:
+        if self._race is not None:
+            self._race.stop()
+            self._race = None
+            self._race_key = None
+
+    def _close_trace(self) -> None:
+        if self._trace is not None:
+            self._stop_producer()
+            self._engine = None
+            self._steps = None
+            self._trace.close()
+            self._trace = None
+
+    # ----------------------------- Engine State -----------------------------
+
+    @property
+    def comparisons(self) -> int:
+        return self._engine.comparisons if self._engine is not None else 0
+
+    @property
+    def swaps_or_writes(self) -> int:
+        return self._engine.swaps_or_writes if self._engine is not None else 0
+
+    @property
+    def sorted_indices(self) -> Set[int]:
+        return self._engine.sorted_indices if self._engine is not None else set()
+
+    @property
+    def _pivot_index(self) -> Optional[int]:
+        return self._engine.pivot_index if self._engine is not None else None
+
+    @property
+    def _replaying(self) -> bool:
+        """Events come from a stored trace (file or cache hit), not the algorithm itself."""
+        return self._trace is not None or self._cached_trace is not None
 
     # ----------------------------- Drawing -----------------------------
 
-    def _compute_colors_for_tick(self, highlights: Dict[int, str]) -> Dict[int, str]:
-        colors: Dict[int, str] = {}
+    def _on_canvas_configure(self, event: tk.Event) -> None:
+        """Remember the new size and (re)start the settle timer; a drag yields one redraw."""
+        self._pending_size = (max(1, event.width), max(1, event.height))
+        if self._resize_after_id is not None:
+            self.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.after(self.RESIZE_SETTLE_MS, self._apply_resize)
+
+    def _apply_resize(self) -> None:
+        self._resize_after_id = None
+        size, self._pending_size = self._pending_size, None
+        if size is None or size == self._canvas_size:
+            return
+        self._canvas_size = size
+        if self._overlay_item is not None:
+            self.canvas.coords(self._overlay_item, size[0] - 10, 28)
+        # A running sort picks the new size up on its next tick.
+        if self.state != "Running":
+            self._redraw()
+
+    def _get_canvas_size(self) -> Tuple[int, int]:
+        if self._canvas_size is None:
+            self._canvas_size = (max(1, self.canvas.winfo_width()), max(1, self.canvas.winfo_height()))
+        return self._canvas_size
+
+    def _get_layout(self, w: int, h: int, n: int) -> SceneLayout:
+        layout = self._layout
+        if layout is None or (layout.w, layout.h, layout.n) != (w, h, n):
+            layout = self._layout = SceneLayout.compute(w, h, n)
+        return layout
+
+    def _rebuild_color_codes(self) -> None:
+        """Derive every index's base color code from the engine state (O(n))."""
         n = len(self.data)
+        self._coded_pivot = None
+        if self.state == "Finished":
+            self._color_codes = bytearray([self.CODE_FINISHED]) * n
+            return
+        codes = bytearray(n)
+        for i in self.sorted_indices:
+            if 0 <= i < n:
+                codes[i] = self.CODE_SORTED
+        pivot = self._pivot_index
+        if pivot is not None and 0 <= pivot < n:
+            codes[pivot] = self.CODE_PIVOT
+            self._coded_pivot = pivot
+        self._color_codes = codes
+
+    def _refresh_color_code(self, i: int) -> None:
+        codes = self._color_codes
+        if not 0 <= i < len(codes) or codes[i] == self.CODE_FINISHED:
+            return
+        if i == self._coded_pivot:
+            codes[i] = self.CODE_PIVOT
+        elif i in self.sorted_indices:
+            codes[i] = self.CODE_SORTED
+        else:
+            codes[i] = self.CODE_DEFAULT
+        self._dirty_indices.add(i)
 
-        for idx in range(n):
-            if self.state == "Finished":
-                colors[idx] = self.COLORS["finished"]
-            elif idx in self.sorted_indices:
-                colors[idx] = self.COLORS["sorted"]
+    def _sync_pivot_code(self) -> None:
+        old, new = self._coded_pivot, self._pivot_index
+        if old == new:
+            return
+        self._coded_pivot = new
+        for i in (old, new):
+            if i is not None:
+                self._refresh_color_code(i)
+
+    def _compute_colors_for_tick(
+        self, highlights: Dict[int, str], indices: Optional[Iterable[int]] = None
+    ) -> Dict[int, str]:
+        prof = self._profiler
+        t0 = time.perf_counter_ns() if prof is not None else 0
+        colors: Dict[int, str] = {}
+        n = len(self.data)
+        codes = self._color_codes
+        palette = self._code_colors
+        use_highlights = bool(highlights) and self.state != "Finished"
+
+        for idx in (range(n) if indices is None else indices):
+            if not 0 <= idx < n:
+                continue
+            if use_highlights and idx in highlights:
+                colors[idx] = highlights[idx]
             else:
-                colors[idx] = self.COLORS["default"]
-
-        if self.state != "Finished":
-            if self._pivot_index is not None and 0 <= self._pivot_index < n:
-                colors[self._pivot_index] = self.COLORS["pivot"]
-            for idx, col in highlights.items():
-                if 0 <= idx < n:
-                    colors[idx] = col
+                colors[idx] = palette[codes[idx]]
 
+        if prof is not None:
+            prof.add("colors", time.perf_counter_ns() - t0)
         return colors
 
-    def _redraw(self, highlights: Optional[Dict[int, str]] = None) -> None:
+    def _invalidate_scene(self) -> None:
+        """Force the next _redraw to rebuild every canvas item."""
+        self._scene_key = None
+
+    def _clear_scene(self) -> None:
         self.canvas.delete("all")
+        self._scene_key = None
+        self._bar_items = []
+        self._label_items = []
+        self._drawn_values = []
+        self._drawn_colors = []
+        self._raster = None
+        self._raster_cols = 0
+        self._drawn_columns = []
+        self._overlay_item = None
+        self._last_highlights = set()
+        self._dirty_indices.clear()
+        self._race_key = None
+        self._race_images = []
+        self._race_labels = []
+        self._race_columns = []
+
+    def _bar_coords(self, i: int, val: int) -> Tuple[float, float, float, float]:
+        left_pad, top_pad, bar_w, usable_h, max_val = self._scene_geom
+        x0 = left_pad + i * bar_w + 1
+        x1 = left_pad + (i + 1) * bar_w - 1
+        y1 = top_pad + usable_h
+        y0 = y1 - (val / max_val) * usable_h
+        return x0, y0, x1, y1
+
+    def _redraw(self, highlights: Optional[Dict[int, str]] = None) -> None:
+        """Bring the canvas in line with self.data.
+
+        With highlights=None every bar is re-checked (used after state changes such
+        as Pause/Finish/Reset). With a highlights dict (a tick) only the indices
+        highlighted now, highlighted last time, or marked dirty by _apply_event are
+        revisited, and only items (or raster columns) whose value or color changed
+        are repainted.
+        """
+        if self._race is not None and self.data:
+            self._redraw_race()
+            return
         if not self.data:
+            self._clear_scene()
             self.canvas.create_text(
                 10, 10, anchor="nw",
                 text="No dataset loaded. Enter data and press Play, or press Random.",
@@ -531,50 +962,92 @@ class SortingVisualizerApp(tk.Tk):
             )
             return
 
-        highlights = highlights or {}
-        colors = self._compute_colors_for_tick(highlights)
+        w, h = self._get_canvas_size()
+        n = len(self.data)
 
-        w = max(1, self.canvas.winfo_width())
-        h = max(1, self.canvas.winfo_height())
+        full = highlights is None
+        if highlights is None:
+            highlights = {}
+            indices: Iterable[int] = range(n)
+            max_val = max(max(self.data), 1)
+            self._rebuild_color_codes()
+        else:
+            if len(self._color_codes) != n:
+                self._rebuild_color_codes()
+            indices = set(highlights) | self._last_highlights | self._dirty_indices
+            max_val = self._scene_geom[4]
+            if any(0 <= i < n and self.data[i] > max_val for i in indices):
+                max_val = max(max(self.data), 1)
+
+        if self._scene_key != (w, h, n, max_val):
+            self._build_scene(w, h, max_val, highlights)
+            return
 
-        top_pad = 20
-        bottom_pad = 60
-        left_pad = 20
-        right_pad = 20
+        if self._raster is not None:
+            cols = self._raster_cols
+            self._paint_columns(None if full else {i * cols // n for i in indices if 0 <= i < n}, highlights)
+            self._last_highlights = set(highlights)
+            self._dirty_indices.clear()
+            return
 
-        usable_w = max(1, w - left_pad - right_pad)
-        usable_h = max(1, h - top_pad - bottom_pad)
+        colors = self._compute_colors_for_tick(highlights, indices)
+        for i, col in colors.items():
+            val = self.data[i]
+            if val != self._drawn_values[i]:
+                self.canvas.coords(self._bar_items[i], *self._bar_coords(i, val))
+                if self._label_items:
+                    self.canvas.itemconfigure(self._label_items[i], text=str(val))
+                self._drawn_values[i] = val
+            if col != self._drawn_colors[i]:
+                self.canvas.itemconfigure(self._bar_items[i], fill=col)
+                self._drawn_colors[i] = col
 
-        n = len(self.data)
-        max_val = max(self.data) if self.data else 1
-        max_val = max(max_val, 1)
-
-        bar_w = usable_w / n
-        font_size = 8 if n > 60 else 9 if n > 40 else 10
-        value_font = ("Segoe UI", font_size)
-
-        for i, val in enumerate(self.data):
-            x0 = left_pad + i * bar_w + 1
-            x1 = left_pad + (i + 1) * bar_w - 1
-            bar_h = (val / max_val) * usable_h
-            y1 = top_pad + usable_h
-            y0 = y1 - bar_h
-
-            self.canvas.create_rectangle(
-                x0, y0, x1, y1,
-                fill=colors.get(i, self.COLORS["default"]),
-                outline="#111827" if n <= 60 else ""
-            )
+        self._last_highlights = set(highlights)
+        self._dirty_indices.clear()
 
-            tx = (x0 + x1) / 2
-            ty = y1 + 16
-            self.canvas.create_text(
-                tx, ty,
-                text=str(val),
-                font=value_font,
-                fill="#111827"
-            )
+    def _build_scene(self, w: int, h: int, max_val: int, highlights: Dict[int, str]) -> None:
+        self._clear_scene()
 
+        n = len(self.data)
+        layout = self._get_layout(w, h, n)
+        left_pad, top_pad = layout.left_pad, layout.top_pad
+        usable_w, usable_h = layout.usable_w, layout.usable_h
+        bar_w = layout.bar_w
+        value_font = ("Segoe UI", layout.font_size)
+        outline = layout.outline
+
+        self._scene_geom = (left_pad, top_pad, bar_w, usable_h, max_val)
+
+        if n > self.RASTER_MIN_N:
+            self._raster = tk.PhotoImage(width=usable_w, height=usable_h)
+            self._raster.put("#FFFFFF", to=(0, 0, usable_w, usable_h))
+            self.canvas.create_image(left_pad, top_pad, anchor="nw", image=self._raster)
+            self._raster_cols = min(n, usable_w)
+            self._drawn_columns = [None] * self._raster_cols
+            self._paint_columns(None, highlights)
+        else:
+            colors = self._compute_colors_for_tick(highlights)
+            show_labels = bar_w >= self.LABEL_MIN_PX
+            rects = bar_rects(self.data, left_pad, top_pad, bar_w, usable_h, max_val)
+            for i, val in enumerate(self.data):
+                x0, y0, x1, y1 = rects[i]
+                col = colors.get(i, self.COLORS["default"])
+                self._bar_items.append(self.canvas.create_rectangle(x0, y0, x1, y1, fill=col, outline=outline))
+                if show_labels:
+                    self._label_items.append(self.canvas.create_text(
+                        (x0 + x1) / 2, y1 + 16,
+                        text=str(val),
+                        font=value_font,
+                        fill="#111827"
+                    ))
+                self._drawn_values.append(val)
+                self._drawn_colors.append(col)
+
+        self._draw_legend()
+        self._scene_key = (w, h, n, max_val)
+        self._last_highlights = set(highlights)
+
+    def _draw_legend(self) -> None:
         legend_y = 6
         lx = 10
         items = [
@@ -592,6 +1065,207 @@ class SortingVisualizerApp(tk.Tk):
             self.canvas.create_text(lx + 16, legend_y + 6, anchor="w", text=label, fill="#374151", font=("Segoe UI", 9))
             lx += 80
 
+    def _tint(self, color: str) -> str:
+        """Half-way blend of color with white, used for the min..max span of a raster column."""
+        tint = self._tints.get(color)
+        if tint is None:
+            r, g, b = (int(color[k:k + 2], 16) for k in (1, 3, 5))
+            tint = "#{:02X}{:02X}{:02X}".format((r + 255) // 2, (g + 255) // 2, (b + 255) // 2)
+            self._tints[color] = tint
+        return tint
+
+    def _paint_columns(self, columns: Optional[Iterable[int]], highlights: Dict[int, str]) -> None:
+        """Repaint raster columns (all if columns is None) whose min/max/color changed.
+
+        Each pixel column aggregates a contiguous run of elements: it is filled
+        solid up to the run's minimum and tinted from there up to its maximum, and
+        takes the strongest color in the run (highlight > pivot > unsorted > sorted).
+        """
+        raster = self._raster
+        if raster is None:
+            return
+        data = self.data
+        n = len(data)
+        cols = self._raster_cols
+        img_w = raster.width()
+        img_h = raster.height()
+        max_val = self._scene_geom[4]
+
+        finished = self.state == "Finished"
+        codes = self._color_codes
+        sorted_code = self.CODE_SORTED
+        pivot = self._coded_pivot
+        hl_cols = {i * cols // n: col for i, col in highlights.items() if 0 <= i < n}
+        pivot_col = pivot * cols // n if pivot is not None and 0 <= pivot < n else None
+        # A full repaint (new scene, resize, state change) gets every column's extent in one pass.
+        extents = column_extents(data, cols) if columns is None else None
+
+        for c in (range(cols) if columns is None else columns):
+            lo = -(-c * n // cols)
+            hi = -(-(c + 1) * n // cols)
+            if extents is not None:
+                lo_v = extents[0][c]
+                hi_v = extents[1][c]
+            else:
+                chunk = data[lo:hi]
+                lo_v = min(chunk)
+                hi_v = max(chunk)
+
+            if finished:
+                color = self.COLORS["finished"]
+            elif c in hl_cols:
+                color = hl_cols[c]
+            elif c == pivot_col:
+                color = self.COLORS["pivot"]
+            elif codes.count(sorted_code, lo, hi) == hi - lo:
+                color = self.COLORS["sorted"]
+            else:
+                color = self.COLORS["default"]
+
+            key = (lo_v, hi_v, color)
+            if self._drawn_columns[c] == key:
+                continue
+            self._drawn_columns[c] = key
+
+            self._put_column(raster, c * img_w // cols, (c + 1) * img_w // cols, img_h, lo_v, hi_v, max_val, color)
+
+    def _put_column(
+        self, raster: tk.PhotoImage, x0: int, x1: int, img_h: int, lo_v: int, hi_v: int, max_val: int, color: str
+    ) -> None:
+        """Fill one raster column: white above hi_v, tinted from hi_v down to lo_v, solid below."""
+        y_max = img_h - round(hi_v / max_val * img_h)
+        y_min = img_h - round(lo_v / max_val * img_h)
+        if y_max > 0:
+            raster.put("#FFFFFF", to=(x0, 0, x1, y_max))
+        if y_min > y_max:
+            raster.put(self._tint(color), to=(x0, y_max, x1, y_min))
+        if img_h > y_min:
+            raster.put(color, to=(x0, y_min, x1, img_h))
+
+    def _build_race_scene(self, w: int, h: int) -> None:
+        self._clear_scene()
+        race = self._race
+        if race is None:
+            return
+
+        top_pad = 28
+        bottom_pad = 10
+        left_pad = 20
+        right_pad = 20
+        label_h = 18
+        gap = 8
+
+        lanes = len(race.lanes)
+        usable_w = max(1, w - left_pad - right_pad)
+        lane_h = max(label_h + 1, (h - top_pad - bottom_pad) // max(1, lanes))
+        img_h = max(1, lane_h - label_h - gap)
+        n = len(self.data)
+
+        self._race_max_val = max(max(self.data), 1)
+        self._race_cols = min(n, usable_w)
+        for k, lane in enumerate(race.lanes):
+            y = top_pad + k * lane_h
+            self._race_labels.append(self.canvas.create_text(
+                left_pad, y, anchor="nw", text=lane.name, fill="#111827", font=("Segoe UI", 9)
+            ))
+            image = tk.PhotoImage(width=usable_w, height=img_h)
+            image.put("#FFFFFF", to=(0, 0, usable_w, img_h))
+            self.canvas.create_image(left_pad, y + label_h, anchor="nw", image=image)
+            self._race_images.append(image)
+            self._race_columns.append([None] * self._race_cols)
+        self._race_hl_cols = [set() for _ in race.lanes]
+        self._race_done = [False] * lanes
+
+        self._draw_legend()
+        self._race_key = (w, h, n)
+
+    def _redraw_race(self, applied: Optional[List[List[Tuple[int, int, int]]]] = None) -> None:
+        """Bring every race lane in line with its engine.
+
+        With applied=None every column of every lane is re-checked; with the
+        per-lane (op, a, b) lists returned by Race.advance only the columns those
+        events touched (plus last frame's highlights) are revisited.
+        """
+        race = self._race
+        if race is None:
+            return
+        w, h = self._get_canvas_size()
+        n = len(self.data)
+        if self._race_key != (w, h, n):
+            self._build_race_scene(w, h)
+            applied = None
+
+        cols = self._race_cols
+        for k, lane in enumerate(race.lanes):
+            engine = lane.engine
+            highlights: Dict[int, str] = {}
+            if applied is None or lane.done != self._race_done[k]:
+                columns: Iterable[int] = range(cols)
+            else:
+                touched: Set[int] = set(self._race_hl_cols[k])
+                for op, a, b in applied[k]:
+                    if not 0 <= a < n:
+                        continue
+                    c = a * cols // n
+                    touched.add(c)
+                    color = self.OP_HIGHLIGHTS.get(op)
+                    if color is not None:
+                        highlights[c] = color
+                    if (op == OP_COMPARE or op == OP_SWAP) and 0 <= b < n:
+                        c = b * cols // n
+                        touched.add(c)
+                        highlights[c] = color
+                columns = touched
+            self._race_done[k] = lane.done
+            self._paint_lane(k, columns, highlights)
+            self._race_hl_cols[k] = set(highlights)
+
+            status = f"  - {lane.error}" if lane.error else "  - done" if lane.done else ""
+            self.canvas.itemconfigure(
+                self._race_labels[k],
+                text=f"{lane.name}: {engine.events:,} events, {engine.comparisons:,} comparisons, "
+                     f"{engine.swaps_or_writes:,} swaps/writes{status}",
+            )
+
+    def _paint_lane(self, k: int, columns: Iterable[int], highlights: Dict[int, str]) -> None:
+        """_paint_columns for one race lane; a finished lane turns the finished color."""
+        race = self._race
+        if race is None:
+            return
+        lane = race.lanes[k]
+        raster = self._race_images[k]
+        drawn = self._race_columns[k]
+        data = lane.engine.data
+        sorted_indices = lane.engine.sorted_indices
+        n = len(data)
+        cols = self._race_cols
+        img_w = raster.width()
+        img_h = raster.height()
+        max_val = self._race_max_val
+        finished = lane.done and lane.error is None
+
+        for c in columns:
+            lo = -(-c * n // cols)
+            hi = -(-(c + 1) * n // cols)
+            chunk = data[lo:hi]
+            lo_v = min(chunk)
+            hi_v = max(chunk)
+
+            if finished:
+                color = self.COLORS["finished"]
+            elif c in highlights:
+                color = highlights[c]
+            elif all(i in sorted_indices for i in range(lo, hi)):
+                color = self.COLORS["sorted"]
+            else:
+                color = self.COLORS["default"]
+
+            key = (lo_v, hi_v, color)
+            if drawn[c] == key:
+                continue
+            drawn[c] = key
+            self._put_column(raster, c * img_w // cols, (c + 1) * img_w // cols, img_h, lo_v, hi_v, max_val, color)
+
     # ----------------------------- Metrics -----------------------------
 
     def _elapsed_seconds(self) -> float:
@@ -600,86 +1274,295 @@ class SortingVisualizerApp(tk.Tk):
         return self._elapsed_before_pause + (time.perf_counter() - self._start_perf)
 
     def _update_metrics_labels(self) -> None:
-        self.var_comparisons.set(str(self.comparisons))
-        self.var_swaps.set(str(self.swaps_or_writes))
-        self.var_elapsed.set(f"{self._elapsed_seconds():.3f} s")
+        """Push the current counters and timings to the labels, setting only the texts that changed."""
+        t = self._timings
+        shown = (
+            str(self.comparisons),
+            str(self.swaps_or_writes),
+            f"{self._elapsed_seconds():.3f} s",
+            f"{t.generator_cpu_ns / 1e9:.3f} s CPU ({t.generator_wall_ns / 1e9:.3f} s wall)"
+            + (" replay" if self._replaying else ""),
+            f"{t.apply_ns / 1e9:.3f} s",
+            f"{t.render_ns / 1e9:.3f} s",
+            f"{t.idle_ns / 1e9:.3f} s",
+        )
+        old = self._shown_metrics
+        if shown == old:
+            return
+        for k, (var, new) in enumerate(zip(self._metric_vars, shown)):
+            if k >= len(old) or old[k] != new:
+                var.set(new)
+        self._shown_metrics = shown
+
+    def _schedule_metrics_refresh(self) -> None:
+        if self._metrics_after_id is None:
+            self._metrics_after_id = self.after(self.METRICS_REFRESH_MS, self._refresh_metrics)
+
+    def _cancel_metrics_refresh(self) -> None:
+        if self._metrics_after_id is not None:
+            try:
+                self.after_cancel(self._metrics_after_id)
+            except Exception:
+                pass
+            self._metrics_after_id = None
+
+    def _refresh_metrics(self) -> None:
+        """Metrics timer: push counters and timeline position, then re-arm while Running."""
+        self._metrics_after_id = None
+        if self.state != "Running":
+            return
+        t0 = time.perf_counter_ns()
+        self._update_metrics_labels()
+        self._sync_timeline_position()
+        if self._profiler is not None:
+            self._profiler.add("metrics", time.perf_counter_ns() - t0)
+        self._schedule_metrics_refresh()
 
     # ----------------------------- Event Application -----------------------------
 
     def _apply_event(self, event: Event) -> Dict[int, str]:
+        """Apply one event through the engine and return the bars to highlight."""
+        engine = self._engine
+        if engine is None:
+            return {}
+        engine.apply(event)
+        op, a, b, indices = event
+        if indices is not None and op == OP_MARK_SORTED:
+            for i in indices:
+                self._refresh_color_code(i)
+            return {}
+        return self._highlights_for_op(op, a, b)
+
+    def _highlights_for_op(self, op: int, a: Optional[int], b: Optional[int]) -> Dict[int, str]:
+        """Bars to highlight for an (already applied or undone) event in opcode form."""
         highlights: Dict[int, str] = {}
-        et = event.type
-
-        if et == "compare":
-            if event.i is not None and event.j is not None:
-                highlights[event.i] = self.COLORS["comparing"]
-                highlights[event.j] = self.COLORS["comparing"]
-            self.comparisons += 1
-
-        elif et == "swap":
-            i, j = event.i, event.j
-            if i is not None and j is not None and 0 <= i < len(self.data) and 0 <= j < len(self.data):
-                highlights[i] = self.COLORS["swapping"]
-                highlights[j] = self.COLORS["swapping"]
-                self.data[i], self.data[j] = self.data[j], self.data[i]
-            self.swaps_or_writes += 1
-
-        elif et == "pivot":
-            if event.i is not None:
-                self._pivot_index = event.i
-                highlights[event.i] = self.COLORS["pivot"]
-
-        elif et == "select_min":
-            if event.i is not None:
-                highlights[event.i] = self.COLORS["selected_min"]
-
-        elif et == "write":
-            i = event.i
-            if i is not None and event.value is not None and 0 <= i < len(self.data):
-                highlights[i] = self.COLORS["writing"]
-                self.data[i] = event.value
-            self.swaps_or_writes += 1
-
-        elif et == "mark_sorted":
-            if event.i is not None:
-                self.sorted_indices.add(event.i)
+        n = len(self.data)
+
+        if op == OP_COMPARE:
+            if a is not None and b is not None:
+                highlights[a] = self.COLORS["comparing"]
+                highlights[b] = self.COLORS["comparing"]
+
+        elif op == OP_SWAP:
+            if a is not None and b is not None and 0 <= a < n and 0 <= b < n:
+                highlights[a] = self.COLORS["swapping"]
+                highlights[b] = self.COLORS["swapping"]
+
+        elif op == OP_PIVOT:
+            if a is not None:
+                highlights[a] = self.COLORS["pivot"]
+            self._sync_pivot_code()
+
+        elif op == OP_SELECT_MIN:
+            if a is not None:
+                highlights[a] = self.COLORS["selected_min"]
+
+        elif op == OP_WRITE:
+            if a is not None and b is not None and 0 <= a < n:
+                highlights[a] = self.COLORS["writing"]
 
+        elif op == OP_MARK_SORTED:
+            if a is not None:
+                self._refresh_color_code(a)
+
+        return highlights
+
+    def _pull_steps(self, max_steps: int) -> Tuple[List[object], bool]:
+        """Fetch up to max_steps raw steps without highlighting them; returns them and done.
+
+        A step is an Event (generator or producer thread), a list of Events (a
+        coalesced step) or an already applied (op, a, b) tuple (timeline). Fewer
+        steps than asked for come back when the producer thread has nothing queued
+        yet. Generator and coalesced steps are pulled as one batch, which is what
+        RunTimings counts as generator time.
+        """
+        timeline = self._timeline
+        if timeline is not None:
+            steps: List[object] = []
+            for _ in range(max_steps):
+                step = timeline.step_forward()
+                if step is None:
+                    return steps, True
+                steps.append(step)
+            return steps, False
+        producer = self._producer
+        if producer is not None:
+            steps = []
+            while len(steps) < max_steps:
+                step = producer.poll()
+                if step is None:
+                    return steps, True
+                if step is NOT_READY:
+                    break
+                steps.append(step)
+            return steps, False
+        if self._steps is not None:
+            steps = next_batch(self._steps, max_steps, self._timings)
+            return steps, len(steps) < max_steps
+        engine = self._engine
+        if engine is None:
+            return [], True
+        steps = engine.next_events(max_steps)
+        return steps, engine.done
+
+    def _apply_step(self, step: object) -> Dict[int, str]:
+        # Events are tuples too, so they must be told apart from timeline steps first.
+        if isinstance(step, Event):
+            return self._apply_event(step)
+        if isinstance(step, list):
+            highlights: Dict[int, str] = {}
+            for event in step:
+                highlights.update(self._apply_event(event))
+            return highlights
+        return self._highlights_for_op(*step)  # type: ignore[misc]  # applied (op, a, b) timeline step
+
+    def _advance_one(self) -> Optional[Dict[int, str]]:
+        """Apply exactly one step (waiting for the producer thread if needed); None when done."""
+        producer = self._producer
+        t0 = time.perf_counter_ns()
+        if producer is not None:
+            producer.resume()
+            step = producer.poll(block=True)
+            if self.state != "Running":
+                producer.pause()
+        else:
+            steps, _done = self._pull_steps(1)
+            step = steps[0] if steps else None
+        if step is None:
+            return None
+        t1 = time.perf_counter_ns()
+        if self._recorder is not None:
+            self._recorder.record((step,))
+        highlights = self._apply_step(step)
+        # Timeline steps are applied while being fetched (see _drain_events).
+        self._timings.apply_ns += time.perf_counter_ns() - (t0 if self._timeline is not None else t1)
         return highlights
 
     # ----------------------------- Animation Loop -----------------------------
 
+    def _events_per_frame(self) -> int:
+        parsed = self._parse_nonneg_int(self.var_events_per_frame.get())
+        return max(1, parsed or 1)
+
+    def _schedule_tick(self) -> None:
+        delay = self.FRAME_MS if self.var_batched.get() else max(1, int(self.var_speed.get()))
+        now = time.perf_counter_ns()
+        self._tick_due_ns = now + delay * 1_000_000
+        self._idle_from_ns = now
+        self._after_id = self.after(delay, self._tick)
+
+    def _drain_events(self, max_events: int, deadline: float) -> Tuple[Dict[int, str], bool]:
+        """Apply up to max_events events (or until deadline); returns merged highlights and done.
+
+        Steps are fetched and applied in chunks of up to 64, so clocks and the deadline
+        are read once per chunk. Timeline steps apply their event while being fetched,
+        and producer steps are only a queue hand-off, so for both the fetch counts as
+        apply time in RunTimings (the profiler still shows it as "advance").
+        """
+        prof = self._profiler
+        clock = time.perf_counter_ns
+        highlights: Dict[int, str] = {}
+        advance_ns = apply_ns = 0
+        count = 0
+        done = False
+
+        while count < max_events:
+            wanted = min(64, max_events - count)
+            t0 = clock()
+            steps, done = self._pull_steps(wanted)
+            t1 = clock()
+            if self._recorder is not None:
+                self._recorder.record(steps)
+            for step in steps:
+                highlights.update(self._apply_step(step))
+            advance_ns += t1 - t0
+            apply_ns += clock() - t1
+            count += len(steps)
+            if done or len(steps) < wanted or time.perf_counter() >= deadline:
+                break
+
+        timed_generator = self._timeline is None and self._producer is None
+        self._timings.apply_ns += apply_ns if timed_generator else apply_ns + advance_ns
+        if prof is not None:
+            prof.add("advance", advance_ns)
+            prof.add("apply", apply_ns)
+            prof.frame(count)
+        return highlights, done
+
     def _tick(self) -> None:
         if self.state != "Running":
             self._after_id = None
             return
 
-        if self._gen is None:
-            self._finish_sort()
+        now = time.perf_counter_ns()
+        if self._idle_from_ns is not None:
+            self._timings.idle_ns += now - self._idle_from_ns
+            self._idle_from_ns = None
+        prof = self._profiler
+        if prof is not None:
+            prof.add("tk", max(0, now - self._tick_due_ns))
+
+        if self._race is not None:
+            self._race_tick()
             return
 
-        try:
-            event = next(self._gen)
-        except StopIteration:
+        if self._engine is None:
             self._finish_sort()
             return
 
-        if event.type == "done":
+        if self.var_batched.get():
+            deadline = time.perf_counter() + self.FRAME_BUDGET_S
+            highlights, done = self._drain_events(self._events_per_frame(), deadline)
+        else:
+            highlights, done = self._drain_events(1, 0.0)
+        if done:
             self._finish_sort()
             return
 
-        highlights = self._apply_event(event)
-        self._update_metrics_labels()
+        t0 = time.perf_counter_ns()
         self._redraw(highlights)
+        render_ns = time.perf_counter_ns() - t0
+        self._timings.render_ns += render_ns
+        if prof is not None:
+            prof.add("redraw", render_ns)
+            self._update_profile_overlay()
 
         if self.state == "Running":
-            delay = max(1, int(self.var_speed.get()))
-            self._after_id = self.after(delay, self._tick)
+            self._schedule_tick()
+
+    def _race_tick(self, timeout: Optional[float] = None) -> None:
+        """Advance every lane by one frame's worth of events (or cost units) and redraw."""
+        race = self._race
+        prof = self._profiler
+        amount = self._events_per_frame() if self.var_batched.get() else 1
+
+        t0 = time.perf_counter_ns()
+        applied = race.advance(amount, timeout)
+        t1 = time.perf_counter_ns()
+        self._redraw_race(applied)
+        render_ns = time.perf_counter_ns() - t1
+        self._timings.render_ns += render_ns
+        if prof is not None:
+            prof.add("advance", t1 - t0)
+            prof.add("redraw", render_ns)
+            prof.frame(sum(len(ops) for ops in applied))
+            self._update_profile_overlay()
+
+        if race.done:
+            failed = [f"{lane.name}: {lane.error}" for lane in race.lanes if lane.error]
+            if failed:
+                self._set_message("; ".join(failed))
+            self._finish_sort()
+        elif self.state == "Running":
+            self._schedule_tick()
 
     def _finish_sort(self) -> None:
         self._cancel_schedule()
-        self._pivot_index = None
-
-        self.sorted_indices = set(range(len(self.data)))
+        self._stop_producer()
+        self._store_recording()
+        self._steps = None
+        if self._engine is not None:
+            self._engine.finish()
         self._set_state("Finished")
 
         if self._start_perf is not None:
@@ -687,9 +1570,57 @@ class SortingVisualizerApp(tk.Tk):
             self._start_perf = None
 
         self._update_metrics_labels()
+        self._sync_timeline_position()
         self._lock_controls(False)
         self._redraw()
 
+    # ----------------------------- Profiling -----------------------------
+
+    def _on_profile_toggled(self) -> None:
+        if self.var_profile.get():
+            self._profiler = StageProfiler()
+        else:
+            self._profiler = None
+            if self._overlay_item is not None:
+                self.canvas.delete(self._overlay_item)
+                self._overlay_item = None
+
+    def _update_profile_overlay(self, force: bool = False) -> None:
+        """Refresh the on-canvas stats text (at most 4x per second unless forced)."""
+        prof = self._profiler
+        if prof is None:
+            return
+        now = time.perf_counter_ns()
+        if not force and now - self._overlay_updated_ns < 250_000_000 and self._overlay_item is not None:
+            return
+        self._overlay_updated_ns = now
+
+        text = "\n".join(prof.summary_lines())
+        if self._overlay_item is None:
+            self._overlay_item = self.canvas.create_text(
+                self._get_canvas_size()[0] - 10, 28, anchor="ne", justify="left",
+                text=text, fill="#111827", font=("Consolas", 9)
+            )
+        else:
+            self.canvas.itemconfigure(self._overlay_item, text=text)
+        self.canvas.tag_raise(self._overlay_item)
+
+    def on_export_profile(self) -> None:
+        self._set_message("")
+        if self._profiler is None:
+            self._set_message("Check 'Profile overlay' and run a sort before exporting.")
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export Profile", defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            self._profiler.export_csv(path)
+        except OSError as exc:
+            self._set_message(f"Could not export profile: {exc}")
+
     # ----------------------------- Commands -----------------------------
 
     def on_random(self) -> None:
@@ -711,10 +1642,45 @@ class SortingVisualizerApp(tk.Tk):
             self._set_message("Random Max must be >= Min.")
             return
 
-        size = int(round(float(self.var_size.get())))
-        size = max(1, min(100, size))
+        size = self._parse_nonneg_int(self.var_size.get())
+        if size is None or not 1 <= size <= self.MAX_DATA_SIZE:
+            self._set_message(f"Data Size must be an integer in 1..{self.MAX_DATA_SIZE}.")
+            return
 
-        self.data = [random.randint(min_v, max_v) for _ in range(size)]
+        seed_text = self.var_seed.get().strip()
+        seed = self._parse_nonneg_int(seed_text) if seed_text else secrets.randbelow(2 ** 31)
+        if seed is None:
+            self._set_message("Seed must be a non-negative integer (or empty for a fresh dataset).")
+            return
+
+        self.var_preset.set("")
+        self.var_seed_used.set(f"seed {seed}")
+        self._load_random_data(make_dataset(self.var_distribution.get(), size, min_v, max_v, seed))
+
+    def on_preset(self, _event=None) -> None:
+        """Load the selected preset and show its settings in the Random fields."""
+        self._set_message("")
+        name = self.var_preset.get()
+        if not name:
+            return
+        if self.state == "Running":
+            self._set_message("Pause or Reset before loading a preset.")
+            return
+        if self.manual_locked_until_reset:
+            self._set_message("Presets are disabled because a manual dataset is loaded. Press Reset first.")
+            return
+        p = preset(name)
+        self.var_min.set(str(p.lo))
+        self.var_max.set(str(p.hi))
+        self.var_size.set(str(p.n))
+        self.var_distribution.set(p.distribution)
+        self.var_seed.set(str(p.seed))
+        self.var_seed_used.set(f"preset, seed {p.seed}")
+        self._load_random_data(p.make())
+
+    def _load_random_data(self, data: List[int]) -> None:
+        self._close_trace()
+        self.data = data
         self.original_data = list(self.data)
         self.dataset_loaded = True
         self.dataset_source = "random"
@@ -722,26 +1688,71 @@ class SortingVisualizerApp(tk.Tk):
 
         self._reset_metrics_and_visuals()
         self._set_state("Idle")
-        self._gen = None
         self._lock_controls(False)
         self._redraw()
 
     def _load_manual_if_valid(self) -> bool:
-        parsed = self._parse_int_list(self.var_input.get())
-        if parsed is None:
-            self._set_message("Invalid input. Use e.g. '1, 2 3' (non-negative integers only).")
+        try:
+            parsed = parse_int_text(self.var_input.get(), self.MAX_DATA_SIZE)
+        except DatasetParseError as exc:
+            if exc.token:
+                self.entry_input.icursor(exc.position)
+            self._set_message(f"Invalid input: {exc}. Use e.g. '1, 2 3' (non-negative integers only).")
             return False
-        if len(parsed) < 1 or len(parsed) > 100:
-            self._set_message("Manual input must contain 1..100 numbers.")
+        if not parsed:
+            self._set_message(f"Manual input must contain 1..{self.MAX_DATA_SIZE} numbers.")
             return False
 
-        self.data = list(parsed)
+        self._close_trace()
+        self.data = parsed
         self.original_data = list(self.data)
         self.dataset_loaded = True
         self.dataset_source = "manual"
         self.manual_locked_until_reset = True
         return True
 
+    def on_import_file(self) -> None:
+        self._set_message("")
+        if self.state == "Running":
+            self._set_message("Pause or Reset before importing a dataset.")
+            return
+
+        path = filedialog.askopenfilename(
+            parent=self, title="Import Dataset",
+            filetypes=[
+                ("Text or CSV", "*.txt *.csv"),
+                ("Raw int32", "*.bin *.i32 *.int32"),
+                ("All files", "*.*"),
+            ],
+        )
+        if not path:
+            return
+        try:
+            values = load_dataset_file(path, self.MAX_DATA_SIZE)
+        except DatasetParseError as exc:
+            self._set_message(f"Could not import dataset: {exc}.")
+            return
+        except (OSError, UnicodeDecodeError) as exc:
+            self._set_message(f"Could not import dataset: {exc}")
+            return
+        if not values:
+            self._set_message("The file contains no numbers.")
+            return
+
+        self._cancel_schedule()
+        self._close_trace()
+        self.data = values
+        self.original_data = list(values)
+        self.dataset_loaded = True
+        self.dataset_source = "file"
+        self.manual_locked_until_reset = False
+        self.var_input.set("")  # Play would otherwise reload the manual input
+
+        self._reset_metrics_and_visuals()
+        self._set_state("Idle")
+        self._lock_controls(False)
+        self._redraw()
+
     def on_play(self) -> None:
         self._set_message("")
 
@@ -750,8 +1761,10 @@ class SortingVisualizerApp(tk.Tk):
         if self.state == "Paused":
             self._set_state("Running")
             self._start_perf = time.perf_counter()
+            if self._producer is not None:
+                self._producer.resume()
             self._cancel_schedule()
-            self._after_id = self.after(max(1, int(self.var_speed.get())), self._tick)
+            self._schedule_tick()
             return
         if self.state == "Running":
             return
@@ -768,24 +1781,93 @@ class SortingVisualizerApp(tk.Tk):
 
         self._cancel_schedule()
         self._reset_metrics_and_visuals()
-        self._init_sorting_generator()
+        if self.var_race.get():
+            if not self._init_race():
+                return
+        elif not self._init_sorting_generator():
+            return
         self._lock_controls(True)
 
         self._set_state("Running")
         self._start_perf = time.perf_counter()
 
-        self._after_id = self.after(max(1, int(self.var_speed.get())), self._tick)
+        self._schedule_tick()
+
+    def on_count_only(self) -> None:
+        """Sort the whole dataset through the counting fast path and show exact totals."""
+        self._set_message("")
+        if self.state != "Idle":
+            self._set_message("Reset before running Count Only.")
+            return
+        if self._trace is not None:
+            self._set_message("Count Only runs an algorithm; load Random or Manual data instead of a trace.")
+            return
+
+        input_text = self.var_input.get().strip()
+        if input_text:
+            if not self._load_manual_if_valid():
+                return
+        elif not self.dataset_loaded:
+            self._set_message("Enter data or press Random.")
+            return
+
+        algo = self.var_algo.get()
+        try:
+            counter = self._registry.counter(algo) if algo in self._registry else None
+        except (ImportError, AttributeError, ValueError) as exc:
+            self._set_message(f"Could not load the counting fast path of {algo}: {exc}")
+            return
+        if counter is None:
+            self._set_message(f"{algo} has no counting fast path.")
+            return
+
+        self._cancel_schedule()
+        self._reset_metrics_and_visuals()
+        cpu0 = time.process_time_ns()
+        t0 = time.perf_counter()
+        counts = counter(self.data)
+        elapsed = time.perf_counter() - t0
+        self._timings.generator_cpu_ns = time.process_time_ns() - cpu0
+        self._timings.generator_wall_ns = round(elapsed * 1e9)
+
+        self._engine = SortEngine(lambda _work: iter(()), self.data)
+        self._engine.comparisons = counts.comparisons
+        self._engine.swaps = counts.swaps
+        self._engine.writes = counts.writes
+        self.var_algo_name.set(f"{algo} (count only)")
+        self._elapsed_before_pause = elapsed
+        self._counted_only = True
+        self._finish_sort()
+
+    def on_play_sample(self) -> None:
+        """After Count Only: replace the dataset by a random sample of it and play that."""
+        self._set_message("")
+        if self.state != "Finished" or not self._counted_only:
+            return
+        source = self.original_data
+        k = min(self.SAMPLE_SIZE, len(source))
+        sample = [source[i] for i in sorted(random.sample(range(len(source)), k))]
+
+        self.var_input.set("")
+        self.var_preset.set("")
+        self.var_seed_used.set(f"sample of {k:,} / {len(source):,}")
+        self._load_random_data(sample)
+        self.dataset_source = "sample"
+        self.on_play()
 
     def on_pause(self) -> None:
         self._set_message("")
         if self.state != "Running":
             return
         self._cancel_schedule()
+        if self._producer is not None:
+            self._producer.pause()
         if self._start_perf is not None:
             self._elapsed_before_pause = self._elapsed_seconds()
             self._start_perf = None
         self._set_state("Paused")
         self._update_metrics_labels()
+        self._sync_timeline_position()
         self._redraw()
 
     def on_step(self) -> None:
@@ -798,33 +1880,79 @@ class SortingVisualizerApp(tk.Tk):
                 return
             self._cancel_schedule()
             self._reset_metrics_and_visuals()
-            self._init_sorting_generator()
+            if self.var_race.get():
+                if not self._init_race():
+                    return
+            elif not self._init_sorting_generator():
+                return
             self._lock_controls(True)
             self._set_state("Paused")
 
         if self.state != "Paused":
             return
-        if self._gen is None:
-            self._set_message("No active sort generator. Press Reset then Play, or Step from Idle with a dataset.")
+        if self._race is not None:
+            if self._start_perf is None:
+                self._start_perf = time.perf_counter()
+            # Lanes start cold (process spawn), so wait briefly for each lane's next batch.
+            self._race_tick(timeout=2.0)
+            self._update_metrics_labels()
             return
-
-        try:
-            event = next(self._gen)
-        except StopIteration:
-            self._finish_sort()
+        if self._engine is None:
+            self._set_message("No active sort generator. Press Reset then Play, or Step from Idle with a dataset.")
             return
 
-        if event.type == "done":
+        highlights = self._advance_one()
+        if highlights is None:
             self._finish_sort()
             return
 
         if self._start_perf is None:
             self._start_perf = time.perf_counter()
 
-        highlights = self._apply_event(event)
         self._update_metrics_labels()
+        self._sync_timeline_position()
         self._redraw(highlights)
 
+    def _enter_seek_mode(self) -> bool:
+        """Pause or un-finish so the timeline can move; False if there is no timeline."""
+        if self._timeline is None:
+            return False
+        if self.state == "Running":
+            self.on_pause()
+        elif self.state == "Finished":
+            self._lock_controls(True)
+            self._set_state("Paused")
+            # Every bar is coded "finished"; re-derive the codes and repaint them all.
+            self._rebuild_color_codes()
+            self._dirty_indices.update(range(len(self.data)))
+        return True
+
+    def on_step_back(self) -> None:
+        self._set_message("")
+        if not self._enter_seek_mode():
+            self._set_message("Check Timeline before starting a sort to step backwards.")
+            return
+        step = self._timeline.step_back()
+        if step is None:
+            return
+        highlights = self._highlights_for_op(*step)
+        self._update_metrics_labels()
+        self._sync_timeline_position()
+        self._redraw(highlights)
+
+    def _on_timeline_scrub(self, value: str) -> None:
+        timeline = self._timeline
+        if timeline is None:
+            return
+        target = int(round(float(value)))
+        if target == timeline.position:
+            return
+        self._enter_seek_mode()
+        timeline.seek(target)
+        self._update_metrics_labels()
+        self._sync_timeline_position()
+        self._redraw()
+
     def on_reset(self) -> None:
         self._set_message("")
         self._cancel_schedule()
@@ -834,10 +1962,6 @@ class SortingVisualizerApp(tk.Tk):
         else:
             self.data = []
 
-        self._gen = None
-        self._algo_local = []
-        self._pivot_index = None
-
         self._reset_metrics_and_visuals()
         self._lock_controls(False)
         self._set_state("Idle")
@@ -847,6 +1971,81 @@ class SortingVisualizerApp(tk.Tk):
 
         self._redraw()
 
+    def on_save_trace(self) -> None:
+        self._set_message("")
+        if self.state == "Running":
+            self._set_message("Pause or Reset before saving a trace.")
+            return
+        if not self._ensure_dataset_exists_or_message():
+            return
+
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Save Trace", defaultextension=".svtrace",
+            filetypes=[("Sorting traces", "*.svtrace"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+
+        if self._trace is not None:
+            name = self._trace.algorithm
+            source = self._trace.source()
+        else:
+            name = self.var_algo.get()
+            source = self._algorithm_factory(name)
+            if source is None:
+                return
+        try:
+            trace = EventTrace.record(source, self.original_data, name)
+            trace.save(path)
+        except OverflowError:
+            self._set_message("Traces store 32-bit integers; this dataset has larger values.")
+            return
+        except OSError as exc:
+            self._set_message(f"Could not save trace: {exc}")
+            return
+        messagebox.showinfo("Trace saved", f"{len(trace)} events, {trace.nbytes} bytes.", parent=self)
+
+    def on_load_trace(self) -> None:
+        self._set_message("")
+        if self.state == "Running":
+            self._set_message("Pause or Reset before loading a trace.")
+            return
+
+        path = filedialog.askopenfilename(
+            parent=self, title="Load Trace",
+            filetypes=[("Sorting traces", "*.svtrace"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            trace = EventTrace.load(path)
+        except (OSError, ValueError) as exc:
+            self._set_message(f"Could not load trace: {exc}")
+            return
+
+        self._cancel_schedule()
+        self._close_trace()
+        self._trace = trace
+        self.data = list(trace.initial)
+        self.original_data = list(self.data)
+        self.dataset_loaded = True
+        self.dataset_source = "trace"
+        self.manual_locked_until_reset = False
+        self.var_input.set("")  # Play would otherwise reload the manual input
+
+        self._reset_metrics_and_visuals()
+        self._set_state("Idle")
+        self._lock_controls(False)
+        self._redraw()
+
+    def on_clear_cache(self) -> None:
+        self._set_message("")
+        if self.state == "Running":
+            self._set_message("Pause or Reset before clearing the cache.")
+            return
+        removed = self._trace_cache.clear()
+        messagebox.showinfo("Cache cleared", f"Removed {removed} cached runs.", parent=self)
+
     def on_help(self) -> None:
         win = tk.Toplevel(self)
         win.title("Help - Sorting Visualizer")
@@ -862,7 +2061,10 @@ class SortingVisualizerApp(tk.Tk):
   • 1 2 3
   • 1, 2 , 3,    4   5 6 20
 - Only NON-NEGATIVE integers (0, 1, 2, ...). Duplicates are allowed.
-- Manual list length must be 1..100.
+- Manual list length must be 1..{self.MAX_DATA_SIZE}.
+- Invalid input reports the position of the first bad token and moves the cursor there.
+- Import File loads the same format from a .txt/.csv file (read in chunks, so large
+  files are fine), or raw little-endian int32 values from a .bin/.i32/.int32 file.
 
 BUTTONS
 - Play:
@@ -880,25 +2082,101 @@ BUTTONS
   • Clears highlights, metrics, and restores the last loaded dataset (manual or random).
   • Unlocks controls.
 - Random:
-  • Generates a dataset using Min/Max and Data Size.
+  • Generates a dataset using Min/Max, Data Size and Shape (uniform, gaussian,
+    sorted, nearly-sorted, reversed, few-unique). A Seed makes the dataset reproducible; with
+    the Seed box empty a fresh seed is drawn and shown under the button.
+  • Uses NumPy when it is installed (much faster for large sizes); the same seed gives
+    a different, but still reproducible, dataset without NumPy.
   • Allowed only when no manual dataset is currently loaded OR after Reset.
   • If a manual dataset is loaded, press Reset to enable Random again.
-
-SLIDERS
+- Preset:
+  • Loads a named, seeded dataset that is identical on every machine (with or without
+    NumPy) and fills in the Random fields it uses.
+- Algorithms:
+  • The selector lists the built-in algorithms plus plugins: *.py files in the plugins
+    folder (or folders listed in $SORTING_VISUALIZER_PLUGINS) that declare an ALGORITHMS
+    list, and packages registering the "sorting_visualizer.algorithms" entry point group.
+    A plugin module is only imported when one of its algorithms is first used.
+- Count Only:
+  • From Idle: sorts the whole dataset with the selected algorithm using plain counters
+    instead of events, then shows the exact comparison and swap/write totals and the
+    time taken. Nothing is animated; press Reset to play the same dataset, or
+    Play Sample to animate {self.SAMPLE_SIZE} of its elements (picked at random, kept in
+    order) with the same algorithm. The sample replaces the dataset.
+- Metrics:
+  • Wall time is how long the sort has been running on screen, delays included.
+  • Generator is the algorithm's own cost: CPU and wall time spent producing events
+    (measured per batch of events; on the worker thread with "Background producer
+    thread", and up front when the Timeline records the run). Use this figure to
+    compare algorithms. It reads "replay" when the events come from a loaded trace or
+    the run cache: it is then the cost of decoding the trace, not of the algorithm.
+  • Apply is updating the array and colors, Render is drawing the canvas, and
+    Idle/delay is waiting for the next frame (the Speed delay plus Tk's own work).
+- Save Trace:
+  • Records the selected algorithm on the loaded dataset to a compact binary file.
+- Load Trace:
+  • Loads a saved trace (memory-mapped); Play/Step replay it instead of the selected algorithm.
+  • Loading Random or Manual data returns to the selected algorithm.
+- Cache recorded runs / Clear Cache:
+  • A run that plays to the end is stored as a trace, keyed by the algorithm and the
+    exact dataset. Playing the same algorithm on the same data again replays that trace
+    ("(cached)" after the name) without running the algorithm. The least recently used
+    runs are dropped once the cache exceeds 256 MiB; editing a plugin invalidates its runs.
+  • The cache lives in $SORTING_VISUALIZER_CACHE, or sorting_visualizer/traces in the
+    user cache directory.
+- Profile overlay / Export Profile CSV:
+  • Times each stage of every animation frame (generator advance, event application,
+    color computation, redraw, metrics labels, Tk scheduling lateness) and shows
+    events/s, frames/s and p50/p99 per stage on the canvas.
+  • Export writes the recent per-frame samples as CSV.
+
+TIMELINE
+- Check "Timeline" before Play/Step to record the whole run first; then:
+  • Drag the bar under the canvas to jump to any event (pauses a running sort).
+  • Back undoes one event at a time (swaps and writes are reversed exactly).
+- "Checkpoint every" sets how many events lie between full array snapshots
+  ('auto' = max(1024, data size)); a jump replays at most that many events.
+
+SETTINGS
 - Speed (delay ms):
   • Controls the delay between visualization events.
   • Locked when sorting starts; unlocked only on Reset or when done.
-- Data Size (1..100):
+- Frame-batched / Events per frame:
+  • When checked, playback runs at ~60 frames per second and each frame applies up to
+    "Events/frame" events (fewer if the frame's time budget runs out), then redraws once.
+  • Speed (delay ms) is ignored in this mode; Step still performs exactly one event.
+- Race all algorithms / Pace:
+  • Play/Step run every algorithm on its own copy of the dataset, each generating its
+    events in a separate process, with the canvas split into one lane per algorithm.
+  • Pace "events": lanes advance the same number of events per frame. Pace "time":
+    lanes advance the same simulated cost (compare = 1, write = 1, swap = 2), so an
+    algorithm with cheaper operations pulls ahead.
+  • Frame-batched sets the amount per frame; otherwise each tick moves one unit at the
+    Speed delay. Timeline, producer thread and loaded traces are ignored in this mode.
+- Coalesce compares:
+  • Groups each run of consecutive compare/select-min events (up to {self.COALESCE_MAX_RUN})
+    into one animation step, and a burst of "sorted" marks into one event, so long scans
+    cost one redraw instead of one per event. Counters stay exact.
+  • In this mode Step advances one such group. Works with the producer thread, which
+    does the grouping on the worker.
+- Background producer thread:
+  • Runs the sorting generator on a worker thread that queues events in batches; the
+    window only applies and draws them, so a costly algorithm step cannot stall it.
+  • Pause parks the worker, Reset stops it. Ignored when Timeline is checked.
+- Data Size (1..{self.MAX_DATA_SIZE}):
   • Used when generating Random data.
+  • Above {self.RASTER_MIN_N} elements the bars are drawn as one image with several
+    elements per pixel column: solid up to the column's minimum, tinted up to its maximum.
+  • Value labels are hidden when bars are too narrow to read them.
   • Locked when sorting starts; unlocked only on Reset or when done.
 
 COLOR LEGEND
 - Default: {self.COLORS["default"]}
 - Comparing: {self.COLORS["comparing"]}
 - Swapping: {self.COLORS["swapping"]}
-- Pivot (Quick Sort): {self.COLORS["pivot"]}
+- Pivot (Quick Sort, Introsort): {self.COLORS["pivot"]}
 - Selected Minimum (Selection Sort): {self.COLORS["selected_min"]}
-- Writing/Merging (Merge Sort writes): {self.COLORS["writing"]}
+- Writing/Merging (Merge, Radix, Counting and Timsort writes): {self.COLORS["writing"]}
 - Sorted (final position / sorted portion): {self.COLORS["sorted"]}
 - Finished (all sorted): {self.COLORS["finished"]}
 """
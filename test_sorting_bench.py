@@ -0,0 +1,25 @@
+"""The bench runs every distribution it has ever accepted on the command line."""
+
+import pytest
+
+from sorting_bench import DISTRIBUTIONS, main, run_suite
+
+# What sorting_bench accepted before it used sorting_datasets.
+LEGACY_DISTRIBUTIONS = ("random", "sorted", "reversed", "few-unique")
+
+
+@pytest.mark.parametrize("count_only", [False, True])
+def test_run_suite_accepts_legacy_distributions(count_only):
+    results = run_suite(["bubble", "merge"], [0, 1, 40], LEGACY_DISTRIBUTIONS, repeat=1, count_only=count_only)
+    assert len(results) == 2 * 3 * len(LEGACY_DISTRIBUTIONS)
+    assert not [r for r in results if "error" in r]
+    presorted = [r for r in results if r["distribution"] == "sorted" and r["algorithm"] == "bubble"]
+    assert [r["swaps"] for r in presorted] == [0, 0, 0]
+
+
+def test_cli_validates_against_every_distribution(capsys):
+    assert set(LEGACY_DISTRIBUTIONS) <= set(DISTRIBUTIONS)
+    assert main(["--algorithms", "bubble", "--sizes", "5", "--repeat", "1",
+                 "--distributions", ",".join(DISTRIBUTIONS)]) == 0
+    out = capsys.readouterr().out
+    assert all(dist in out for dist in DISTRIBUTIONS)
@@ -0,0 +1,33 @@
+"""Each counting fast path reports exactly the totals of a full SortEngine replay."""
+
+import random
+
+import pytest
+
+from sorting_engine import SortEngine
+from sorting_registry import BUILTIN_ALGORITHMS, AlgorithmRegistry
+
+REGISTRY = AlgorithmRegistry(BUILTIN_ALGORITHMS)
+
+
+def _datasets():
+    rng = random.Random(12)
+    for n in (0, 1, 2, 17, 65, 300):
+        yield [rng.randint(0, n) for _ in range(n)]
+        yield [rng.randint(0, 3) for _ in range(n)]
+        yield [rng.randint(0, 10 ** 7) for _ in range(n)]
+        yield list(range(n))
+        yield list(range(n, 0, -1))
+
+
+@pytest.mark.parametrize("name", REGISTRY.names())
+def test_counter_matches_event_replay(name):
+    counter = REGISTRY.counter(name)
+    assert counter is not None
+    for data in _datasets():
+        engine = SortEngine(REGISTRY.load(name), list(data))
+        engine.run()
+        work = list(data)
+        counts = counter(work)
+        assert (counts.comparisons, counts.swaps, counts.writes) == (engine.comparisons, engine.swaps, engine.writes)
+        assert work == sorted(data)
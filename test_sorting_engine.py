@@ -0,0 +1,134 @@
+"""The explicit-stack merge and quick sort generators emit exactly the events of the
+recursive versions they replaced (kept below as references)."""
+
+import random
+from typing import Generator, List
+
+import pytest
+
+from sorting_engine import (
+    Event, ev_compare, ev_done, ev_mark_sorted, ev_pivot, ev_swap, ev_write,
+    merge_sort_events, quick_sort_lomuto_events,
+)
+
+
+def _recursive_merge_sort_events(a: List[int]) -> Generator[Event, None, None]:
+    n = len(a)
+
+    def sort(lo: int, hi: int) -> Generator[Event, None, None]:
+        if hi - lo <= 1:
+            return
+        mid = (lo + hi) // 2
+        yield from sort(lo, mid)
+        yield from sort(mid, hi)
+
+        left = a[lo:mid]
+        right = a[mid:hi]
+        i = 0
+        j = 0
+        k = lo
+
+        while i < len(left) and j < len(right):
+            yield ev_compare(lo + i, mid + j)
+            if left[i] <= right[j]:
+                val = left[i]
+                i += 1
+            else:
+                val = right[j]
+                j += 1
+            a[k] = val
+            yield ev_write(k, val)
+            k += 1
+
+        while i < len(left):
+            val = left[i]
+            i += 1
+            a[k] = val
+            yield ev_write(k, val)
+            k += 1
+
+        while j < len(right):
+            val = right[j]
+            j += 1
+            a[k] = val
+            yield ev_write(k, val)
+            k += 1
+
+    if n <= 1:
+        if n == 1:
+            yield ev_mark_sorted(0)
+        yield ev_done()
+        return
+
+    yield from sort(0, n)
+    for idx in range(n):
+        yield ev_mark_sorted(idx)
+    yield ev_done()
+
+
+def _recursive_quick_sort_lomuto_events(a: List[int]) -> Generator[Event, None, None]:
+    n = len(a)
+
+    def qs(lo: int, hi: int) -> Generator[Event, None, None]:
+        if hi - lo <= 1:
+            if hi - lo == 1:
+                yield ev_mark_sorted(lo)
+            return
+
+        pivot_idx = hi - 1
+        pivot_val = a[pivot_idx]
+        yield ev_pivot(pivot_idx)
+
+        i = lo
+        for j in range(lo, hi - 1):
+            yield ev_compare(j, pivot_idx)
+            if a[j] <= pivot_val:
+                if i != j:
+                    a[i], a[j] = a[j], a[i]
+                    yield ev_swap(i, j)
+                i += 1
+
+        if i != pivot_idx:
+            a[i], a[pivot_idx] = a[pivot_idx], a[i]
+            yield ev_swap(i, pivot_idx)
+
+        yield ev_mark_sorted(i)
+        yield from qs(lo, i)
+        yield from qs(i + 1, hi)
+
+    if n <= 1:
+        if n == 1:
+            yield ev_mark_sorted(0)
+        yield ev_done()
+        return
+
+    yield from qs(0, n)
+    yield ev_done()
+
+
+def _datasets():
+    rng = random.Random(17)
+    yield "empty", []
+    yield "single", [5]
+    for n in (2, 3, 10, 257):
+        yield f"random-{n}", [rng.randint(0, 1000) for _ in range(n)]
+        yield f"duplicates-{n}", [rng.randint(0, 3) for _ in range(n)]
+        yield f"sorted-{n}", list(range(n))
+        yield f"reversed-{n}", list(range(n, 0, -1))
+        yield f"equal-{n}", [7] * n
+
+
+DATASETS = list(_datasets())
+
+
+@pytest.mark.parametrize("data", [d for _name, d in DATASETS], ids=[name for name, _d in DATASETS])
+@pytest.mark.parametrize("algorithm, reference", [
+    (merge_sort_events, _recursive_merge_sort_events),
+    (quick_sort_lomuto_events, _recursive_quick_sort_lomuto_events),
+], ids=["merge", "quick"])
+def test_events_match_recursive_reference(algorithm, reference, data):
+    work, expected_work = list(data), list(data)
+    events = [tuple(e) for e in algorithm(work)]
+    expected = [tuple(e) for e in reference(expected_work)]
+    assert events == expected
+    assert work == expected_work == sorted(data)
@@ -0,0 +1,29 @@
+"""The export CLI writes the same file for the same arguments on every machine."""
+
+import pytest
+
+import sorting_datasets
+from sorting_export import _DeltaWriter, main
+
+ARGS = ["--algorithm", "merge", "--n", "60", "--seed", "4", "--events-per-frame", "25", "--width", "64", "--height", "32"]
+
+
+def _export(path, *extra):
+    assert main([str(path), *ARGS, *extra]) == 0
+    return path.read_bytes()
+
+
+def test_dataset_does_not_depend_on_numpy(tmp_path, monkeypatch):
+    first = _export(tmp_path / "a.gif")
+    monkeypatch.setattr(sorting_datasets, "np", None)
+    assert _export(tmp_path / "b.gif") == first
+
+
+def test_preset_export_is_reproducible(tmp_path):
+    name = sorting_datasets.PRESETS[1].name
+    assert _export(tmp_path / "a.png", "--preset", name) == _export(tmp_path / "b.png", "--preset", name)
+
+
+def test_delta_writer_is_abstract():
+    with pytest.raises(TypeError):
+        _DeltaWriter("unused.gif", 1, 1)
@@ -0,0 +1,63 @@
+"""Plugin discovery: a malformed plugin is skipped and reported, the rest still load."""
+
+import pytest
+
+from sorting_registry import BUILTIN_ALGORITHMS, AlgorithmRegistry
+
+
+def _plugin(algorithms):
+    return f"def sort_events(a):\n    yield from ()\n\nALGORITHMS = {algorithms}\n"
+
+
+@pytest.mark.parametrize("algorithms", [
+    "5",
+    "[{'name': 'Typo', 'function': 'sort_events', 'events': ('comapre',)}]",
+    "[{'name': 'Scalar', 'function': 'sort_events', 'events': 3}]",
+    "[{[1]: 2}]",
+    "[sorted]",
+])
+def test_bad_plugin_is_skipped_and_reported(tmp_path, algorithms):
+    (tmp_path / "a_bad.py").write_text(_plugin(algorithms), encoding="utf-8")
+    (tmp_path / "b_good.py").write_text(
+        _plugin("[{'name': 'Good', 'function': 'sort_events', 'events': ['compare']}]"), encoding="utf-8")
+    (tmp_path / "c_broken.py").write_text("ALGORITHMS = [\n", encoding="utf-8")
+
+    registry = AlgorithmRegistry()
+    assert registry.discover_directory(str(tmp_path)) == 1
+    assert registry.names() == ["Good"]
+    assert len(registry.errors) == 2
+    assert "a_bad.py" in registry.errors[0] and "c_broken.py" in registry.errors[1]
+    registry.discover_entry_points()  # still runs after the bad files
+
+
+def test_files_without_algorithms_declare_nothing(tmp_path):
+    (tmp_path / "helpers.py").write_text("X = 1\n", encoding="utf-8")
+    registry = AlgorithmRegistry()
+    assert registry.discover_directory(str(tmp_path)) == 0
+    assert registry.errors == []
+
+
+@pytest.mark.parametrize("entry", [
+    "{'function': 'sort_events'}",
+    "{'name': 'No Function'}",
+    "'Bubble Sort'",
+])
+def test_entry_without_name_or_function_is_reported(tmp_path, entry):
+    (tmp_path / "plugin.py").write_text(_plugin(f"[{entry}]"), encoding="utf-8")
+    registry = AlgorithmRegistry()
+    assert registry.discover_directory(str(tmp_path)) == 0
+    assert len(registry.errors) == 1
+    assert "ALGORITHMS[0] needs a 'name' and a 'function'" in registry.errors[0]
+
+
+@pytest.mark.parametrize("entry, reason", [
+    ("{'name': 'Bubble Sort', 'function': 'sort_events'}", "name already registered"),
+    ("{'name': 'My Bubble', 'function': 'sort_events', 'key': 'bubble'}", "key 'bubble' already used"),
+])
+def test_plugin_cannot_replace_a_builtin(tmp_path, entry, reason):
+    (tmp_path / "plugin.py").write_text(_plugin(f"[{entry}]"), encoding="utf-8")
+    registry = AlgorithmRegistry(BUILTIN_ALGORITHMS)
+    assert registry.discover_directory(str(tmp_path)) == 0
+    assert registry.get("Bubble Sort").target == "sorting_engine:bubble_sort_events"
+    assert registry.names() == [spec.name for spec in BUILTIN_ALGORITHMS]
+    assert len(registry.errors) == 1 and reason in registry.errors[0]
@@ -0,0 +1,46 @@
+"""Timeline seeking and stepping against straight replays of the same trace."""
+
+import random
+
+import pytest
+
+from sorting_engine import SortEngine, bubble_sort_events, merge_sort_events, quick_sort_lomuto_events
+from sorting_timeline import Timeline
+from sorting_trace import EventTrace
+
+
+def _state(engine):
+    return list(engine.data), engine.comparisons, engine.swaps, engine.writes
+
+
+@pytest.mark.parametrize("every", [1, 3, 7, None])
+@pytest.mark.parametrize("algorithm", [bubble_sort_events, merge_sort_events, quick_sort_lomuto_events])
+def test_seek_matches_replay_at_every_position(algorithm, every):
+    data = [random.Random(3).randint(0, 9) for _ in range(12)]
+    trace = EventTrace.record(algorithm, data)
+    timeline = Timeline(trace, checkpoint_every=every)
+    n = len(timeline)
+
+    for target in list(range(n + 1)) + [n, 0, n // 2]:
+        timeline.seek(target)
+        expected = SortEngine(trace.source(), list(data))
+        expected.run(target)
+        assert timeline.position == target
+        assert _state(timeline.engine) == _state(expected)
+
+
+def test_seek_to_end_with_exact_multiple_of_checkpoints():
+    trace = EventTrace.record(bubble_sort_events, [3, 2, 1])  # 3 compares, 3 swaps, 3 marks
+    for every in (1, 3, len(trace) - 1):
+        timeline = Timeline(trace, checkpoint_every=every)
+        timeline.seek(len(timeline))
+        assert timeline.engine.data == [1, 2, 3]
+
+
+def test_step_back_after_finish():
+    trace = EventTrace.record(bubble_sort_events, [3, 2, 1])
+    timeline = Timeline(trace, checkpoint_every=1)
+    timeline.seek(len(timeline))
+    timeline.engine.finish()
+    assert timeline.step_back() is not None
+    assert timeline.position == len(timeline) - 1
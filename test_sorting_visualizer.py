@@ -0,0 +1,172 @@
+"""Headless checks of the app's playback plumbing (no Tk window is created)."""
+
+import random
+import time
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from sorting_cache import TraceRecorder  # noqa: E402
+from sorting_engine import RunTimings, SortEngine, coalesce_events, merge_sort_events, quick_sort_lomuto_events  # noqa: E402
+from sorting_producer import EventProducer  # noqa: E402
+from sorting_timeline import Timeline  # noqa: E402
+from sorting_trace import EventTrace  # noqa: E402
+from sorting_visualizer import SortingVisualizerApp as App  # noqa: E402
+
+
+class _Playback:
+    """Just enough app state to run the real step/apply methods without a Tk root."""
+
+    _pull_steps = App._pull_steps
+    _drain_events = App._drain_events
+    _advance_one = App._advance_one
+    _apply_step = App._apply_step
+    _apply_event = App._apply_event
+    _highlights_for_op = App._highlights_for_op
+    _refresh_color_code = App._refresh_color_code
+    _sync_pivot_code = App._sync_pivot_code
+    _rebuild_color_codes = App._rebuild_color_codes
+    _enter_seek_mode = App._enter_seek_mode
+    on_step_back = App.on_step_back
+    sorted_indices = App.sorted_indices
+    _pivot_index = App._pivot_index
+
+    COLORS = {"comparing": "c", "swapping": "s", "pivot": "p", "selected_min": "m", "writing": "w"}
+    CODE_DEFAULT, CODE_SORTED, CODE_PIVOT, CODE_FINISHED = range(4)
+
+    def _set_message(self, _msg):
+        pass
+
+    def _set_state(self, state):
+        self.state = state
+
+    def _lock_controls(self, _locked):
+        pass
+
+    def _update_metrics_labels(self):
+        pass
+
+    def _sync_timeline_position(self):
+        pass
+
+    def _redraw(self, highlights=None):
+        # Records which bars a partial redraw would revisit, as the real _redraw does.
+        self.redrawn = set(highlights) | self._dirty_indices
+        self._dirty_indices = set()
+
+    def __init__(self, algorithm, data, mode, recorder=None):
+        self.data = list(data)
+        self.state = "Running"
+        self._profiler = None
+        self._recorder = recorder
+        self._timings = RunTimings()
+        self._timeline = self._producer = self._steps = None
+        self._color_codes = bytearray(len(data))
+        self._coded_pivot = None
+        self._dirty_indices = set()
+
+        if mode == "timeline":
+            self._timeline = Timeline(EventTrace.record(algorithm, self.data), self.data)
+            self._engine = self._timeline.engine
+            return
+        self._engine = SortEngine(algorithm, self.data, self._timings)
+        if mode == "coalesce":
+            self._steps = coalesce_events(self._engine.take_events())
+        elif mode == "producer":
+            self._producer = EventProducer(self._engine.take_events(), timings=self._timings).start()
+
+
+@pytest.mark.parametrize("mode", ["engine", "producer", "coalesce", "timeline"])
+@pytest.mark.parametrize("algorithm", [merge_sort_events, quick_sort_lomuto_events])
+def test_step_then_drain_sorts_and_counts(algorithm, mode):
+    data = [random.Random(7).randint(0, 50) for _ in range(120)]
+    expected = SortEngine(algorithm, list(data))
+    expected.run()
+
+    app = _Playback(algorithm, data, mode)
+    for _ in range(3):
+        assert app._advance_one() is not None
+    done = False
+    while not done:
+        _highlights, done = app._drain_events(500, time.perf_counter() + 5)
+
+    assert app.data == sorted(data)
+    assert app._engine.comparisons == expected.comparisons
+    assert app._engine.swaps_or_writes == expected.swaps_or_writes
+    assert app._advance_one() is None
+
+
+def test_event_steps_highlight_their_bars():
+    app = _Playback(quick_sort_lomuto_events, [3, 1, 2], "engine")
+    highlights = app._advance_one()  # pivot on the last element
+    assert highlights == {2: "p"}
+
+
+class _SlowRecorder(TraceRecorder):
+    """A recorder that costs a fixed, large amount of wall time per batch."""
+
+    DELAY_S = 0.002
+    slept_ns = 0
+
+    def record(self, steps):
+        t0 = time.perf_counter_ns()
+        time.sleep(self.DELAY_S)
+        self.slept_ns += time.perf_counter_ns() - t0
+        super().record(steps)
+
+
+def _play(app):
+    done = False
+    while not done:
+        _highlights, done = app._drain_events(64, time.perf_counter() + 5)
+
+
+@pytest.mark.parametrize("mode", ["engine", "producer", "coalesce"])
+def test_recording_is_not_generator_time(mode):
+    data = [random.Random(3).randint(0, 500) for _ in range(400)]
+    plain = _Playback(merge_sort_events, data, mode)
+    _play(plain)
+    recorder = _SlowRecorder(data, "merge")
+    recorded = _Playback(merge_sort_events, data, mode, recorder)
+    _play(recorded)
+    recorder.finish()
+
+    assert recorder.complete
+    expected = EventTrace.record(merge_sort_events, data)
+    assert (recorder.trace.ops, recorder.trace.args) == (expected.ops, expected.args)
+    # Every batch slept DELAY_S in the recorder; none of it may count as generator time.
+    assert recorder.slept_ns > 20 * _SlowRecorder.DELAY_S * 1e9
+    assert recorded._timings.generator_wall_ns < plain._timings.generator_wall_ns + recorder.slept_ns // 2
+    assert recorded._timings.apply_ns >= recorder.slept_ns
+
+
+def test_step_back_from_finished_recolors_the_bars():
+    data = [8, 3, 6, 1, 7, 2, 5, 4]
+    app = _Playback(quick_sort_lomuto_events, data, "timeline")
+    _play(app)
+    app.state = "Finished"
+    app._rebuild_color_codes()
+    assert set(app._color_codes) == {app.CODE_FINISHED}
+
+    for _ in range(11):
+        app.on_step_back()
+    assert app.state == "Paused"
+    assert app.sorted_indices and len(app.sorted_indices) < len(data)
+    expected = bytearray(len(data))
+    for i in app.sorted_indices:
+        expected[i] = app.CODE_SORTED
+    if app._pivot_index is not None:
+        expected[app._pivot_index] = app.CODE_PIVOT
+    assert app._color_codes == expected
+
+
+def test_first_step_back_from_finished_repaints_every_bar():
+    data = [8, 3, 6, 1, 7, 2, 5, 4]
+    app = _Playback(quick_sort_lomuto_events, data, "timeline")
+    _play(app)
+    app.state = "Finished"
+    app._rebuild_color_codes()
+    app._dirty_indices = set()  # as after the full redraw that shows the finished run
+    app.on_step_back()
+    assert app.redrawn == set(range(len(data)))